@@ -6,6 +6,19 @@
 
 import pickle
 import math
+import time
+import asyncio
+import threading
+import json
+import socket
+import tempfile
+import shutil
+import uuid
+import weakref
+import warnings
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from importlib.resources import files
 from datetime import datetime
@@ -13,7 +26,7 @@ import numpy as np
 from numpy import sort
 from retrofit import utils as u
 import os
-from copy import copy
+from copy import copy, deepcopy
 import pandas as pd
 import polars as pl
 import catboost
@@ -40,6 +53,13 @@ from sklearn.metrics import (
 )
 
 from jinja2 import Environment, PackageLoader, select_autoescape
+from . import objectives as obj_reg
+from .caching import TrainingCache, PredictionCache, frame_fingerprint
+from .audit import AuditLog, scan_prediction_log
+from .predictor import CompiledPredictor, _inverse_transform_fn
+from . import flat_trees
+from .flat_trees import FlatTreeEnsemble
+from .pipeline import run_pipeline
 from .reporting import (
     ModelInsightsBundle,
     MetricsSection,
@@ -82,6 +102,498 @@ def _render_model_insights_html(
     )
 
 
+# XGBoost: feed Polars frames to QuantileDMatrix in row batches
+class _PolarsBatchIter(xgb.DataIter):
+    """
+    Iterate a Polars DataFrame in row batches for xgb.QuantileDMatrix.
+    Only one float32 batch of the feature columns is materialized at a time.
+    """
+    def __init__(
+        self,
+        df: pl.DataFrame,
+        feature_cols,
+        label_col=None,
+        weight_col=None,
+        batch_rows: int = 1_000_000,
+    ):
+        self._df = df
+        self._feature_cols = list(feature_cols)
+        self._label_col = label_col
+        self._weight_col = weight_col
+        self._batch_rows = max(int(batch_rows), 1)
+        self._offset = 0
+        super().__init__(cache_prefix=None, release_data=True)
+
+    def next(self, input_data) -> bool:
+        if self._offset >= self._df.height:
+            return False
+
+        batch = self._df.slice(self._offset, self._batch_rows)
+        self._offset += self._batch_rows
+
+        X = batch.select(self._feature_cols).to_numpy().astype(np.float32, copy=False)
+        y = batch[self._label_col].to_numpy() if self._label_col else None
+        w = batch[self._weight_col].to_numpy() if self._weight_col else None
+        input_data(data=X, label=y, weight=w, feature_names=self._feature_cols)
+        return True
+
+    def reset(self):
+        self._offset = 0
+
+
+# Prediction-cache identity of a trained model
+def _model_token(model) -> str:
+    """
+    Random token assigned to a model object on first use and kept on it.
+    Unlike id(), it is never reused by another model after garbage collection.
+    """
+    token = getattr(model, "_retrofit_token", None)
+    if token is None:
+        token = uuid.uuid4().hex
+        model._retrofit_token = token
+    return token
+
+
+# Thread calibration profile (per host, engine and data-shape bucket)
+_THREAD_PARAM = {"catboost": "thread_count", "xgboost": "nthread", "lightgbm": "num_threads"}
+
+
+def _thread_profile_path(path=None) -> Path:
+    """
+    Location of the local thread profile file. Defaults to
+    $RETROFIT_THREAD_PROFILE or ~/.retrofit/thread_profile.json.
+    """
+    if path is not None:
+        return Path(path)
+    env = os.environ.get("RETROFIT_THREAD_PROFILE")
+    if env:
+        return Path(env)
+    return Path.home() / ".retrofit" / "thread_profile.json"
+
+
+def _thread_profile_key(engine: str, n_rows: int, n_cols: int) -> str:
+    """
+    Bucket by host, engine, order of magnitude of rows and power of two of columns.
+    """
+    row_bucket = int(math.log10(max(int(n_rows), 1)))
+    col_bucket = int(math.log2(max(int(n_cols), 1)))
+    return f"{socket.gethostname()}|{engine}|rows1e{row_bucket}|cols2e{col_bucket}"
+
+
+def _load_thread_profile(path=None) -> dict:
+    p = _thread_profile_path(path)
+    try:
+        with p.open("r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_thread_profile(profile: dict, path=None):
+    p = _thread_profile_path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(p.suffix + f".{os.getpid()}.tmp")
+    with tmp.open("w") as f:
+        json.dump(profile, f, indent=2, sort_keys=True)
+    os.replace(tmp, p)
+
+
+# Async API: cancel event of the RetroFit call running in this thread
+_CANCEL = threading.local()
+
+
+class OperationCancelled(RuntimeError):
+    """
+    Raised inside an executor thread when its async caller was cancelled or
+    timed out (atrain / ascore / aevaluate / ascore_stream).
+    """
+
+
+def _check_cancelled():
+    event = getattr(_CANCEL, "event", None)
+    if event is not None and event.is_set():
+        raise OperationCancelled("RetroFit operation cancelled.")
+
+
+class _CatBoostCancel:
+    def __init__(self, event):
+        self.event = event
+
+    def after_iteration(self, info):
+        return not self.event.is_set()
+
+
+class _XGBoostCancel(xgb.callback.TrainingCallback):
+    def __init__(self, event):
+        super().__init__()
+        self.event = event
+
+    def after_iteration(self, model, epoch, evals_log):
+        return self.event.is_set()
+
+
+def _lightgbm_cancel(event):
+    def _callback(env):
+        if event.is_set():
+            raise lgbm.callback.EarlyStopException(env.iteration, env.evaluation_result_list or [])
+    return _callback
+
+
+# Parallel scoring: per-worker state (loaded once by the pool initializer)
+_PARALLEL_SCORER = None
+
+
+def _parallel_score_init(spec: dict):
+    """
+    Build a scoring-only RetroFit in this worker and load the native model file.
+    """
+    global _PARALLEL_SCORER
+    rf = RetroFit(Algorithm=spec["Algorithm"], TargetType=spec["TargetType"])
+    rf.TargetColumnName = spec["TargetColumnName"]
+    rf.NumericColumnNames = spec["NumericColumnNames"]
+    rf.CategoricalColumnNames = spec["CategoricalColumnNames"]
+    rf.TextColumnNames = spec["TextColumnNames"]
+    rf.ModelArgs = dict(spec["ModelArgs"] or {})
+    rf.ModelData = {}
+    rf.ScoreThreads = spec["Threads"]
+    rf.MulticlassOutput = spec.get("MulticlassOutput", "columns")
+
+    model = RetroFit._load_native_model(spec["Algorithm"], spec["TargetType"], spec["ModelDir"])
+    if spec["Algorithm"] == "xgboost":
+        model.set_param({"nthread": spec["Threads"]})
+    rf.Model = model
+    if spec.get("TreeLimit"):
+        rf.ModelList = {"Model": model}
+        rf.ScoringTreeLimit = {"Model": spec["TreeLimit"]}
+    _PARALLEL_SCORER = rf
+
+
+def _parallel_score_chunk(df_chunk: pl.DataFrame) -> pl.DataFrame:
+    """
+    Score one chunk in a worker and return only the prediction columns.
+    """
+    rf = _PARALLEL_SCORER
+    scored = rf._score_one(df_chunk, None, rf.Model, store=False)
+    return scored.select([c for c in scored.columns if c not in df_chunk.columns])
+
+
+# Learning curve: one fit on a row subset (runs in a worker process)
+def _learning_curve_worker(task: dict) -> dict:
+    """
+    Train a fresh RetroFit on task['train'] and evaluate it on task['validation']
+    with RetroFit.evaluate(). Frames arrive already label-encoded / transformed;
+    the parent's target transform is set so predictions are inverted exactly
+    as in the parent's score() / evaluate(). CatBoost fits write to their own
+    temporary train_dir.
+    """
+    if task["custom_objective"] is not None:
+        c = task["custom_objective"]
+        obj_reg.register_objective(
+            c.name, grad_hess=c.grad_hess, metric=c.metric,
+            higher_is_better=c.higher_is_better, overwrite=True,
+        )
+
+    rf = RetroFit(Algorithm=task["Algorithm"], TargetType=task["TargetType"], GPU=task["GPU"])
+    rf.create_model_data(
+        TrainData=task["train"],
+        ValidationData=task["validation"],
+        TargetColumnName=task["TargetColumnName"],
+        NumericColumnNames=task["NumericColumnNames"],
+        CategoricalColumnNames=task["CategoricalColumnNames"],
+        TextColumnNames=task["TextColumnNames"],
+        WeightColumnName=task["WeightColumnName"],
+    )
+    rf.LabelMapping = task["LabelMapping"]
+    rf.LabelMappingInverse = task["LabelMappingInverse"]
+    rf.TargetTransform = task["TargetTransform"]
+    rf.TargetTransformParams = dict(task["TargetTransformParams"])
+    rf.ModelArgs = dict(task["ModelArgs"])
+    if task["Algorithm"] == "catboost":
+        train_dir = tempfile.mkdtemp(prefix="retrofit-lc-")
+        rf.ModelArgs["train_dir"] = train_dir
+    rf.ModelArgsNames = [*rf.ModelArgs]
+    if task["custom_objective"] is not None:
+        rf.set_custom_objective(task["custom_objective"].name)
+
+    try:
+        t0 = time.perf_counter()
+        rf.train()
+        train_seconds = time.perf_counter() - t0
+    finally:
+        if task["Algorithm"] == "catboost":
+            shutil.rmtree(train_dir, ignore_errors=True)
+
+    rf.score(DataName="validation")
+    ev = rf.evaluate(DataName="validation")
+    level = {
+        "regression": "regression",
+        "classification": "overall_binary",
+        "multiclass": "overall_multiclass",
+    }[task["TargetType"]]
+    overall = ev.filter(pl.col("EvalLevel") == level).row(0, named=True)
+
+    return {
+        "Fraction": task["Fraction"],
+        "TrainRows": task["train"].height,
+        "TrainSeconds": train_seconds,
+        "MetricValue": float(overall[task["Metric"]]),
+    }
+
+
+# Multiclass probabilities on disk (MulticlassOutput="memmap")
+class ProbabilityMatrixFile:
+    """
+    Append-only float32 (rows, K) matrix in a file, read through np.memmap.
+    Scored frames keep only Int64 row ids into it (class_probs_row).
+
+    owned_dir: a directory created for this file (temp dir); it is removed by
+    close() or when the object is garbage collected / the interpreter exits.
+    Pickling a file in an owned directory copies the matrix into the pickle
+    (the loaded copy writes it to a new temp dir of its own); a file in a
+    user-chosen directory is pickled by path.
+    """
+
+    def __init__(self, path, n_classes: int, owned_dir=None):
+        self.path = str(path)
+        self.n_classes = int(n_classes)
+        self.rows = 0
+        self.generation = 0
+        self.token = uuid.uuid4().hex
+        self.owned_dir = None if owned_dir is None else str(owned_dir)
+        self.closed = False
+        self._mm = None
+        self._lock = threading.Lock()
+        self._cleanup = None
+        if self.owned_dir is not None:
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.owned_dir, True)
+        open(self.path, "wb").close()
+
+    def __repr__(self):
+        return f"ProbabilityMatrixFile({self.path!r}, rows={self.rows}, n_classes={self.n_classes})"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_mm"] = None
+        state.pop("_lock", None)
+        state.pop("_cleanup", None)
+        if self.owned_dir is not None and not self.closed:
+            state["_data"] = np.array(self.matrix)
+        return state
+
+    def __setstate__(self, state):
+        data = state.pop("_data", None)
+        self.__dict__.update(state)
+        self.__dict__.setdefault("token", uuid.uuid4().hex)
+        self._lock = threading.Lock()
+        self._cleanup = None
+        if data is not None:
+            self.owned_dir = tempfile.mkdtemp(prefix="retrofit-probs-")
+            self.path = os.path.join(self.owned_dir, os.path.basename(self.path))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.owned_dir, True)
+            data.tofile(self.path)
+
+    def append(self, probs: np.ndarray) -> np.ndarray:
+        arr = np.ascontiguousarray(probs, dtype=np.float32)
+        if arr.ndim != 2 or arr.shape[1] != self.n_classes:
+            raise ValueError(
+                f"Expected (n, {self.n_classes}) probabilities, got shape {arr.shape}."
+            )
+        # Appends from concurrent scoring threads (score_stream Pipeline=True)
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"{self!r} is closed.")
+            with open(self.path, "ab") as f:
+                arr.tofile(f)
+            start = self.rows
+            self.rows += arr.shape[0]
+            self._mm = None
+        return np.arange(start, start + arr.shape[0], dtype=np.int64)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self.closed:
+            raise RuntimeError(f"{self!r} is closed.")
+        if self._mm is None:
+            if self.rows == 0:
+                return np.empty((0, self.n_classes), dtype=np.float32)
+            self._mm = np.memmap(self.path, dtype=np.float32, mode="r", shape=(self.rows, self.n_classes))
+        return self._mm
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        return np.asarray(self.matrix[rows])
+
+    def truncate(self):
+        """
+        Drop every row (the file is emptied); row ids handed out so far no
+        longer point at anything.
+        """
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f"{self!r} is closed.")
+            self._mm = None
+            open(self.path, "wb").close()
+            self.rows = 0
+            self.generation += 1
+
+    def close(self):
+        """
+        Delete the file (and the directory, if owned). Further reads and
+        appends raise RuntimeError. Safe to call twice.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._mm = None
+            if self._cleanup is not None:
+                self._cleanup()
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# ScoredData: full scored frames or prediction columns joined on read
+class PredictionColumns:
+    """
+    Prediction columns of an internal split, row-aligned with DataFrames[split].
+    """
+    __slots__ = ("frame",)
+
+    def __init__(self, frame: pl.DataFrame):
+        self.frame = frame
+
+    def __repr__(self):
+        return f"PredictionColumns({self.frame.columns}, rows={self.frame.height})"
+
+
+class ScoredDataStore(dict):
+    """
+    dict of scored splits. Entries stored as PredictionColumns are returned
+    as owner.DataFrames[split].hstack(predictions) on read (zero-copy), so
+    consumers always see the full scored frame.
+    """
+
+    def __init__(self, owner=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def _resolve(self, key, value):
+        if not isinstance(value, PredictionColumns):
+            return value
+        base = self._owner.DataFrames.get(key) if self._owner is not None else None
+        if base is None or base.height != value.frame.height:
+            raise RuntimeError(
+                f"ScoredData['{key}'] holds predictions only and self.DataFrames['{key}'] "
+                "is missing or has a different row count; re-run score()."
+            )
+        return base.hstack(value.frame.get_columns())
+
+    def __getitem__(self, key):
+        return self._resolve(key, super().__getitem__(key))
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    # Pickle the stored entries, not the joined views returned by items()
+    def __reduce__(self):
+        return (self.__class__, (), {"_owner": self._owner}, None, iter(dict.items(self)))
+
+    def predictions(self, key) -> pl.DataFrame | None:
+        """
+        Only the prediction columns of a split stored in predictions-only mode
+        (None for full-frame entries or missing keys).
+        """
+        value = super().get(key)
+        return value.frame if isinstance(value, PredictionColumns) else None
+
+
+# Scoring-time input validation (see RetroFit.set_input_validation):
+# bits of the per-row ValidationFlags column
+VALIDATION_FLAGS = {
+    "MissingColumn": 1,     # a feature is absent from the batch (scored as null)
+    "TypeMismatch": 2,      # a value could not be cast to the training dtype
+    "Null": 4,              # null or NaN in a feature
+    "OutOfRange": 8,        # numeric value outside the training [min, max]
+    "UnseenCategory": 16,   # category not seen in training
+}
+
+
+def _dtype_group(dtype) -> str:
+    if dtype.is_numeric() or dtype == pl.Boolean:
+        return "numeric"
+    if dtype in (pl.Utf8, pl.Categorical) or isinstance(dtype, pl.Enum):
+        return "string"
+    return str(dtype)
+
+
+# Immutable, lock-free scoring handle for request threads
+class ScoringView:
+    """
+    Read-only scoring handle built by RetroFit.scoring_view().
+
+    Holds a private frozen copy of everything score() reads (engine, target
+    type, feature lists, label maps, target transform params, post-processing
+    config, tree limit, model handle). Calls never write to the RetroFit
+    (no ScoredData, no prediction cache, no reuse of ModelData Pools / DMatrix),
+    so one view can be shared by many threads without locks; the engines'
+    predict calls are themselves thread-safe.
+
+    Methods:
+      score(df)          like RetroFit.score(NewData=df), returns a new frame
+      predict(df)        NumPy predictions (score() layout, no columns)
+    """
+    __slots__ = ("_rf", "_model", "_engine", "model_name")
+
+    def __init__(self, rf, model, model_name: str | None = None):
+        object.__setattr__(self, "_rf", rf)
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_engine", RetroFit._model_engine(model))
+        object.__setattr__(self, "model_name", model_name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScoringView is read-only; build a new view with RetroFit.scoring_view().")
+
+    def __repr__(self):
+        return (
+            f"ScoringView(model={self.model_name!r}, engine={self._engine!r}, "
+            f"target_type={self._rf.TargetType!r})"
+        )
+
+    @property
+    def feature_names(self) -> tuple:
+        return tuple(self._rf._model_feature_columns(self._engine))
+
+    @property
+    def target_type(self) -> str:
+        return self._rf.TargetType
+
+    def predict(self, df) -> np.ndarray:
+        rf = self._rf
+        df_pl, _, _ = rf._validated(rf._normalize_input_df(df), [self._model])
+        data = rf._score_input(self._engine, df_pl)
+        preds = rf._score_predict(self._engine, self._model, data)
+        if getattr(rf, "AuditLog", None) is not None:
+            rf._audit(df_pl, pl.DataFrame(rf._prediction_series(preds)), self._model, self.model_name)
+        return preds
+
+    def score(self, df) -> pl.DataFrame:
+        rf = self._rf
+        df_pl, flags, _ = rf._validated(rf._normalize_input_df(df), [self._model])
+        preds = rf._score_predict(self._engine, self._model, rf._score_input(self._engine, df_pl))
+        scored = rf._apply_postprocessing(df_pl.with_columns(rf._prediction_series(preds)))
+        if flags is not None:
+            scored = scored.with_columns(flags)
+        rf._audit(df_pl, scored.select(scored.columns[df_pl.width:]), self._model, self.model_name)
+        return scored
+
+
 class RetroFit:
     """
     Goals:
@@ -99,15 +611,43 @@ class RetroFit:
       create_model_parameters
       print_algo_args
       update_model_parameters
+      set_custom_objective
+      calibrate_threads
 
       train
+      set_training_cache
+      atrain
 
       score
+      score_stream
+      ascore
+      ascore_stream
+      set_async_limits
+      shutdown_scoring_pool
+      set_prediction_cache
+      set_audit_log
+      set_shadow_scoring
+      set_input_validation
+      set_scored_data_storage
+      set_postprocessing
+      set_multiclass_output
+      compile_predictor
+      scoring_view
+      save_scoring_artifact
+      load_scoring_artifact
+      export_flat_trees
+      tune_tree_truncation
+      set_scoring_tree_limit
+      distill
 
       save_retrofit
       load_retrofit
 
       evaluate
+      aevaluate
+      evaluate_shadow
+
+      learning_curve
 
       compute_feature_importance
       compute_catboost_interaction_importance
@@ -138,6 +678,7 @@ class RetroFit:
       self.DataFrames = dict()
       self.ModelData = ModelData
       self.ModelDataNames
+      self.ModelDataOptions
       self.ModelList = dict()
       self.ModelListNames = []
       self.FitList = dict()
@@ -156,6 +697,27 @@ class RetroFit:
       self.CalibrationListNames = []
       self.LabelMapping = None
       self.LabelMappingInverse = None
+      self.CustomObjectiveName = None
+      self.TrainTelemetry = {}
+      self.TrainingCache = None
+      self.UseThreadProfile = None
+      self.ThreadProfilePath = None
+      self.ScoreThreads = None
+      self.ProfileScoreThreads = None
+      self.PredictionCache = None
+      self.AuditLog = None
+      self.ShadowScorer = None
+      self.InputValidation = None
+      self.ValidationReport = None
+      self.ScoredDataPredictionsOnly = False
+      self.ScoredDataFloat32 = False
+      self.PostProcessing = None
+      self.MulticlassOutput = "columns"
+      self.MulticlassOutputPath = None
+      self.ProbabilityFile = None
+      self.ScoringTreeLimit = {}
+      self.AsyncMaxConcurrency = 1
+      self.AsyncExecutor = None
     """
 
     # Class attributes
@@ -179,7 +741,29 @@ class RetroFit:
         }
     
         # Optional: store scored versions (Polars)
-        self.ScoredData = {}
+        self.ScoredData = ScoredDataStore(self)
+        self.ScoredDataPredictionsOnly = False
+        self.ScoredDataFloat32 = False
+
+        # Prediction post-processing in score() (see set_postprocessing)
+        self.PostProcessing = None
+
+        # Multiclass probability layout in score() (see set_multiclass_output)
+        self.MulticlassOutput = "columns"
+        self.MulticlassOutputPath = None
+        self.ProbabilityFile = None
+
+        # Boosting iterations used at scoring time per model (see tune_tree_truncation)
+        self.ScoringTreeLimit = {}
+
+        # Async API (see set_async_limits): concurrency bound, optional executor,
+        # lazily created managed executor / semaphore
+        self.AsyncMaxConcurrency = 1
+        self.AsyncExecutor = None
+        self.AsyncState = {}
+
+        # score(Workers=N) process pool, kept alive between calls (see shutdown_scoring_pool)
+        self.ScoringPoolState = {}
     
         # Data columns by type
         self.TargetColumnName = None
@@ -199,6 +783,7 @@ class RetroFit:
         # Algo-specific data objects (Pool / DMatrix / Dataset)
         self.ModelData = None
         self.ModelDataNames = None
+        self.ModelDataOptions = {}
     
         # Main model handle (single-run convenience)
         self.Model = None
@@ -238,6 +823,38 @@ class RetroFit:
         self.LabelMapping = None
         self.LabelMappingInverse = None
 
+        # Custom objective / eval metric (see retrofit.objectives registry)
+        self.CustomObjectiveName = None
+
+        # Training telemetry per model name (fit time, callback overhead)
+        self.TrainTelemetry = {}
+
+        # Optional on-disk cache of fitted boosters (see set_training_cache)
+        self.TrainingCache = None
+
+        # Calibrated thread counts (see calibrate_threads). None → read the
+        # profile only when ThreadProfilePath or $RETROFIT_THREAD_PROFILE is set
+        self.UseThreadProfile = None
+        self.ThreadProfilePath = None
+
+        # Engine threads for predict calls in score() (None → engine default);
+        # ProfileScoreThreads is the value last taken from a thread profile
+        self.ScoreThreads = None
+        self.ProfileScoreThreads = None
+
+        # Optional row-hash prediction cache (see set_prediction_cache)
+        self.PredictionCache = None
+
+        # Optional prediction audit log (see set_audit_log)
+        self.AuditLog = None
+
+        # Optional challenger shadow scoring of NewData (see set_shadow_scoring)
+        self.ShadowScorer = None
+
+        # Optional validation of new data at scoring time (see set_input_validation)
+        self.InputValidation = None
+        self.ValidationReport = None
+
 
     #################################################
     # Function: Create Model-Data Objects
@@ -422,6 +1039,9 @@ class RetroFit:
                 self._target_transform_expr(col).alias(col)
             )
 
+        # Marks the model target as transformed (read by compile_predictor)
+        self.TargetTransformParams["applied"] = True
+
     # Helper function: CatBoost
     @staticmethod
     def _process_catboost(
@@ -513,6 +1133,49 @@ class RetroFit:
     
         return {"train_data": train_dmatrix, "validation_data": valid_dmatrix, "test_data": test_dmatrix}
 
+    # Helper function: XGBoost (low-memory QuantileDMatrix)
+    @staticmethod
+    def _process_xgboost_quantile(
+        TrainData=None,
+        ValidationData=None,
+        TestData=None,
+        TargetColumnName=None,
+        NumericColumnNames=None,
+        WeightColumnName=None,
+        MaxBin=256,
+        BatchRows=1_000_000,
+        Threads=None,
+    ):
+        """
+        Build XGBoost QuantileDMatrix objects directly from Polars DataFrames.
+
+        Rows are streamed in batches of BatchRows, so neither a pandas copy nor a
+        full float DMatrix is ever built. Validation / test matrices reference the
+        training quantile cuts (ref=train) as XGBoost requires.
+        """
+        if TrainData is None:
+            raise ValueError("TrainData must not be None for XGBoost.")
+
+        nthread = Threads if Threads is not None and Threads > 0 else None
+
+        def create_qdmatrix(data, ref):
+            if data is None:
+                return None
+            it = _PolarsBatchIter(
+                data,
+                feature_cols=NumericColumnNames,
+                label_col=TargetColumnName,
+                weight_col=WeightColumnName,
+                batch_rows=BatchRows,
+            )
+            return xgb.QuantileDMatrix(it, max_bin=MaxBin, ref=ref, nthread=nthread)
+
+        train_qdm = create_qdmatrix(TrainData, ref=None)
+        valid_qdm = create_qdmatrix(ValidationData, ref=train_qdm)
+        test_qdm = create_qdmatrix(TestData, ref=train_qdm)
+
+        return {"train_data": train_qdm, "validation_data": valid_qdm, "test_data": test_qdm}
+
     # Helper function: LightGBM
     @staticmethod
     def _process_lightgbm(
@@ -665,6 +1328,8 @@ class RetroFit:
         WeightColumnName=None,
         Threads=-1,
         TargetTransform: str | None = None,
+        LowMemory: bool = False,
+        LowMemoryBatchRows: int = 1_000_000,
     ):
         """
         Create modeling objects for specific algorithms (CatBoost, XGBoost, LightGBM).
@@ -684,6 +1349,12 @@ class RetroFit:
                 - "standardize"→ (y - mean) / std  (params learned from TrainData)
       
               Applied in create_model_data() for regression and inverted in score().
+            LowMemory: XGBoost only. Build QuantileDMatrix objects straight from the
+              Polars columns (in batches of LowMemoryBatchRows) instead of a pandas
+              copy + DMatrix. Requires tree_method 'hist' / 'gpu_hist'. The matrices
+              are kept in self.ModelData and reused by every train() call until
+              max_bin changes.
+            LowMemoryBatchRows: Rows per batch fed to the QuantileDMatrix sketch.
     
         Side effects:
             - Stores POLARS originals in self.DataFrames["train"/"validation"/"test"]
@@ -721,10 +1392,18 @@ class RetroFit:
         ValidationData = self.DataFrames["validation"]
         TestData = self.DataFrames["test"]
 
-        # 4) Convert to pandas for model objects
-        train_pd = self._to_pandas(TrainData)
-        valid_pd = self._to_pandas(ValidationData)
-        test_pd = self._to_pandas(TestData)
+        # 4) Convert to pandas for model objects (skipped by the low-memory XGBoost path)
+        self.ModelDataOptions = {
+            "LowMemory": bool(LowMemory) and self.Algorithm == "xgboost",
+            "LowMemoryBatchRows": int(LowMemoryBatchRows),
+            "Threads": Threads,
+        }
+        if self.ModelDataOptions["LowMemory"]:
+            train_pd = valid_pd = test_pd = None
+        else:
+            train_pd = self._to_pandas(TrainData)
+            valid_pd = self._to_pandas(ValidationData)
+            test_pd = self._to_pandas(TestData)
 
         # 5) Select processing pipeline
         if self.Algorithm == 'catboost':
@@ -741,6 +1420,11 @@ class RetroFit:
             )
             self.ModelDataNames = [*self.ModelData]
 
+        elif self.Algorithm == 'xgboost' and self.ModelDataOptions["LowMemory"]:
+            if not self.NumericColumnNames:
+                raise ValueError("NumericColumnNames must be provided for XGBoost.")
+            self._build_xgboost_quantile_data(max_bin=256)
+
         elif self.Algorithm == 'xgboost':
             if not self.NumericColumnNames:
                 raise ValueError("NumericColumnNames must be provided for XGBoost.")
@@ -773,6 +1457,27 @@ class RetroFit:
         # 6) Initialize base model parameters for this algorithm/target type
         self.create_model_parameters()
 
+    # Build / rebuild low-memory XGBoost matrices from the stored Polars splits
+    def _build_xgboost_quantile_data(self, max_bin: int):
+        """
+        (Re)build self.ModelData as QuantileDMatrix objects from self.DataFrames.
+        Called by create_model_data(LowMemory=True) and by train() when the
+        max_bin in ModelArgs no longer matches the one used for the sketch.
+        """
+        self.ModelData = self._process_xgboost_quantile(
+            TrainData=self.DataFrames["train"],
+            ValidationData=self.DataFrames["validation"],
+            TestData=self.DataFrames["test"],
+            TargetColumnName=self.TargetColumnName,
+            NumericColumnNames=self.NumericColumnNames,
+            WeightColumnName=self.WeightColumnName,
+            MaxBin=int(max_bin),
+            BatchRows=self.ModelDataOptions.get("LowMemoryBatchRows", 1_000_000),
+            Threads=self.ModelDataOptions.get("Threads"),
+        )
+        self.ModelDataNames = [*self.ModelData]
+        self.ModelDataOptions["max_bin"] = int(max_bin)
+
 
     #################################################
     # Function: Create Algo-Specific Args
@@ -1078,10 +1783,190 @@ class RetroFit:
                 # These GPU params are ignored on CPU but we can omit them for clarity
                 AlgoArgs["num_gpu"] = 0
 
+        # Calibrated thread counts for this host / engine / data shape (if any)
+        self._apply_thread_profile(AlgoArgs)
+
         # Store Model Parameters
         self.ModelArgs = AlgoArgs
         self.ModelArgsNames = [*self.ModelArgs]
 
+    # Thread profile lookup for create_model_parameters()
+    def _thread_profile_entry(self, path=None) -> dict | None:
+        train_df = self.DataFrames.get("train")
+        if train_df is None:
+            return None
+        n_cols = len(self._model_feature_columns())
+        key = _thread_profile_key(self.Algorithm, train_df.height, n_cols)
+        return _load_thread_profile(path).get(key)
+
+    def _use_thread_profile(self) -> bool:
+        use = getattr(self, "UseThreadProfile", None)
+        if use is None:
+            # Opt-in: an explicit profile location, never the default file by itself
+            return bool(getattr(self, "ThreadProfilePath", None) or os.environ.get("RETROFIT_THREAD_PROFILE"))
+        return bool(use)
+
+    def _set_profile_score_threads(self, threads: int):
+        """
+        Use a calibrated predict thread count unless ScoreThreads was set by the user
+        (a value that did not come from a profile).
+        """
+        current = getattr(self, "ScoreThreads", None)
+        if current and current != getattr(self, "ProfileScoreThreads", None):
+            return
+        self.ScoreThreads = int(threads)
+        self.ProfileScoreThreads = int(threads)
+
+    def _apply_thread_profile(self, AlgoArgs: dict):
+        """
+        Overwrite the engine thread parameter with the calibrated value stored by
+        calibrate_threads() for this host, engine and data-shape bucket, and use
+        the calibrated predict thread count for scoring unless ScoreThreads was
+        set explicitly. Only runs when the profile is enabled (UseThreadProfile).
+        """
+        if self.GPU or not self._use_thread_profile():
+            return
+        entry = self._thread_profile_entry(getattr(self, "ThreadProfilePath", None))
+        if entry and entry.get("train_threads"):
+            AlgoArgs[_THREAD_PARAM[self.Algorithm]] = int(entry["train_threads"])
+        if entry and entry.get("predict_threads"):
+            self._set_profile_score_threads(entry["predict_threads"])
+
+    # Feature columns the engine sees
+    def _model_feature_columns(self, engine: str | None = None) -> list:
+        if (engine or self.Algorithm) == "catboost":
+            return (self.NumericColumnNames or []) + \
+                   (self.CategoricalColumnNames or []) + \
+                   (self.TextColumnNames or [])
+        return list(self.NumericColumnNames or [])
+
+    # Time short fits / predictions at several thread counts
+    def calibrate_threads(
+        self,
+        ThreadCounts=None,
+        SampleRows: int = 100_000,
+        Iterations: int = 50,
+        Repeats: int = 1,
+        ProfilePath=None,
+        Seed: int = 42,
+    ) -> pl.DataFrame:
+        """
+        Find the fastest thread count for this machine, engine and data shape.
+
+        Runs short timed fits (Iterations rounds) and predictions on a sample of
+        self.DataFrames['train'] at each thread count, persists the best settings
+        in a local profile file keyed by (host, engine, row / column scale bucket),
+        and applies the best training thread count to self.ModelArgs and the best
+        predict thread count to self.ScoreThreads (unless set explicitly).
+
+        Profiles are opt-in: create_model_parameters() applies a stored profile
+        when UseThreadProfile=True, or when UseThreadProfile is None (default)
+        and ThreadProfilePath or $RETROFIT_THREAD_PROFILE is set. After a
+        calibration, ThreadProfilePath points at the profile that was written.
+
+        Parameters
+        ----------
+        ThreadCounts : list[int] or None
+            Thread counts to try. Default: powers of two up to os.cpu_count(), plus
+            os.cpu_count() and half of it (physical cores on hyper-threaded hosts).
+        SampleRows : int
+            Rows sampled from the training frame for the timed runs.
+        Iterations : int
+            Boosting rounds per timed fit.
+        Repeats : int
+            Timed repetitions per thread count; the minimum is kept.
+        ProfilePath : str or Path or None
+            Profile file. Default $RETROFIT_THREAD_PROFILE or ~/.retrofit/thread_profile.json.
+
+        Returns
+        -------
+        pl.DataFrame
+            Threads, FitSeconds, PredictSeconds (one row per thread count).
+        """
+        train_df = self.DataFrames.get("train")
+        if train_df is None:
+            raise RuntimeError("Training data is missing; call create_model_data() first.")
+        if not self.ModelArgs:
+            raise RuntimeError("self.ModelArgs is empty. Call create_model_parameters() first.")
+
+        n_cpu = os.cpu_count() or 1
+        if ThreadCounts is None:
+            grid = {1, n_cpu, max(1, n_cpu // 2)}
+            t = 2
+            while t < n_cpu:
+                grid.add(t)
+                t *= 2
+            ThreadCounts = sorted(grid)
+
+        sample = train_df.sample(n=min(SampleRows, train_df.height), seed=Seed)
+        thread_key = _THREAD_PARAM[self.Algorithm]
+        iter_key = {"catboost": "iterations", "xgboost": "num_boost_round", "lightgbm": "num_iterations"}[self.Algorithm]
+
+        rows = []
+        for threads in ThreadCounts:
+            fit_times, pred_times = [], []
+            for _ in range(max(1, int(Repeats))):
+                rf = RetroFit(Algorithm=self.Algorithm, TargetType=self.TargetType, GPU=self.GPU)
+                rf.UseThreadProfile = False
+                rf.ScoreThreads = int(threads)
+                rf.create_model_data(
+                    TrainData=sample,
+                    TargetColumnName=self.TargetColumnName,
+                    NumericColumnNames=self.NumericColumnNames,
+                    CategoricalColumnNames=self.CategoricalColumnNames,
+                    TextColumnNames=self.TextColumnNames,
+                    WeightColumnName=self.WeightColumnName,
+                    Threads=threads,
+                )
+                args = dict(self.ModelArgs)
+                args[thread_key] = int(threads)
+                args[iter_key] = int(Iterations)
+                # No validation set here, so no early stopping
+                args.pop("early_stopping_round", None)
+                args.pop("early_stopping_rounds", None)
+                rf.ModelArgs = args
+                if getattr(self, "CustomObjectiveName", None):
+                    rf.set_custom_objective(self.CustomObjectiveName)
+
+                t0 = time.perf_counter()
+                rf.train()
+                fit_times.append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                rf.score(NewData=sample)
+                pred_times.append(time.perf_counter() - t0)
+
+            rows.append({
+                "Threads": int(threads),
+                "FitSeconds": min(fit_times),
+                "PredictSeconds": min(pred_times),
+            })
+
+        out = pl.DataFrame(rows)
+        best_train = int(out.sort("FitSeconds").row(0, named=True)["Threads"])
+        best_predict = int(out.sort("PredictSeconds").row(0, named=True)["Threads"])
+
+        # Persist under this host / engine / shape bucket
+        key = _thread_profile_key(self.Algorithm, train_df.height, len(self._model_feature_columns()))
+        profile = _load_thread_profile(ProfilePath)
+        profile[key] = {
+            "train_threads": best_train,
+            "predict_threads": best_predict,
+            "sample_rows": sample.height,
+            "iterations": int(Iterations),
+            "timings": rows,
+            "calibrated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        _save_thread_profile(profile, ProfilePath)
+
+        # Apply right away
+        self.ModelArgs[thread_key] = best_train
+        self.ModelArgsNames = [*self.ModelArgs]
+        self._set_profile_score_threads(best_predict)
+        self.ThreadProfilePath = str(_thread_profile_path(ProfilePath))
+
+        return out
+
     # Update params
     def update_model_parameters(
         self,
@@ -1120,6 +2005,76 @@ class RetroFit:
     def print_algo_args(self):
         print(u.print_dict(self.ModelArgs))
 
+    # Custom objective / eval metric from the registry
+    def set_custom_objective(self, name: str | None):
+        """
+        Use a registered custom objective and/or eval metric in train().
+
+        The functions are registered once with retrofit.objectives.register_objective()
+        as NumPy-vectorized grad/hess and metric functions and are adapted to the
+        CatBoost, XGBoost or LightGBM callback interface at train() time.
+
+        Parameters
+        ----------
+        name : str or None
+            Registered objective name. None reverts to the built-in loss in ModelArgs.
+        """
+        if name is None:
+            self.CustomObjectiveName = None
+            return
+
+        # Validate it exists now rather than at train()
+        obj_reg.get_objective(name)
+
+        if self.TargetType not in ("regression", "classification"):
+            raise ValueError(
+                "Custom objectives support single-output targets only "
+                "(TargetType 'regression' or 'classification')."
+            )
+        self.CustomObjectiveName = name
+
+    # Resolve registry entry + engine adapters for train()
+    def _custom_objective_callbacks(self, stats):
+        """
+        Return (objective_callback, metric_callback) adapted to self.Algorithm,
+        either of which may be None.
+        """
+        name = getattr(self, "CustomObjectiveName", None)
+        if name is None:
+            return None, None
+
+        custom = obj_reg.get_objective(name)
+        has_obj = custom.grad_hess is not None
+        has_metric = custom.metric is not None
+
+        # Engines hand probabilities to metrics unless the objective is custom
+        to_raw = self.TargetType == "classification" and not has_obj
+
+        if self.Algorithm == "catboost":
+            fobj = obj_reg.CatBoostObjectiveAdapter(custom, stats) if has_obj else None
+            feval = obj_reg.CatBoostMetricAdapter(custom, stats) if has_metric else None
+        elif self.Algorithm == "xgboost":
+            fobj = obj_reg.xgboost_objective(custom, stats) if has_obj else None
+            feval = obj_reg.xgboost_metric(custom, stats, to_raw=to_raw) if has_metric else None
+        elif self.Algorithm == "lightgbm":
+            fobj = obj_reg.lightgbm_objective(custom, stats) if has_obj else None
+            feval = obj_reg.lightgbm_metric(custom, stats, to_raw=to_raw) if has_metric else None
+        else:
+            raise ValueError(f"Unsupported Algorithm: {self.Algorithm}")
+
+        return fobj, feval
+
+    # Record fit time + callback overhead
+    def _record_train_telemetry(self, name: str, fit_seconds: float, stats):
+        callback_seconds = stats.objective_seconds + stats.metric_seconds
+        self.TrainTelemetry[name] = {
+            "fit_seconds": fit_seconds,
+            "custom_objective": getattr(self, "CustomObjectiveName", None),
+            **stats.as_dict(),
+            "callback_seconds": callback_seconds,
+            "callback_share": callback_seconds / fit_seconds if fit_seconds > 0 else 0.0,
+        }
+
 
     #################################################
     # Function: Train Model
@@ -1148,6 +2103,133 @@ class RetroFit:
 
         return train_df.select(pl.col(target).n_unique()).item()
 
+    # Register a fitted / restored model in Model, ModelList and FitList
+    def _register_trained_model(self, model, fit_seconds: float, stats, cache_key: str | None = None):
+        """
+        Store `model` as self.Model, add it to ModelList / FitList under the
+        next '<Engine><n>' name, record telemetry and (optionally) write it to
+        the training cache. Returns the model name.
+        """
+        prefix = {"catboost": "CatBoost", "xgboost": "XGBoost", "lightgbm": "LightGBM"}[self.Algorithm]
+
+        # Store main handle
+        self.Model = model
+
+        # Track in model lists
+        name = f"{prefix}{len(self.ModelList) + 1}"
+        self.ModelList[name] = model
+        self.ModelListNames.append(name)
+
+        self.FitList[name] = model
+        self.FitListNames.append(name)
+
+        self._record_train_telemetry(name, fit_seconds, stats)
+
+        if cache_key is not None and getattr(self, "TrainingCache", None) is not None:
+            self.TrainingCache.put(
+                cache_key,
+                writer=lambda d: self._save_native_model(model, self.Algorithm, d),
+                meta={"Algorithm": self.Algorithm, "TargetType": self.TargetType},
+            )
+
+        return name
+
+    # Native model IO (used by the training cache)
+    @staticmethod
+    def _native_model_filename(algorithm: str) -> str:
+        return {
+            "catboost": "model.cbm",
+            "xgboost": "model.ubj",
+            "lightgbm": "model.txt",
+        }[algorithm]
+
+    @staticmethod
+    def _save_native_model(model, algorithm: str, directory) -> Path:
+        """
+        Save a fitted booster in its engine's native format into `directory`.
+        """
+        path = Path(directory) / RetroFit._native_model_filename(algorithm)
+        if algorithm == "catboost":
+            model.save_model(str(path), format="cbm")
+        elif algorithm in ("xgboost", "lightgbm"):
+            model.save_model(str(path))
+        else:
+            raise ValueError(f"Unsupported Algorithm: {algorithm}")
+        return path
+
+    @staticmethod
+    def _load_native_model(algorithm: str, target_type: str, directory):
+        """
+        Load a booster saved with _save_native_model().
+        """
+        path = Path(directory) / RetroFit._native_model_filename(algorithm)
+        if algorithm == "catboost":
+            model = CatBoostRegressor() if target_type == "regression" else CatBoostClassifier()
+            model.load_model(str(path), format="cbm")
+            return model
+        if algorithm == "xgboost":
+            booster = xgb.Booster()
+            booster.load_model(str(path))
+            return booster
+        if algorithm == "lightgbm":
+            return lgbm.Booster(model_file=str(path))
+        raise ValueError(f"Unsupported Algorithm: {algorithm}")
+
+    # Training cache
+    def set_training_cache(self, CacheDir=None, MaxSizeMB: float = 2048):
+        """
+        Enable (or disable with CacheDir=None) the on-disk training cache.
+
+        When enabled, train() looks up a key built from the data fingerprint,
+        Algorithm, TargetType, normalized ModelArgs and library versions. On a
+        hit the booster is restored from its native file into Model / ModelList /
+        FitList without refitting. Entries are evicted LRU beyond MaxSizeMB.
+
+        Use self.TrainingCache.entries() to inspect and
+        self.TrainingCache.purge(keys=None) to remove entries.
+        """
+        if CacheDir is None:
+            self.TrainingCache = None
+            return None
+        self.TrainingCache = TrainingCache(CacheDir, max_size_mb=MaxSizeMB)
+        return self.TrainingCache
+
+    def _training_cache_key(self) -> str:
+        """
+        Content address for the current training setup.
+        """
+        versions = {
+            "catboost": catboost.__version__,
+            "xgboost": xgb.__version__,
+            "lightgbm": lgbm.__version__,
+            "polars": pl.__version__,
+        }
+        # classes_count / num_class are derived from the data in train()
+        args = {
+            k: v for k, v in (self.ModelArgs or {}).items()
+            if k not in ("classes_count", "num_class")
+        }
+        parts = {
+            "data": {
+                split: frame_fingerprint(self.DataFrames.get(split))
+                for split in ("train", "validation")
+            },
+            "columns": {
+                "target": self.TargetColumnName,
+                "numeric": self.NumericColumnNames,
+                "categorical": self.CategoricalColumnNames,
+                "text": self.TextColumnNames,
+                "weight": self.WeightColumnName,
+            },
+            "Algorithm": self.Algorithm,
+            "TargetType": self.TargetType,
+            "GPU": self.GPU,
+            "ModelArgs": args,
+            "CustomObjective": obj_reg.objective_fingerprint(getattr(self, "CustomObjectiveName", None)),
+            "versions": versions,
+        }
+        return TrainingCache.make_key(parts)
+
     # Main training function
     def train(self):
         """
@@ -1164,11 +2246,15 @@ class RetroFit:
             - self.ModelListNames
             - self.FitList         (same objects as Model, for now)
             - self.FitListNames
+            - self.TrainTelemetry  (fit seconds + custom callback overhead per model)
+
+        If set_training_cache() was called, a matching cache entry is restored
+        instead of refitting.
         """
     
         # Basic checks
-        if self.ModelData is None:
-            raise RuntimeError("ModelData is None. Call create_model_data() before train().")
+        if not self.ModelData:
+            raise RuntimeError("ModelData is empty. Call create_model_data() before train().")
     
         if not self.ModelArgs:
             raise RuntimeError("self.ModelArgs is empty. Call create_model_parameters() before train().")
@@ -1176,6 +2262,18 @@ class RetroFit:
         if self.Algorithm is None:
             raise RuntimeError("self.Algorithm is None. It must be 'catboost', 'xgboost', or 'lightgbm'.")
 
+        # Training cache: restore the booster on a key hit instead of refitting
+        cache_key = None
+        if getattr(self, "TrainingCache", None) is not None:
+            cache_key = self._training_cache_key()
+            entry = self.TrainingCache.get(cache_key)
+            if entry is not None:
+                model = self._load_native_model(self.Algorithm, self.TargetType, entry)
+                name = self._register_trained_model(model, 0.0, obj_reg.CallbackStats())
+                self.TrainTelemetry[name]["cache_hit"] = True
+                self.TrainTelemetry[name]["cache_key"] = cache_key
+                return model
+
         #################################################
         # CatBoost Method
         #################################################
@@ -1191,36 +2289,44 @@ class RetroFit:
                 n_classes = self._infer_num_classes()
                 self.ModelArgs["classes_count"] = n_classes
 
+            # Custom objective / metric adapters (if any)
+            stats = obj_reg.CallbackStats()
+            fobj, feval = self._custom_objective_callbacks(stats)
+            params = dict(self.ModelArgs)
+            if fobj is not None:
+                params["loss_function"] = fobj
+                params["boost_from_average"] = False
+            if feval is not None:
+                params["eval_metric"] = feval
+
             # Initialize model
             if self.TargetType == "regression":
-                model = CatBoostRegressor(**self.ModelArgs)
+                model = CatBoostRegressor(**params)
             elif self.TargetType == "classification":
-                model = CatBoostClassifier(**self.ModelArgs)
+                model = CatBoostClassifier(**params)
             elif self.TargetType == "multiclass":
-                model = CatBoostClassifier(**self.ModelArgs)
+                model = CatBoostClassifier(**params)
             else:
                 raise ValueError(f"Unsupported TargetType for CatBoost: {self.TargetType}")
     
-            # Fit model (validation optional)
+            # Fit model (validation optional); async callers can stop it early
+            cancel = getattr(_CANCEL, "event", None)
+            fit_kwargs = {"callbacks": [_CatBoostCancel(cancel)]} if cancel is not None else {}
+            t0 = time.perf_counter()
             if valid_pool is not None:
                 model.fit(
                     train_pool,
                     eval_set=valid_pool,
-                    use_best_model=True
+                    use_best_model=True,
+                    **fit_kwargs
                 )
             else:
-                model.fit(train_pool)
-    
-            # Store main handle
-            self.Model = model
+                model.fit(train_pool, **fit_kwargs)
+            fit_seconds = time.perf_counter() - t0
+            _check_cancelled()
     
-            # Track in model lists
-            name = f"CatBoost{len(self.ModelList) + 1}"
-            self.ModelList[name] = model
-            self.ModelListNames.append(name)
-    
-            self.FitList[name] = model
-            self.FitListNames.append(name)
+            # Store main handle, track in model lists (+ training cache)
+            self._register_trained_model(model, fit_seconds, stats, cache_key=cache_key)
     
             return model  # optional convenience
     
@@ -1229,6 +2335,19 @@ class RetroFit:
         #################################################
         if self.Algorithm == 'xgboost':
     
+            # Low-memory mode: QuantileDMatrix only works with hist, and its cuts
+            # must match max_bin. Reuse the existing matrices unless max_bin changed.
+            if getattr(self, "ModelDataOptions", {}).get("LowMemory"):
+                tree_method = self.ModelArgs.get("tree_method", "hist")
+                if tree_method not in ("hist", "gpu_hist"):
+                    raise ValueError(
+                        f"create_model_data(LowMemory=True) requires tree_method 'hist' "
+                        f"or 'gpu_hist', got '{tree_method}'."
+                    )
+                max_bin = int(self.ModelArgs.get("max_bin", 256))
+                if self.ModelDataOptions.get("max_bin") != max_bin:
+                    self._build_xgboost_quantile_data(max_bin=max_bin)
+
             dtrain = self.ModelData["train_data"]
             dvalid = self.ModelData.get("validation_data")
             # dtest exists but is intentionally NOT used here:
@@ -1253,24 +2372,27 @@ class RetroFit:
             params = {k: v for k, v in self.ModelArgs.items()
                       if k not in ("num_boost_round", "early_stopping_rounds")}
 
+            # Custom objective / metric adapters (if any)
+            stats = obj_reg.CallbackStats()
+            fobj, feval = self._custom_objective_callbacks(stats)
+
+            cancel = getattr(_CANCEL, "event", None)
+            t0 = time.perf_counter()
             booster = xgb.train(
                 params=params,
                 dtrain=dtrain,
                 evals=evals if evals else None,
                 num_boost_round=num_boost_round,
-                early_stopping_rounds=early_stopping_rounds
+                early_stopping_rounds=early_stopping_rounds,
+                obj=fobj,
+                custom_metric=feval,
+                callbacks=[_XGBoostCancel(cancel)] if cancel is not None else None,
             )
+            fit_seconds = time.perf_counter() - t0
+            _check_cancelled()
     
-            # Store main handle
-            self.Model = booster
-    
-            # Track in model lists
-            name = f"XGBoost{len(self.ModelList) + 1}"
-            self.ModelList[name] = booster
-            self.ModelListNames.append(name)
-    
-            self.FitList[name] = booster
-            self.FitListNames.append(name)
+            # Store main handle, track in model lists (+ training cache)
+            self._register_trained_model(booster, fit_seconds, stats, cache_key=cache_key)
     
             return booster
     
@@ -1294,23 +2416,31 @@ class RetroFit:
                 n_classes = self._infer_num_classes()
                 self.ModelArgs["num_class"] = n_classes
 
+            # Custom objective / metric adapters (if any). A custom metric
+            # replaces the built-in one so it drives early stopping.
+            stats = obj_reg.CallbackStats()
+            fobj, feval = self._custom_objective_callbacks(stats)
+            params = dict(self.ModelArgs)
+            if fobj is not None:
+                params["objective"] = fobj
+            if feval is not None:
+                params["metric"] = "None"
+
+            cancel = getattr(_CANCEL, "event", None)
+            t0 = time.perf_counter()
             booster = lgbm.train(
-                params=self.ModelArgs,
+                params=params,
                 train_set=train_set,
                 valid_sets=valid_sets,
-                num_boost_round=num_boost_round
+                num_boost_round=num_boost_round,
+                feval=feval,
+                callbacks=[_lightgbm_cancel(cancel)] if cancel is not None else None,
             )
+            fit_seconds = time.perf_counter() - t0
+            _check_cancelled()
     
-            # Store main handle
-            self.Model = booster
-    
-            # Track in model lists
-            name = f"LightGBM{len(self.ModelList) + 1}"
-            self.ModelList[name] = booster
-            self.ModelListNames.append(name)
-    
-            self.FitList[name] = booster
-            self.FitListNames.append(name)
+            # Store main handle, track in model lists (+ training cache)
+            self._register_trained_model(booster, fit_seconds, stats, cache_key=cache_key)
     
             return booster
     
@@ -1358,70 +2488,245 @@ class RetroFit:
     
         raise ValueError(f"Unsupported TargetTransform '{t}'.")
 
-    # Catboost helper
-    def _score_catboost(self, model, df_pl: pl.DataFrame, feature_cols, internal_name: str | None):
+    # Thread count for engine predict calls (None / default → engine default)
+    def _score_threads(self, default):
+        n = getattr(self, "ScoreThreads", None)
+        return int(n) if n else default
+
+    # Engine of a fitted model object
+    @staticmethod
+    def _model_engine(model) -> str:
+        if isinstance(model, catboost.CatBoost):
+            return "catboost"
+        if isinstance(model, xgb.Booster):
+            return "xgboost"
+        if isinstance(model, lgbm.Booster):
+            return "lightgbm"
+        raise TypeError(f"Unsupported model type for scoring: {type(model).__name__}")
+
+    # Scoring step 1: engine input (Pool / DMatrix / feature frame)
+    def _score_input(self, engine: str, df_pl: pl.DataFrame, internal_name: str | None = None):
         """
-        Score a Polars DataFrame with a CatBoost model.
-        Uses pre-built Pools for train/validation/test when available.
+        Build the engine input for df_pl once; it can be reused by every model
+        of that engine. Pre-built Pools are reused for CatBoost internal splits.
+
+        df_pl is projected to the model's feature columns in Polars before any
+        conversion, so passthrough columns never reach pandas / NumPy. XGBoost
+        and LightGBM get a NumPy matrix straight from the Polars buffers.
         """
-        import numpy as np
-    
-        # Use existing Pools for internal splits if available
-        pool = None
-        if internal_name == "train":
-            pool = self.ModelData.get("train_data")
-        elif internal_name == "validation":
-            pool = self.ModelData.get("validation_data")
-        elif internal_name == "test":
-            pool = self.ModelData.get("test_data")
-    
-        # If no pool, build one from df_pl
-        if pool is None:
-            df_pd = self._to_pandas(df_pl)
-            data_pd = df_pd[feature_cols] if feature_cols else df_pd
-            pool = Pool(
-                data=data_pd,
-                label=None,
-                cat_features=self.CategoricalColumnNames,
-                text_features=self.TextColumnNames,
-                thread_count=self.ModelArgs.get("thread_count", -1)
+        if engine == "catboost":
+            pool = None
+            if internal_name in ("train", "validation", "test") and self.ModelData:
+                pool = self.ModelData.get(f"{internal_name}_data")
+                if not isinstance(pool, Pool):
+                    pool = None
+            if pool is None:
+                feature_cols = (self.NumericColumnNames or []) + \
+                               (self.CategoricalColumnNames or []) + \
+                               (self.TextColumnNames or [])
+                data_pd = self._to_pandas(df_pl.select(feature_cols) if feature_cols else df_pl)
+                pool = Pool(
+                    data=data_pd,
+                    label=None,
+                    cat_features=self.CategoricalColumnNames,
+                    text_features=self.TextColumnNames,
+                    thread_count=self.ModelArgs.get("thread_count", -1)
+                )
+            return pool
+
+        if not self.NumericColumnNames:
+            raise ValueError(f"NumericColumnNames must be set for {engine} scoring.")
+        X = df_pl.select(self.NumericColumnNames).to_numpy()
+
+        if engine == "xgboost":
+            return xgb.DMatrix(
+                X, feature_names=list(self.NumericColumnNames), nthread=self._score_threads(None)
             )
-    
-        # Prediction logic by TargetType
+        if engine == "lightgbm":
+            return X
+        raise ValueError(f"Unsupported engine in score(): {engine}")
+
+    # Scoring step 2: engine predict → normalized prediction array
+    def _score_predict(
+        self,
+        engine: str,
+        model,
+        data,
+        threads: int | None = None,
+        tree_limit: int | None = None,
+    ) -> np.ndarray:
+        """
+        Returns regression (N,), classification p1 (N,) or multiclass (N, K).
+        Only the first tree_limit boosting iterations are used when set
+        (defaults to the model's ScoringTreeLimit entry).
+        """
+        threads = threads or self._score_threads(None)
+        if tree_limit is None:
+            tree_limit = self._tree_limit(model)
+
+        if engine == "catboost":
+            ptype = "RawFormulaVal" if self.TargetType == "regression" else "Probability"
+            preds = np.asarray(model.predict(
+                data, prediction_type=ptype, ntree_end=tree_limit or 0, thread_count=threads or -1
+            ))
+        elif engine == "xgboost":
+            preds = np.asarray(model.predict(data, iteration_range=(0, tree_limit or 0)))
+        elif engine == "lightgbm":
+            kwargs = {"num_threads": threads} if threads else {}
+            preds = np.asarray(model.predict(data, num_iteration=tree_limit, **kwargs))
+            # Custom objectives leave LightGBM output on the raw (log-odds) scale
+            if self.TargetType == "classification" and \
+                    getattr(model, "params", {}).get("objective") in ("none", "custom"):
+                preds = 1.0 / (1.0 + np.exp(-preds))
+        else:
+            raise ValueError(f"Unsupported engine in score(): {engine}")
+
         if self.TargetType == "regression":
-            preds = model.predict(pool, prediction_type="RawFormulaVal")
-            preds = np.asarray(preds).ravel()
-            col_name = f"Predict_{self.TargetColumnName or 'target'}"
-            return df_pl.with_columns(
-                pl.Series(col_name, preds)
-            )
-    
-        # For classification / multiclass, we use probabilities
-        preds = model.predict(pool, prediction_type="Probability")
-        preds = np.asarray(preds)
-    
+            return preds.ravel()
         if self.TargetType == "classification":
-            # Binary: CatBoost usually returns Nx2
             if preds.ndim == 1:
-                p1 = preds
-            else:
-                p1 = preds[:, 1]
-            p0 = 1.0 - p1
-            return df_pl.with_columns([
-                pl.Series("p1", p1),
-                pl.Series("p0", p0),
-            ])
-    
+                return preds
+            # CatBoost returns [p0, p1]; XGBoost / LightGBM may return (N, 1)
+            return preds[:, 1] if preds.shape[1] == 2 else preds[:, 0]
         if self.TargetType == "multiclass":
-            # preds shape: (N, num_classes)
-            n_classes = preds.shape[1]
-            cols = [
-                pl.Series(f"class_{i}", preds[:, i])
-                for i in range(n_classes)
-            ]
-            return df_pl.with_columns(cols)
-    
-        raise ValueError(f"Unsupported TargetType for CatBoost scoring: {self.TargetType}")
+            # XGBoost / LightGBM return a flat array for zero rows
+            return preds.reshape(0, self._infer_num_classes()) if preds.size == 0 else preds
+        raise ValueError(f"Unsupported TargetType for {engine} scoring: {self.TargetType}")
+
+    # Scoring step 3: prediction columns (score() output layout)
+    def _prediction_series(self, preds: np.ndarray, suffix: str = "") -> list:
+        if self.TargetType == "regression":
+            return [pl.Series(f"Predict_{self.TargetColumnName or 'target'}{suffix}", preds)]
+        if self.TargetType == "classification":
+            return [pl.Series(f"p1{suffix}", preds), pl.Series(f"p0{suffix}", 1.0 - preds)]
+        layout = getattr(self, "MulticlassOutput", "columns")
+        if layout == "array":
+            return [pl.Series(f"class_probs{suffix}", np.ascontiguousarray(preds, dtype=np.float32))]
+        if layout == "memmap":
+            rows = self._probability_file(preds.shape[1]).append(preds)
+            return [pl.Series(f"class_probs_row{suffix}", rows)]
+        return [pl.Series(f"class_{i}{suffix}", preds[:, i]) for i in range(preds.shape[1])]
+
+    # Multiclass output layout
+    def set_multiclass_output(self, Layout: str = "array", Path: str | None = None):
+        """
+        Choose how score() emits multiclass probabilities.
+
+        "columns"  class_0..class_{K-1} Float64 columns (default)
+        "array"    one class_probs column of type Array(Float32, K)
+        "memmap"   one class_probs_row Int64 column of row ids into a float32
+                   (rows, K) file read through np.memmap (self.ProbabilityFile);
+                   the file lives in Path (a directory; temp dir if None) and
+                   is created on first use, then appended to
+
+        evaluate(), decode_predictions() and the post-processing stage read
+        all three layouts through _class_probabilities() without expanding
+        them back to K columns. Applies to data scored after the call.
+
+        Changing the layout or Path releases the current ProbabilityFile:
+        row ids held in self.ScoredData are first replaced by class_probs,
+        then the file is closed (a temp dir is removed). The file only grows
+        while in use; self.ProbabilityFile.truncate() empties it and
+        self.ProbabilityFile.close() deletes it (frames scored earlier can
+        no longer be read).
+        """
+        layout = (Layout or "columns").lower()
+        if layout not in ("columns", "array", "memmap"):
+            raise ValueError("Layout must be one of 'columns', 'array', 'memmap'.")
+        if layout != self.MulticlassOutput or Path != self.MulticlassOutputPath:
+            self._release_probability_file()
+        self.MulticlassOutput = layout
+        self.MulticlassOutputPath = Path
+
+    def _probability_file(self, n_classes: int) -> ProbabilityMatrixFile:
+        pf = getattr(self, "ProbabilityFile", None)
+        if pf is None or pf.closed:
+            owned = None if self.MulticlassOutputPath else tempfile.mkdtemp(prefix="retrofit-probs-")
+            folder = self.MulticlassOutputPath or owned
+            os.makedirs(folder, exist_ok=True)
+            folder = os.path.abspath(folder)
+            pf = ProbabilityMatrixFile(
+                os.path.join(folder, f"class_probs_{os.getpid()}_{id(self)}.f32"), n_classes, owned_dir=owned
+            )
+            self.ProbabilityFile = pf
+        return pf
+
+    def _release_probability_file(self):
+        """
+        Replace class_probs_row ids in self.ScoredData by class_probs, close
+        self.ProbabilityFile and empty the prediction cache.
+        """
+        pf = getattr(self, "ProbabilityFile", None)
+        if pf is None:
+            return
+        if not pf.closed:
+            for key, value in list(dict.items(self.ScoredData)):
+                frame = value.frame if isinstance(value, PredictionColumns) else value
+                rows = [c for c in frame.columns if c.startswith("class_probs_row")]
+                if not rows:
+                    continue
+                frame = frame.with_columns(
+                    [pl.Series(c.replace("class_probs_row", "class_probs", 1), pf.take(frame[c].to_numpy()))
+                     for c in rows]
+                ).drop(rows)
+                dict.__setitem__(
+                    self.ScoredData, key, PredictionColumns(frame) if isinstance(value, PredictionColumns) else frame
+                )
+            pf.close()
+        self.ProbabilityFile = None
+        # Cached class_probs_row ids pointed into the closed file
+        if getattr(self, "PredictionCache", None) is not None:
+            self.PredictionCache.clear()
+
+    def _class_probabilities(self, df_pl: pl.DataFrame, suffix: str = "") -> np.ndarray:
+        """
+        (n, K) class probabilities from any multiclass layout in df_pl.
+        """
+        col = f"class_probs{suffix}"
+        if col in df_pl.columns:
+            return df_pl.get_column(col).to_numpy()
+        col = f"class_probs_row{suffix}"
+        if col in df_pl.columns:
+            if getattr(self, "ProbabilityFile", None) is None:
+                raise RuntimeError(f"'{col}' found but self.ProbabilityFile is not set.")
+            return self.ProbabilityFile.take(df_pl.get_column(col).to_numpy())
+        cols = []
+        while f"class_{len(cols)}{suffix}" in df_pl.columns:
+            cols.append(f"class_{len(cols)}{suffix}")
+        if not cols:
+            raise ValueError(
+                "No class probabilities (class_k, class_probs or class_probs_row) found. "
+                "Did you run score() with a multiclass model?"
+            )
+        return df_pl.select(cols).to_numpy()
+
+    # Prediction columns <-> one (n, width) matrix (Array columns span several)
+    @staticmethod
+    def _prediction_matrix(df_pl: pl.DataFrame, cols: list) -> np.ndarray:
+        parts = [df_pl.get_column(c).to_numpy().reshape(df_pl.height, -1) for c in cols]
+        return parts[0] if len(parts) == 1 else np.hstack(parts)
+
+    @staticmethod
+    def _prediction_frame_columns(values: np.ndarray, columns: list, schema: list) -> list:
+        out, j = [], 0
+        for c, dt in zip(columns, schema):
+            if isinstance(dt, pl.Array):
+                out.append(pl.Series(c, np.ascontiguousarray(values[:, j:j + dt.size])).cast(dt))
+                j += dt.size
+            else:
+                out.append(pl.Series(c, values[:, j]).cast(dt))
+                j += 1
+        return out
+
+    # Catboost helper
+    def _score_catboost(self, model, df_pl: pl.DataFrame, feature_cols, internal_name: str | None):
+        """
+        Score a Polars DataFrame with a CatBoost model.
+        Uses pre-built Pools for train/validation/test when available.
+        """
+        pool = self._score_input("catboost", df_pl, internal_name)
+        preds = self._score_predict("catboost", model, pool)
+        return df_pl.with_columns(self._prediction_series(preds))
 
     # XGBoost helper
     def _score_xgboost(self, model, df_pl: pl.DataFrame, internal_name: str | None):
@@ -1429,52 +2734,9 @@ class RetroFit:
         Score a Polars DataFrame with an XGBoost Booster.
         Uses self.NumericColumnNames for features.
         """
-        import numpy as np
-    
-        if not self.NumericColumnNames:
-            raise ValueError("NumericColumnNames must be set for XGBoost scoring.")
-    
-        # Prepare features
-        df_pd = self._to_pandas(df_pl)
-        X = df_pd[self.NumericColumnNames]
-        dmat = xgb.DMatrix(X)
-    
-        # Predict
-        preds = model.predict(dmat)
-        preds = np.asarray(preds)
-    
-        # Regression
-        if self.TargetType == "regression":
-            col_name = f"Predict_{self.TargetColumnName or 'target'}"
-            return df_pl.with_columns(
-                pl.Series(col_name, preds.ravel())
-            )
-    
-        # Binary classification
-        if self.TargetType == "classification":
-            # XGBoost binary: often returns prob of class 1 as 1D array
-            if preds.ndim == 1:
-                p1 = preds
-            else:
-                # In case it returns Nx1
-                p1 = preds[:, 0]
-            p0 = 1.0 - p1
-            return df_pl.with_columns([
-                pl.Series("p1", p1),
-                pl.Series("p0", p0),
-            ])
-    
-        # Multiclass classification
-        if self.TargetType == "multiclass":
-            # preds: (N, num_classes)
-            n_classes = preds.shape[1]
-            cols = [
-                pl.Series(f"class_{i}", preds[:, i])
-                for i in range(n_classes)
-            ]
-            return df_pl.with_columns(cols)
-    
-        raise ValueError(f"Unsupported TargetType for XGBoost scoring: {self.TargetType}")
+        dmat = self._score_input("xgboost", df_pl)
+        preds = self._score_predict("xgboost", model, dmat)
+        return df_pl.with_columns(self._prediction_series(preds))
 
     # LightGBM helper
     def _score_lightgbm(self, model, df_pl: pl.DataFrame, internal_name: str | None):
@@ -1482,47 +2744,70 @@ class RetroFit:
         Score a Polars DataFrame with a LightGBM Booster.
         Uses self.NumericColumnNames for features.
         """
-        import numpy as np
-    
-        if not self.NumericColumnNames:
-            raise ValueError("NumericColumnNames must be set for LightGBM scoring.")
-    
-        df_pd = self._to_pandas(df_pl)
-        X = df_pd[self.NumericColumnNames]
-    
-        preds = model.predict(X)
-        preds = np.asarray(preds)
-    
-        # Regression
-        if self.TargetType == "regression":
-            col_name = f"Predict_{self.TargetColumnName or 'target'}"
-            return df_pl.with_columns(
-                pl.Series(col_name, preds.ravel())
+        X = self._score_input("lightgbm", df_pl)
+        preds = self._score_predict("lightgbm", model, X)
+        return df_pl.with_columns(self._prediction_series(preds))
+
+    # Several models over one engine input
+    def _score_many(self, df_pl: pl.DataFrame, internal_name: str | None, models: dict, store: bool):
+        """
+        Score df_pl with every model in `models` ({ModelName: model}). The
+        engine input is built once per engine and the models run concurrently
+        in threads (the engines release the GIL while predicting). Prediction
+        columns get a _<ModelName> suffix; the stored copy of an internal split
+        also carries the first model's columns unsuffixed.
+        """
+        flags = None
+        if internal_name is None:
+            df_pl, flags, report = self._validated(df_pl, models.values())
+        engines = {name: self._model_engine(m) for name, m in models.items()}
+        inputs = {
+            e: self._score_input(e, df_pl, internal_name if e == self.Algorithm else None)
+            for e in dict.fromkeys(engines.values())
+        }
+        threads = max(1, (os.cpu_count() or 1) // len(models))
+
+        def _run(name):
+            return self._score_predict(engines[name], models[name], inputs[engines[name]], threads)
+
+        with ThreadPoolExecutor(max_workers=len(models)) as ex:
+            preds = dict(zip(models, ex.map(_run, models)))
+
+        scored = df_pl.with_columns([
+            s for name in models for s in self._prediction_series(preds[name], suffix=f"_{name}")
+        ])
+        for name in models:
+            scored = self._apply_postprocessing(scored, suffix=f"_{name}")
+        if flags is not None:
+            scored = scored.with_columns(flags)
+            self.ValidationReport = report
+        _check_cancelled()
+        # Column -> model by longest matching suffix (names may end in other
+        # names); ValidationFlags is shared by all models
+        owned = {name: [] for name in models}
+        for c in scored.columns:
+            if c not in df_pl.columns and c != "ValidationFlags":
+                name = max((n for n in models if c.endswith(f"_{n}")), key=len)
+                owned[name].append(c)
+        if getattr(self, "AuditLog", None) is not None:
+            shared = [pl.col("ValidationFlags")] if flags is not None else []
+            for name, cols in owned.items():
+                self._audit(
+                    df_pl,
+                    scored.select([pl.col(c).alias(c[: -len(name) - 1]) for c in cols] + shared),
+                    models[name],
+                    name,
+                )
+        if store and internal_name is not None:
+            # evaluate, calibration tables, PDPs and decode_predictions read the
+            # plain prediction columns: store the first (champion) model's
+            # columns under those names as well
+            champion = next(iter(models))
+            stored = scored.with_columns(
+                [pl.col(c).alias(c[: -len(champion) - 1]) for c in owned[champion]]
             )
-    
-        # Binary classification (preds: prob of class 1)
-        if self.TargetType == "classification":
-            if preds.ndim == 1:
-                p1 = preds
-            else:
-                p1 = preds[:, 0]
-            p0 = 1.0 - p1
-            return df_pl.with_columns([
-                pl.Series("p1", p1),
-                pl.Series("p0", p0),
-            ])
-    
-        # Multiclass classification
-        if self.TargetType == "multiclass":
-            # preds: (N, num_classes)
-            n_classes = preds.shape[1]
-            cols = [
-                pl.Series(f"class_{i}", preds[:, i])
-                for i in range(n_classes)
-            ]
-            return df_pl.with_columns(cols)
-    
-        raise ValueError(f"Unsupported TargetType for LightGBM scoring: {self.TargetType}")
+            self._store_scored(internal_name, stored, df_pl)
+        return scored
 
     # Apply inverse transform
     def _inverse_transform_predictions_inplace(self, df_pl: pl.DataFrame) -> pl.DataFrame:
@@ -1553,6 +2838,155 @@ class RetroFit:
             self._inverse_target_transform_expr(pred_col).alias(pred_col)
         )
 
+    # Prediction post-processing
+    def set_postprocessing(
+        self,
+        Threshold: float = 0.5,
+        ClassThresholds=None,
+        TopK: int | None = None,
+        DecodeLabels: bool = True,
+        Enabled: bool = True,
+    ):
+        """
+        Turn on a post-processing stage in score() for classification / multiclass.
+
+        After the probability columns are produced, score() adds:
+          PredictedClassIdx     predicted class index (Int64)
+          PredictedLabel        original label for that index (DecodeLabels=True)
+          Top{j}_Label,
+          Top{j}_Prob           j = 1..TopK, most probable classes first (TopK set)
+
+        Threshold applies to p1 (classification). ClassThresholds (multiclass)
+        is a list indexed by class or a dict keyed by class index or original
+        label; the prediction is the most probable class whose probability
+        clears its threshold, falling back to the plain argmax when none does.
+        Everything runs on NumPy arrays of the probability columns, and labels
+        are decoded with one gather from a precomputed label dictionary. With
+        several models (score(ModelNames=...)) the columns get the same
+        _<ModelName> suffix as the probabilities. Enabled=False turns it off.
+        """
+        if not Enabled:
+            self.PostProcessing = None
+            return
+        if TopK is not None and int(TopK) < 1:
+            raise ValueError("TopK must be >= 1.")
+        self.PostProcessing = {
+            "Threshold": float(Threshold),
+            "ClassThresholds": ClassThresholds,
+            "TopK": int(TopK) if TopK is not None else None,
+            "DecodeLabels": bool(DecodeLabels),
+        }
+
+    def _label_dictionary(self, n_classes: int) -> pl.Series:
+        """
+        Class index -> original label as a Series, so decoding is a gather.
+        Falls back to the index itself when labels were not encoded.
+        """
+        inv = self.LabelMappingInverse
+        if not inv:
+            return pl.Series("label", np.arange(n_classes, dtype=np.int64))
+        return pl.Series("label", [inv.get(i) for i in range(n_classes)])
+
+    def _class_thresholds(self, thresholds, n_classes: int) -> np.ndarray:
+        out = np.zeros(n_classes, dtype=np.float64)
+        if isinstance(thresholds, dict):
+            label_to_idx = self.LabelMapping or {}
+            for k, v in thresholds.items():
+                i = label_to_idx.get(k, k)
+                if not isinstance(i, (int, np.integer)) or not 0 <= i < n_classes:
+                    raise ValueError(f"ClassThresholds key {k!r} is not a known class.")
+                out[i] = float(v)
+        else:
+            vals = np.asarray(thresholds, dtype=np.float64).reshape(-1)
+            if vals.size != n_classes:
+                raise ValueError(
+                    f"ClassThresholds has {vals.size} entries; model has {n_classes} classes."
+                )
+            out[:] = vals
+        return out
+
+    def _postprocess_series(
+        self,
+        probs: np.ndarray,
+        suffix: str = "",
+        threshold: float = 0.5,
+        class_thresholds=None,
+        top_k: int | None = None,
+        decode: bool = True,
+    ) -> list:
+        """
+        Predicted class index, decoded label and top-k columns from a
+        probability matrix (classification: (n,) p1; multiclass: (n, K)).
+        """
+        if probs.ndim == 1:
+            p1 = probs
+            idx = (p1 >= threshold).astype(np.int64)
+            if top_k:
+                probs = np.column_stack([1.0 - p1, p1])
+        else:
+            if class_thresholds is not None:
+                t = self._class_thresholds(class_thresholds, probs.shape[1])
+                ok = probs >= t
+                idx = np.where(ok, probs, -np.inf).argmax(axis=1)
+                none = ~ok.any(axis=1)
+                if none.any():
+                    idx[none] = probs[none].argmax(axis=1)
+            else:
+                idx = probs.argmax(axis=1)
+            idx = idx.astype(np.int64)
+
+        n_classes = 2 if probs.ndim == 1 else probs.shape[1]
+        labels = self._label_dictionary(n_classes) if (decode or top_k) else None
+
+        out = [pl.Series(f"PredictedClassIdx{suffix}", idx)]
+        if decode:
+            out.append(labels.gather(idx).alias(f"PredictedLabel{suffix}"))
+
+        if top_k:
+            k = min(top_k, n_classes)
+            if k < n_classes:
+                top = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+                order = np.argsort(-np.take_along_axis(probs, top, axis=1), axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1)
+            else:
+                top = np.argsort(-probs, axis=1, kind="stable")
+            top_p = np.take_along_axis(probs, top, axis=1)
+            for j in range(k):
+                out.append(labels.gather(top[:, j]).alias(f"Top{j + 1}_Label{suffix}"))
+                out.append(pl.Series(f"Top{j + 1}_Prob{suffix}", top_p[:, j]))
+        return out
+
+    def _probability_matrix(self, df_pl: pl.DataFrame, suffix: str = "") -> np.ndarray:
+        """
+        p1 (classification) or class_0..class_{K-1} (multiclass) as NumPy.
+        """
+        if self.TargetType == "classification":
+            col = f"p1{suffix}"
+            if col not in df_pl.columns:
+                raise ValueError(
+                    f"Missing '{col}' column for binary classification predictions. "
+                    "Did you run score() first?"
+                )
+            return df_pl.get_column(col).to_numpy()
+
+        return self._class_probabilities(df_pl, suffix)
+
+    def _apply_postprocessing(self, scored: pl.DataFrame, suffix: str = "") -> pl.DataFrame:
+        cfg = getattr(self, "PostProcessing", None)
+        if not cfg or self.TargetType not in ("classification", "multiclass") or not scored.height:
+            return scored
+        probs = self._probability_matrix(scored, suffix)
+        return scored.with_columns(
+            self._postprocess_series(
+                probs,
+                suffix=suffix,
+                threshold=cfg["Threshold"],
+                class_thresholds=cfg["ClassThresholds"],
+                top_k=cfg["TopK"],
+                decode=cfg["DecodeLabels"],
+            )
+        )
+
     # Convert classification / multiclass predictions back to original labels
     def decode_predictions(
         self,
@@ -1579,7 +3013,9 @@ class RetroFit:
         pl.DataFrame
             DataFrame with:
               - original numeric-encoded target still present (unchanged)
-              - 'TrueLabel' : original label values (decoded)
+              - 'TrueLabel' : original label values (decoded; null for codes
+                outside LabelMapping)
+              - '_PredictedClassIdx' : predicted class index
               - 'PredictedLabel' : original label values for predictions
                 (for classification / multiclass).
         """
@@ -1615,65 +3051,24 @@ class RetroFit:
                 f"Encoded target column '{target}' not found in data to decode."
             )
 
-        mapping = self.LabelMappingInverse  # dict: int_code -> original_label
-
-        # Decode TRUE label
-        df_pl = df_pl.with_columns(
-            pl.col(target).replace(mapping).alias("TrueLabel")
+        probs = self._probability_matrix(df_pl)
+        cfg = getattr(self, "PostProcessing", None) or {}
+        idx_col, label_col = self._postprocess_series(
+            probs,
+            threshold=threshold,
+            class_thresholds=cfg.get("ClassThresholds") if self.TargetType == "multiclass" else None,
         )
+        labels = self._label_dictionary(len(self.LabelMappingInverse))
 
-        # Decode PREDICTED label
-        if self.TargetType == "classification":
-            # Expect probability column 'p1' from score()
-            if "p1" not in df_pl.columns:
-                raise ValueError(
-                    "Missing 'p1' column for binary classification predictions. "
-                    "Did you run score() first?"
-                )
-
-            # Convert p1 -> {0,1} -> original labels
-            pred_int_col = (
-                (pl.col("p1") >= threshold)
-                .cast(pl.Int64)
-                .alias("_PredictedClassIdx")
-            )
-
-            df_pl = df_pl.with_columns(pred_int_col)
-            df_pl = df_pl.with_columns(
-                pl.col(target).replace(mapping).alias("TrueLabel")
-            )
-
-        elif self.TargetType == "multiclass":
-            # Expect columns 'class_0', 'class_1', ..., 'class_{K-1}'
-            prob_cols = [c for c in df_pl.columns if c.startswith("class_")]
-            if not prob_cols:
-                raise ValueError(
-                    "No 'class_k' probability columns found for multiclass decoding. "
-                    "Did you run score() with a multiclass model?"
-                )
-
-            # Sort by index (class_0, class_1, ...)
-            def _class_idx(col_name: str) -> int:
-                try:
-                    return int(col_name.split("_", 1)[1])
-                except Exception:
-                    return 0
-
-            prob_cols = sorted(prob_cols, key=_class_idx)
-
-            # Argmax over class probabilities → predicted class index
-            df_pl = df_pl.with_columns(
-                pl.concat_list([pl.col(c) for c in prob_cols])
-                .arg_max()
-                .alias("_PredictedClassIdx")
-            )
-
-            # Map index to original label
-            df_pl = df_pl.with_columns(
-                pl.col(target).replace(mapping).alias("TrueLabel")
-            )
-
-        return df_pl
+        # Codes outside the mapping (and raw, un-encoded labels) decode to null
+        return df_pl.with_columns(
+            pl.col(target).cast(pl.Int64, strict=False).replace_strict(
+                pl.int_range(labels.len(), dtype=pl.Int64, eager=True), labels,
+                default=None, return_dtype=labels.dtype,
+            ).alias("TrueLabel"),
+            idx_col.alias("_PredictedClassIdx"),
+            label_col,
+        )
 
     # Single instance score
     def _score_one(
@@ -1682,31 +3077,658 @@ class RetroFit:
         internal_name: str | None,
         model,
         store: bool,
+        workers: int | None = None,
+        chunk_rows: int | None = None,
     ):
         """
         Internal helper to score a single Polars DataFrame with the current algorithm
         and optionally store it in self.ScoredData[internal_name].
         """
     
-        feature_cols = (self.NumericColumnNames or []) + \
-                       (self.CategoricalColumnNames or []) + \
-                       (self.TextColumnNames or [])
-    
-        if self.Algorithm == "catboost":
-            scored = self._score_catboost(model, df_pl, feature_cols, internal_name)
-        elif self.Algorithm == "xgboost":
-            scored = self._score_xgboost(model, df_pl, internal_name)
-        elif self.Algorithm == "lightgbm":
-            scored = self._score_lightgbm(model, df_pl, internal_name)
+        # External batches only: internal splits are the training metadata
+        flags = None
+        if internal_name is None:
+            df_pl, flags, report = self._validated(df_pl, [model])
+
+        cache = getattr(self, "PredictionCache", None)
+        if cache is not None and df_pl.height:
+            scored = self._score_cached(cache, df_pl, internal_name, model, workers, chunk_rows)
         else:
-            raise ValueError(f"Unsupported Algorithm in score(): {self.Algorithm}")
+            scored = self._score_dispatch(df_pl, internal_name, model, workers, chunk_rows)
+        scored = self._apply_postprocessing(scored)
+        if flags is not None:
+            scored = scored.with_columns(flags)
+            self.ValidationReport = report
+        _check_cancelled()
+        self._audit(df_pl, scored.select([c for c in scored.columns if c not in df_pl.columns]), model)
     
         # Only store if this is an internal split and store=True
         if store and internal_name is not None:
-            self.ScoredData[internal_name] = scored
+            self._store_scored(internal_name, scored, df_pl)
     
         return scored
 
+    # Scored-data storage
+    def set_scored_data_storage(self, PredictionsOnly: bool = True, Float32: bool = False):
+        """
+        Choose how score() keeps internal splits in self.ScoredData.
+
+        PredictionsOnly=True keeps only the prediction columns, aligned by row
+        position with self.DataFrames[split]. Reading self.ScoredData[split]
+        (evaluate, calibration tables, PDPs, plots) returns
+        DataFrames[split].hstack(predictions); Polars shares the column buffers,
+        so nothing is copied. Float32=True stores prediction columns as Float32.
+        Applies to splits scored after the call.
+        """
+        self.ScoredDataPredictionsOnly = bool(PredictionsOnly)
+        self.ScoredDataFloat32 = bool(Float32)
+
+    def _store_scored(self, internal_name: str, scored: pl.DataFrame, df_pl: pl.DataFrame):
+        pred_cols = [c for c in scored.columns if c not in df_pl.columns]
+        if getattr(self, "ScoredDataFloat32", False):
+            scored = scored.with_columns(
+                [pl.col(c).cast(pl.Float32) for c in pred_cols if scored.schema[c].is_float()]
+            )
+        if not getattr(self, "ScoredDataPredictionsOnly", False) or \
+                not isinstance(self.ScoredData, ScoredDataStore):
+            self.ScoredData[internal_name] = scored
+            return
+        self.ScoredData[internal_name] = PredictionColumns(scored.select(pred_cols))
+
+    # Scoring-time input validation
+    def set_input_validation(
+        self,
+        Enabled: bool = True,
+        RangeTolerance: float = 0.0,
+        CheckRanges: bool = True,
+        CheckCategories: bool = True,
+        MaxCategories: int = 100_000,
+    ):
+        """
+        Compile a validation stage for new data from self.DataFrames['train']:
+        each feature's dtype, the observed [min, max] of numeric features
+        (widened by RangeTolerance × range) and the category set of
+        categorical features (skipped above MaxCategories levels).
+
+        score(NewData=...), score_stream(), scoring views and the async
+        wrappers then check every batch with a few vectorized Polars
+        expressions and add a UInt8 ValidationFlags column (bits in
+        VALIDATION_FLAGS; 0 = clean) instead of raising:
+
+          MissingColumn   feature absent: added as nulls and scored
+                          (categorical / text features as "nan")
+          TypeMismatch    value not castable to the training dtype (→ null)
+          Null            null / NaN in a feature
+          OutOfRange      numeric value outside the training range
+          UnseenCategory  category not in the training set
+
+        Counts for the last batch: self.ValidationReport.
+        Enabled=False removes the stage.
+        """
+        if not Enabled:
+            self.InputValidation = None
+            self.ValidationReport = None
+            return None
+        train = self.DataFrames.get("train")
+        if train is None:
+            raise RuntimeError("No training data; call create_model_data() before set_input_validation().")
+
+        features = list(dict.fromkeys(
+            (self.NumericColumnNames or []) + (self.CategoricalColumnNames or []) + (self.TextColumnNames or [])
+        ))
+        cats = set(self.CategoricalColumnNames or [])
+        numeric = [c for c in features if c not in cats and train.schema[c].is_numeric()]
+
+        ranges = {}
+        if CheckRanges and numeric:
+            def finite(c):
+                if train.schema[c].is_float():
+                    return pl.col(c).filter(pl.col(c).is_finite())
+                return pl.col(c)
+
+            row = train.select(
+                [finite(c).min().alias(f"min{i}") for i, c in enumerate(numeric)]
+                + [finite(c).max().alias(f"max{i}") for i, c in enumerate(numeric)]
+            ).row(0)
+            for i, c in enumerate(numeric):
+                lo, hi = row[i], row[len(numeric) + i]
+                if lo is None:
+                    continue
+                pad = float(RangeTolerance) * (float(hi) - float(lo))
+                ranges[c] = (float(lo) - pad, float(hi) + pad)
+
+        columns = {}
+        for c in features:
+            spec = {"Dtype": train.schema[c], "Float": train.schema[c].is_float()}
+            if c in ranges:
+                spec["Range"] = ranges[c]
+            if CheckCategories and c in cats:
+                levels = train.get_column(c).cast(pl.Utf8).drop_nulls().unique()
+                if levels.len() <= MaxCategories:
+                    spec["Categories"] = levels
+            columns[c] = spec
+        self.InputValidation = {"Columns": columns, "RangeTolerance": float(RangeTolerance)}
+        self.ValidationReport = None
+        return self.InputValidation
+
+    def _validate_input(self, df_pl: pl.DataFrame, features: list):
+        """
+        Run the validation stage on df_pl for the given feature columns.
+
+        Returns (df_pl with missing features added / mistyped ones cast and
+        null categorical / text values set to "nan", ValidationFlags Series,
+        report dict). Pure: nothing is stored.
+        """
+        spec = self.InputValidation["Columns"]
+        features = [c for c in features if c in spec]
+        missing = [c for c in features if c not in df_pl.columns]
+        coerced = [
+            c for c in features
+            if c not in missing and _dtype_group(df_pl.schema[c]) != _dtype_group(spec[c]["Dtype"])
+        ]
+
+        # Repairs (one pass; mismatches are detected against the original values)
+        mismatch = None
+        if missing or coerced:
+            if coerced:
+                mismatch = pl.any_horizontal([
+                    pl.col(c).is_not_null() & pl.col(c).cast(spec[c]["Dtype"], strict=False).is_null()
+                    for c in coerced
+                ]).alias("__ValidationTypeMismatch__")
+            df_pl = df_pl.with_columns(
+                [pl.lit(None, dtype=spec[c]["Dtype"]).alias(c) for c in missing]
+                + [pl.col(c).cast(spec[c]["Dtype"], strict=False) for c in coerced]
+                + ([mismatch] if mismatch is not None else [])
+            )
+
+        # Fast path: one pass marks rows where every feature is present and in
+        # range / in the category set (is_between is False for NaN, null for
+        # null); per-flag detail is computed for the other rows only
+        ok, nulls, out_of_range, unseen = [], [], [], []
+        for c in features:
+            col, s = pl.col(c), spec[c]
+            is_nan = s["Float"] and df_pl.schema[c].is_float()
+            null = col.is_null() | col.is_nan() if is_nan else col.is_null()
+            nulls.append(null)
+            if "Range" in s:
+                lo, hi = s["Range"]
+                ok.append(col.is_between(lo, hi))
+                out_of_range.append(~col.is_between(lo, hi) & col.is_not_nan() if is_nan else ~col.is_between(lo, hi))
+            elif "Categories" in s:
+                levels = s["Categories"]
+                if df_pl.schema[c] != pl.Utf8:
+                    col = col.cast(pl.Utf8)
+                # A few equality tests beat hashing every string for small sets
+                known = (
+                    pl.any_horizontal([col == v for v in levels.to_list()]) if 0 < levels.len() <= 8
+                    else col.is_in(levels.implode())
+                )
+                ok.append(known)
+                unseen.append(~known & col.is_not_null())
+            else:
+                ok.append(~null)
+        if mismatch is not None:
+            ok.append(~pl.col("__ValidationTypeMismatch__"))
+
+        base = VALIDATION_FLAGS["MissingColumn"] if missing else 0
+        flags = np.full(df_pl.height, base, dtype=np.uint8)
+        suspect = np.empty(0, dtype=np.int64)
+        if ok and df_pl.height:
+            suspect = df_pl.select(~pl.all_horizontal(ok).fill_null(False)).to_series().arg_true().to_numpy()
+            if suspect.size:
+                def _bit(terms, name):
+                    if not terms:
+                        return pl.lit(0, dtype=pl.UInt8)
+                    return pl.any_horizontal(terms).fill_null(False).cast(pl.UInt8) * VALIDATION_FLAGS[name]
+
+                tm = [pl.col("__ValidationTypeMismatch__")] if mismatch is not None else []
+                detail = df_pl[suspect].select(
+                    _bit(tm, "TypeMismatch") + _bit(nulls, "Null")
+                    + _bit(out_of_range, "OutOfRange") + _bit(unseen, "UnseenCategory")
+                ).to_series().to_numpy()
+                flags[suspect] |= detail.astype(np.uint8)
+        if mismatch is not None:
+            df_pl = df_pl.drop("__ValidationTypeMismatch__")
+
+        # CatBoost rejects null categorical / text values: score them as the
+        # string "nan" (the rows keep their Null / MissingColumn flags)
+        strings = set(self.CategoricalColumnNames or []) | set(self.TextColumnNames or [])
+        fill = [c for c in features if c in strings and (c in missing or df_pl.get_column(c).null_count())]
+        if fill:
+            df_pl = df_pl.with_columns([pl.col(c).cast(pl.Utf8).fill_null("nan") for c in fill])
+
+        # Flag counts from a 32-bin histogram; rows outside `suspect` all hold `base`
+        hist = np.bincount(flags[suspect], minlength=32)
+        hist[base] += df_pl.height - suspect.size
+        values = np.arange(hist.size)
+        report = {"Rows": df_pl.height}
+        for name, bit in VALIDATION_FLAGS.items():
+            report[name] = int(hist[(values & bit) > 0].sum())
+        report["RowsFlagged"] = int(hist[1:].sum())
+        report["MissingColumns"] = missing
+        report["CoercedColumns"] = coerced
+        flags = pl.Series("ValidationFlags", flags)
+        return df_pl, flags, report
+
+    def _validated(self, df_pl: pl.DataFrame, models):
+        """
+        Validation stage for external batches scored by `models`; returns
+        (df_pl, flags or None, report or None).
+        """
+        if not getattr(self, "InputValidation", None):
+            return df_pl, None, None
+        features = [c for m in models for c in self._model_feature_columns(self._model_engine(m))]
+        return self._validate_input(df_pl, list(dict.fromkeys(features)))
+
+    # Prediction audit log
+    def set_audit_log(
+        self,
+        Path=None,
+        KeyColumns: str | list | None = None,
+        FlushRows: int = 10_000,
+        FlushSeconds: float = 5.0,
+        MaxBufferRows: int = 1_000_000,
+        OnFull: str = "block",
+    ):
+        """
+        Record every prediction made by score(), score_stream(), the async
+        wrappers and scoring views in a partitioned Parquet dataset under Path
+        (ModelName=<name>/Date=<YYYY-MM-DD>/part-*.parquet).
+
+        Each record holds InputHash (Polars row hash of the model's feature
+        columns, as used by the prediction cache), ScoredAt (UTC), the
+        KeyColumns present in the scored data and the prediction columns
+        (memmap multiclass rows are written as class_probs).
+
+        Records go to an in-memory buffer; a background thread writes it once
+        it holds FlushRows rows or its oldest record is FlushSeconds old, so
+        scoring does not wait on the disk. At most MaxBufferRows rows are held:
+        when writes fall behind, scoring blocks (OnFull="block") or the records
+        are dropped and counted (OnFull="drop"). Failed writes are retried.
+        self.AuditLog.close() (also run at interpreter exit, and by passing
+        Path=None) drains the buffer.
+
+        Counters: self.AuditLog.stats(); read back: self.AuditLog.scan()
+        """
+        if getattr(self, "AuditLog", None) is not None:
+            self.AuditLog.close()
+            self.AuditLog = None
+        if Path is None:
+            return None
+        keys = [KeyColumns] if isinstance(KeyColumns, str) else list(KeyColumns or [])
+        self.AuditLog = AuditLog(
+            Path,
+            key_columns=keys,
+            flush_rows=FlushRows,
+            flush_seconds=FlushSeconds,
+            max_buffer_rows=MaxBufferRows,
+            on_full=OnFull,
+        )
+        return self.AuditLog
+
+    def _audit(self, df_pl: pl.DataFrame, preds: pl.DataFrame, model, name: str | None = None):
+        """
+        Queue audit records for df_pl scored by model; preds holds only the
+        prediction columns (unsuffixed).
+        """
+        log = getattr(self, "AuditLog", None)
+        if log is None or df_pl.height == 0:
+            return
+        preds = self._portable_predictions(preds)
+        features = self._model_feature_columns(self._model_engine(model))
+        records = pl.DataFrame([df_pl.select(features).hash_rows(seed=0).alias("InputHash")]).hstack(
+            df_pl.select([c for c in log.key_columns if c in df_pl.columns]).get_columns()
+            + preds.get_columns()
+        )
+        log.append(name or self._model_name(model) or "Model", records)
+
+    def _portable_predictions(self, preds: pl.DataFrame) -> pl.DataFrame:
+        """
+        Prediction columns that stand on their own: memmap multiclass row ids
+        are replaced by the class_probs they point to.
+        """
+        if "class_probs_row" not in preds.columns:
+            return preds
+        probs = self.ProbabilityFile.take(preds.get_column("class_probs_row").to_numpy())
+        return preds.with_columns(pl.Series("class_probs", probs)).drop("class_probs_row")
+
+    # Challenger shadow scoring
+    def set_shadow_scoring(
+        self,
+        Challengers: list | None = None,
+        Path=None,
+        KeyColumns: str | list | None = None,
+        Workers: int = 1,
+        MaxQueue: int = 8,
+        Threads: int | None = 1,
+        FlushRows: int = 10_000,
+        FlushSeconds: float = 5.0,
+    ):
+        """
+        Score NewData batches with challenger models in the background.
+
+        score(NewData=...) returns the champion's result as before; the batch
+        and the champion's predictions are then queued for a pool of Workers
+        threads that score it with each model in Challengers (ModelList /
+        FitList names) and append the predictions to a Parquet prediction log
+        under Path (ModelName=<name>/Date=<YYYY-MM-DD>, see AuditLog). The
+        KeyColumns and the target column present in the batch are logged too,
+        so evaluate_shadow() can compare the models later.
+
+        When MaxQueue batches are already waiting, further shadow work is
+        dropped (counted in self.ShadowScorer.stats()), so load never adds
+        latency. Challengers are snapshotted (ScoringView) at this call and
+        scored with Threads engine threads each. Internal splits and
+        multi-model score(ModelNames=...) calls are not shadowed.
+        ScoringServer(Model=this RetroFit) shadows its batches too.
+
+        Challengers=None stops shadow scoring (queued work is finished first).
+        """
+        if getattr(self, "ShadowScorer", None) is not None:
+            self.ShadowScorer.close()
+            self.ShadowScorer = None
+        if not Challengers:
+            return None
+        if Path is None:
+            raise ValueError("Path is required for the shadow prediction log.")
+        keys = [KeyColumns] if isinstance(KeyColumns, str) else list(KeyColumns or [])
+        from .shadow import ShadowScorer
+        self.ShadowScorer = ShadowScorer(
+            self,
+            [Challengers] if isinstance(Challengers, str) else list(Challengers),
+            Path,
+            key_columns=keys,
+            workers=Workers,
+            max_queue=MaxQueue,
+            threads=Threads,
+            flush_rows=FlushRows,
+            flush_seconds=FlushSeconds,
+        )
+        return self.ShadowScorer
+
+    def evaluate_shadow(
+        self,
+        Labels=None,
+        KeyColumns: str | list | None = None,
+        Path=None,
+        ByVariables=None,
+    ) -> pl.DataFrame:
+        """
+        Evaluate every model in a shadow prediction log (champion and
+        challengers) with evaluate().
+
+        Labels : DataFrame, optional
+            Outcomes joined to the log on KeyColumns (default: the shadow
+            scorer's KeyColumns); needs TargetColumnName. Without Labels the
+            target column must have been present in the scored batches.
+        Path : optional
+            Log location (default: self.ShadowScorer.path).
+
+        Returns evaluate() output for all models with ModelName and Role
+        columns first. Each model's table is also stored in EvaluationList
+        under "Shadow_<ModelName>".
+        """
+        scorer = getattr(self, "ShadowScorer", None)
+        if Path is None:
+            if scorer is None:
+                raise RuntimeError("No shadow scorer set; pass Path or call set_shadow_scoring().")
+            scorer.drain()
+            Path = scorer.path
+        log = scan_prediction_log(Path).collect()
+        if log.height == 0:
+            raise ValueError(f"No shadow predictions found under {Path}.")
+
+        target = self.TargetColumnName
+        if Labels is not None:
+            if KeyColumns is None:
+                keys = scorer.key_columns if scorer is not None else []
+            else:
+                keys = [KeyColumns] if isinstance(KeyColumns, str) else list(KeyColumns)
+            if not keys:
+                raise ValueError("KeyColumns are required to join Labels.")
+            labels = self._normalize_input_df(Labels)
+            # Labels win over logged columns of the same name (e.g. a logged target)
+            log = log.drop([c for c in labels.columns if c in log.columns and c not in keys])
+            log = log.join(labels, on=keys, how="inner")
+        if target not in log.columns:
+            raise ValueError(f"Target column '{target}' not in the shadow log; pass Labels.")
+        if self.LabelMapping and log.schema[target] == pl.Utf8:
+            # Live traffic carries original labels; evaluate() expects the encoded ones
+            log = log.with_columns(
+                pl.col(target).replace_strict(self.LabelMapping, default=None, return_dtype=pl.Int64)
+            )
+
+        out = []
+        for (name,), part in log.filter(pl.col(target).is_not_null()).partition_by("ModelName", as_dict=True).items():
+            part = part.select([c for c in part.columns if part.get_column(c).null_count() < part.height])
+            ev = self.evaluate(df=part, FitName=f"Shadow_{name}", ByVariables=ByVariables)
+            ev = ev.with_columns(
+                pl.lit(name).alias("ModelName"),
+                pl.lit(part.get_column("Role")[0]).alias("Role"),
+            )
+            out.append(ev.select(["ModelName", "Role"] + [c for c in ev.columns if c not in ("ModelName", "Role")]))
+        return pl.concat(out, how="diagonal_relaxed")
+
+    # Engine dispatch for _score_one
+    def _score_dispatch(self, df_pl, internal_name, model, workers=None, chunk_rows=None):
+        feature_cols = (self.NumericColumnNames or []) + \
+                       (self.CategoricalColumnNames or []) + \
+                       (self.TextColumnNames or [])
+    
+        if workers is not None and workers > 1:
+            return self._score_parallel(model, df_pl, workers, chunk_rows)
+
+        # Engine of the model itself (a distilled student may differ from self.Algorithm)
+        engine = self._model_engine(model)
+        if engine != self.Algorithm:
+            internal_name = None
+        if engine == "catboost":
+            return self._score_catboost(model, df_pl, feature_cols, internal_name)
+        if engine == "xgboost":
+            return self._score_xgboost(model, df_pl, internal_name)
+        if engine == "lightgbm":
+            return self._score_lightgbm(model, df_pl, internal_name)
+        raise ValueError(f"Unsupported Algorithm in score(): {engine}")
+
+    # Prediction cache
+    def set_prediction_cache(self, MaxEntries: int | None = 1_000_000, TTLSeconds: float | None = None):
+        """
+        Put a row-hash prediction cache in front of score(), score_stream() and
+        compile_predictor() predictors. Rows are keyed by a hash of the model's
+        feature columns (computed for the whole batch in Polars) plus a model
+        key; only cache misses are sent to the engine.
+
+        Parameters
+        ----------
+        MaxEntries : int or None
+            Rows kept per model (least recently used are evicted).
+            None disables the cache.
+        TTLSeconds : float, optional
+            Entries older than this are treated as misses and rescored.
+
+        Hit / miss counters: self.PredictionCache.stats()
+        """
+        if MaxEntries is None:
+            self.PredictionCache = None
+            return None
+        self.PredictionCache = PredictionCache(max_entries=MaxEntries, ttl_seconds=TTLSeconds)
+        return self.PredictionCache
+
+    def _prediction_cache_key(self, model, variant: str = "score") -> str:
+        """
+        Key of a model in the prediction cache: its ModelList name (if any)
+        plus the model's cache token, so retrained or reloaded models never
+        share entries. A ScoringTreeLimit and the multiclass output layout
+        are part of the key; memmap row ids are only reused while the same
+        probability file holds them (same file token, not truncated since).
+        """
+        name = self._model_name(model) or "Model"
+        limit = self._tree_limit(model)
+        if limit:
+            variant = f"{variant}:trees{limit}"
+        if self.TargetType == "multiclass":
+            layout = getattr(self, "MulticlassOutput", "columns")
+            variant = f"{variant}:{layout}"
+            pf = getattr(self, "ProbabilityFile", None)
+            if layout == "memmap" and pf is not None:
+                variant = f"{variant}:{pf.token}.{pf.generation}"
+        return f"{name}:{_model_token(model)}:{variant}"
+
+    def _model_name(self, model) -> str | None:
+        return next((k for k, v in self.ModelList.items() if v is model), None) or \
+            next((k for k, v in self.FitList.items() if v is model), None)
+
+    def _score_cached(self, cache, df_pl, internal_name, model, workers=None, chunk_rows=None):
+        """
+        Look up every row of df_pl in the prediction cache, score only the
+        misses and write them back.
+        """
+        key = self._prediction_cache_key(model)
+        hashes = df_pl.select(self._model_feature_columns()).hash_rows(seed=0).to_numpy()
+        values, hit, columns, schema = cache.lookup(key, hashes)
+
+        if not hit.any():
+            scored = self._score_dispatch(df_pl, internal_name, model, workers, chunk_rows)
+            pred_cols = [c for c in scored.columns if c not in df_pl.columns]
+            cache.put(key, hashes, self._prediction_matrix(scored, pred_cols), pred_cols,
+                      [scored.schema[c] for c in pred_cols])
+            return scored
+
+        if hit.all():
+            return df_pl.hstack(self._prediction_frame_columns(values, columns, schema))
+
+        miss = np.flatnonzero(~hit)
+        scored_miss = self._score_dispatch(df_pl[miss], None, model, workers, chunk_rows)
+        miss_values = self._prediction_matrix(scored_miss, columns)
+        cache.put(key, hashes[miss], miss_values, columns, schema)
+
+        values[miss] = miss_values
+        return df_pl.hstack(self._prediction_frame_columns(values, columns, schema))
+
+    # Process-pool scoring
+    def _score_parallel(self, model, df_pl: pl.DataFrame, workers: int, chunk_rows: int | None = None):
+        """
+        Score df_pl in row chunks across `workers` spawned processes.
+
+        The model is written once in its native format to a temp directory and
+        loaded once per worker (initializer); the pool is kept for later calls
+        with the same model and settings (see _scoring_pool). Only the feature
+        columns are sent to workers and only prediction columns come back;
+        chunks are reassembled in input order, so output is deterministic.
+        """
+        engine = self._model_engine(model)
+        feature_cols = self._model_feature_columns(engine)
+        n = df_pl.height
+        if n == 0:
+            return self._score_one(df_pl, None, model, store=False)
+
+        if chunk_rows is None:
+            # ~4 chunks per worker for load balancing
+            chunk_rows = max(10_000, math.ceil(n / (workers * 4)))
+        chunk_rows = int(chunk_rows)
+
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        features = df_pl.select(feature_cols)
+        chunks = [features.slice(i, chunk_rows) for i in range(0, n, chunk_rows)]
+
+        spec = {
+            "Algorithm": engine,
+            "TargetType": self.TargetType,
+            "TargetColumnName": self.TargetColumnName,
+            "NumericColumnNames": self.NumericColumnNames,
+            "CategoricalColumnNames": self.CategoricalColumnNames,
+            "TextColumnNames": self.TextColumnNames,
+            "ModelArgs": self.ModelArgs,
+            "Threads": threads,
+            "MulticlassOutput": "columns" if self.MulticlassOutput == "columns" else "array",
+            "TreeLimit": self._tree_limit(model),
+        }
+        ex = self._scoring_pool(model, workers, spec)
+        try:
+            preds = list(ex.map(_parallel_score_chunk, chunks))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed): drop the pool so the next call starts afresh
+            self.shutdown_scoring_pool(wait=False)
+            raise
+
+        preds = pl.concat(preds, how="vertical")
+        if self.TargetType == "multiclass" and self.MulticlassOutput == "memmap":
+            # Workers return Array(Float32, K); append to this process's file
+            rows = self._probability_file(preds["class_probs"].dtype.size).append(
+                preds.get_column("class_probs").to_numpy()
+            )
+            preds = pl.DataFrame([pl.Series("class_probs_row", rows)])
+        return df_pl.hstack(preds.get_columns())
+
+    def _scoring_pool(self, model, workers: int, spec: dict) -> ProcessPoolExecutor:
+        """
+        Process pool for score(Workers=...). Starting spawn workers and loading
+        the model costs seconds, so the pool is reused while the model object,
+        worker count and scoring settings (spec) stay the same; anything else
+        replaces it.
+        """
+        if getattr(self, "ScoringPoolState", None) is None:
+            self.ScoringPoolState = {}
+        state = self.ScoringPoolState
+        key = (workers, json.dumps(spec, sort_keys=True, default=str))
+        if state.get("model") is model and state.get("key") == key:
+            return state["executor"]
+        self.shutdown_scoring_pool()
+        tmp = tempfile.TemporaryDirectory(prefix="retrofit-score-")
+        self._save_native_model(model, spec["Algorithm"], tmp.name)
+        state.update(
+            model=model,
+            key=key,
+            dir=tmp,
+            executor=ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_parallel_score_init,
+                initargs=({**spec, "ModelDir": tmp.name},),
+            ),
+        )
+        return state["executor"]
+
+    def shutdown_scoring_pool(self, wait: bool = True):
+        """
+        Stop the worker processes kept by score(Workers=N) and remove their
+        model file. The next score(Workers=N) call starts a new pool. Also
+        run when a RetroFit used as a context manager exits.
+        """
+        state = getattr(self, "ScoringPoolState", None) or {}
+        executor = state.pop("executor", None)
+        tmp = state.pop("dir", None)
+        state.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if tmp is not None:
+            tmp.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown_scoring_pool()
+        self.shutdown_async()
+
+    # Resolve model handle for scoring
+    def _resolve_model(self, ModelName: str | None = None):
+        """
+        Return the model named ModelName (ModelList / FitList) or self.Model.
+        """
+        if self.Model is None and not self.ModelList:
+            raise RuntimeError("No trained models found. Call train() before score().")
+
+        if ModelName is not None:
+            model = self.ModelList.get(ModelName) or self.FitList.get(ModelName)
+            if model is None:
+                raise KeyError(f"Model '{ModelName}' not found in ModelList or FitList.")
+            return model
+
+        if self.Model is None:
+            raise RuntimeError("self.Model is None and no ModelName provided.")
+        return self.Model
+
     # Main scoring function
     def score(
         self,
@@ -1715,9 +3737,28 @@ class RetroFit:
         ModelName: str | None = None,
         store: bool = True,
         return_results: bool = False,
+        Workers: int | None = None,
+        ChunkRows: int | None = None,
+        ModelNames: list | None = None,
     ):
         """
         Score data with the trained model.
+
+        Workers > 1 scores row chunks in that many worker processes, each of
+        which loads the model once from a native model file (ChunkRows rows per
+        task; default ~4 chunks per worker). Row order is preserved. The
+        workers stay up for later calls with the same model and Workers; stop
+        them with shutdown_scoring_pool() or by using the RetroFit as a
+        context manager (with RetroFit(...) as rf: ...).
+
+        ModelNames=[...] scores several ModelList / FitList models in one pass
+        (champion / challenger, ensembles): the engine input is built once and
+        the models run concurrently. Prediction columns are suffixed with
+        _<ModelName>, e.g. Predict_Leads_CatBoost1, p1_CatBoost2. For internal
+        splits, self.ScoredData[split] also keeps the first (champion) model's
+        predictions under the plain names (Predict_<target>, p1 / p0, class
+        columns), so evaluate() and the calibration / PDP helpers work on it.
+        This path does not use Workers or the prediction cache.
     
         Behavior
         --------
@@ -1737,29 +3778,35 @@ class RetroFit:
             * If return_results=True, return the scored pl.DataFrame, else return None.
         """
     
-        # 1) Check model
-        if self.Model is None and not self.ModelList:
-            raise RuntimeError("No trained models found. Call train() before score().")
-    
-        # 2) Choose model
-        if ModelName is not None:
-            model = self.ModelList.get(ModelName) or self.FitList.get(ModelName)
-            if model is None:
-                raise KeyError(f"Model '{ModelName}' not found in ModelList or FitList.")
+        # 1-2) Check and choose model(s)
+        if ModelNames:
+            if ModelName is not None:
+                raise ValueError("Pass either ModelName or ModelNames, not both.")
+            models = {name: self._resolve_model(name) for name in ModelNames}
         else:
-            if self.Model is None:
-                raise RuntimeError("self.Model is None and no ModelName provided.")
-            model = self.Model
+            model = self._resolve_model(ModelName)
+
+        def score_fn(df_pl, internal_name, store):
+            if ModelNames:
+                return self._score_many(df_pl, internal_name, models, store)
+            return self._score_one(
+                df_pl=df_pl,
+                internal_name=internal_name,
+                model=model,
+                store=store,
+                workers=Workers,
+                chunk_rows=ChunkRows,
+            )
     
         # 3) NewData path → always return, never store
         if NewData is not None:
             df_pl = self._normalize_input_df(NewData)
-            scored = self._score_one(
-                df_pl=df_pl,
-                internal_name=None,   # external data → no internal key
-                model=model,
-                store=False           # explicitly do not store
-            )
+            # external data → no internal key, never stored
+            scored = score_fn(df_pl, None, False)
+            shadow = getattr(self, "ShadowScorer", None)
+            if shadow is not None and not ModelNames:
+                preds = scored.select([c for c in scored.columns if c not in df_pl.columns])
+                shadow.submit(df_pl, self._portable_predictions(preds), ModelName or self._model_name(model))
             return scored  # ignore return_results in this path
     
         # 4) No NewData and no DataName → score ALL internal splits
@@ -1770,12 +3817,7 @@ class RetroFit:
                 if df_pl is None:
                     continue
     
-                scored_split = self._score_one(
-                    df_pl=df_pl,
-                    internal_name=split,
-                    model=model,
-                    store=store,
-                )
+                scored_split = score_fn(df_pl, split, store)
                 if return_results:
                     out[split] = scored_split
     
@@ -1801,15 +3843,444 @@ class RetroFit:
         if df_pl is None:
             raise ValueError(f"self.DataFrames['{DataName}'] is None; did you call create_model_data()?")
     
-        scored = self._score_one(
-            df_pl=df_pl,
-            internal_name=DataName,
-            model=model,
-            store=store,
-        )
+        scored = score_fn(df_pl, DataName, store)
     
         return scored if return_results else None
 
+    # Streaming scoring of files that do not fit in memory
+    def score_stream(
+        self,
+        source,
+        sink,
+        KeyColumns=None,
+        ModelName: str | None = None,
+        BatchRows: int = 1_000_000,
+        Format: str | None = None,
+        Compression: str = "zstd",
+        Pipeline: bool = False,
+        QueueDepth: int = 2,
+        ConvertWorkers: int = 1,
+        PredictWorkers: int = 1,
+    ) -> dict:
+        """
+        Score a Parquet / IPC / CSV file (or directory of files) in row batches and
+        write predictions incrementally to a Parquet sink.
+
+        Only the model features and KeyColumns are read from `source`, and only
+        one batch is held in memory at a time, so memory stays bounded regardless
+        of input size.
+        An empty source still writes the sink: a Parquet file with no rows and
+        the usual output schema.
+
+        Parameters
+        ----------
+        source : str or Path
+            Input file or directory.
+        sink : str or Path
+            Output Parquet file.
+        KeyColumns : str or list[str] or None
+            Passthrough columns written next to the predictions (e.g. ids, dates).
+        ModelName : str or None
+            Model in ModelList / FitList; defaults to self.Model.
+        BatchRows : int
+            Maximum rows per batch.
+        Format : {"parquet", "ipc", "csv"} or None
+            Input format; inferred from the file suffix when None.
+        Compression : str
+            Parquet compression codec for the sink.
+        Pipeline : bool
+            Overlap the stages instead of running them one after another:
+            a reader thread (Parquet → Polars), ConvertWorkers threads (engine
+            input), PredictWorkers threads (predict + output table) and the
+            writer on the calling thread, joined by queues of QueueDepth batches
+            (back-pressure: at most ~QueueDepth batches wait between stages).
+            Output order matches input order.
+        QueueDepth, ConvertWorkers, PredictWorkers : int
+            Pipeline sizing.
+
+        Returns
+        -------
+        dict
+            rows, batches, seconds, sink (+ pipeline: per-stage items, busy /
+            starved / blocked seconds, utilization and the bottleneck stage)
+        """
+        import pyarrow.dataset as pads
+        import pyarrow.parquet as pq
+
+        model = self._resolve_model(ModelName)
+
+        if KeyColumns is None:
+            key_cols = []
+        elif isinstance(KeyColumns, str):
+            key_cols = [KeyColumns]
+        else:
+            key_cols = list(KeyColumns)
+
+        # Input format from suffix if not given
+        source = Path(source)
+        if Format is None:
+            suffix = (source.suffix if source.is_file() else "").lower()
+            Format = {
+                ".csv": "csv",
+                ".arrow": "ipc",
+                ".ipc": "ipc",
+                ".feather": "ipc",
+            }.get(suffix, "parquet")
+        Format = Format.lower()
+        if Format not in ("parquet", "ipc", "csv"):
+            raise ValueError("Format must be one of 'parquet', 'ipc', 'csv'.")
+
+        engine = self._model_engine(model)
+        feature_cols = self._model_feature_columns(engine)
+        read_cols = list(dict.fromkeys(key_cols + feature_cols))
+
+        dataset = pads.dataset(str(source), format=Format)
+        missing = [c for c in read_cols if c not in dataset.schema.names]
+        if missing and getattr(self, "InputValidation", None):
+            # The validation stage adds missing features as nulls (and flags them)
+            read_cols = [c for c in read_cols if c not in missing]
+            missing = [c for c in missing if c in key_cols]
+        if missing:
+            raise ValueError(f"Columns not found in source: {missing}")
+
+        sink = Path(sink)
+        sink.parent.mkdir(parents=True, exist_ok=True)
+
+        def _frames():
+            for batch in dataset.to_batches(
+                columns=read_cols,
+                batch_size=int(BatchRows),
+                batch_readahead=1,
+                fragment_readahead=1,
+            ):
+                if batch.num_rows:
+                    yield pl.from_arrow(batch)
+
+        def _table(df_pl, scored):
+            pred_cols = [c for c in scored.columns if c not in df_pl.columns and c not in feature_cols]
+            # The sink outlives this process: write probabilities, not memmap row ids
+            return self._portable_predictions(scored.select(key_cols + pred_cols)).to_arrow()
+
+        t0 = time.perf_counter()
+        writer = None
+        n_rows = 0
+        n_batches = 0
+        stats = None
+
+        def _write(table):
+            nonlocal writer, n_rows, n_batches
+            if writer is None:
+                writer = pq.ParquetWriter(str(sink), table.schema, compression=Compression)
+            writer.write_table(table)
+            n_rows += table.num_rows
+            n_batches += 1
+
+        try:
+            if not Pipeline:
+                for df_pl in _frames():
+                    _check_cancelled()
+                    scored = self._score_one(df_pl=df_pl, internal_name=None, model=model, store=False)
+                    _write(_table(df_pl, scored))
+            else:
+                # The prediction cache works on frames, so with a cache the
+                # convert stage passes frames through and predict uses _score_one
+                cached = getattr(self, "PredictionCache", None) is not None
+
+                def _convert(df_pl):
+                    if cached:
+                        return df_pl, None, None
+                    df_pl, flags, _ = self._validated(df_pl, [model])
+                    return df_pl, flags, self._score_input(engine, df_pl)
+
+                def _predict(item):
+                    df_pl, flags, data = item
+                    if data is None:
+                        scored = self._score_one(df_pl=df_pl, internal_name=None, model=model, store=False)
+                    else:
+                        preds = self._score_predict(engine, model, data)
+                        scored = self._apply_postprocessing(
+                            df_pl.with_columns(self._prediction_series(preds))
+                        )
+                        if flags is not None:
+                            scored = scored.with_columns(flags)
+                        self._audit(df_pl, scored.select(scored.columns[df_pl.width:]), model)
+                    return _table(df_pl, scored)
+
+                stats = run_pipeline(
+                    _frames(),
+                    [("convert", _convert, ConvertWorkers), ("predict", _predict, PredictWorkers)],
+                    _write,
+                    queue_depth=QueueDepth,
+                    check=_check_cancelled,
+                )
+            if writer is None:
+                # Empty source: still write the sink, with the output schema
+                empty = pl.from_arrow(dataset.schema.empty_table().select(read_cols))
+                scored = self._score_one(df_pl=empty, internal_name=None, model=model, store=False)
+                _write(_table(empty, scored))
+                n_batches = 0
+        finally:
+            if writer is not None:
+                writer.close()
+
+        out = {
+            "rows": n_rows,
+            "batches": n_batches,
+            "seconds": time.perf_counter() - t0,
+            "sink": str(sink),
+        }
+        if stats is not None:
+            out["pipeline"] = stats
+        return out
+
+    # Low-latency predictor for online scoring
+    def compile_predictor(
+        self,
+        ModelName: str | None = None,
+        InverseTransform: bool = True,
+        Threads: int = 1,
+        UseCache: bool = True,
+    ) -> CompiledPredictor:
+        """
+        Build a CompiledPredictor for single-row / micro-batch scoring.
+
+        Feature order, categorical positions, output columns, class labels and
+        the target inverse transform are fixed at compile time, so each call
+        only coerces the input and runs the engine's in-place predict:
+          xgboost  → Booster.inplace_predict (float32, no DMatrix)
+          lightgbm → Booster.predict on a NumPy array
+          catboost → predict on raw rows (no Pool)
+
+        Parameters
+        ----------
+        ModelName : str, optional
+            Model from ModelList / FitList; defaults to self.Model.
+        InverseTransform : bool
+            Regression only: map predictions back to the original target scale
+            when the training target was transformed (TargetTransform).
+        Threads : int
+            Engine threads per call; 1 is fastest for single rows.
+        UseCache : bool
+            Use self.PredictionCache (set_prediction_cache) when it is set.
+
+        The model's ScoringTreeLimit (tune_tree_truncation) is applied.
+
+        Example:
+            pred = model.compile_predictor()
+            pred({"XREGS1": 1.2, "XREGS2": 0.4, "XREGS3": 3.0})
+        """
+        model = self._resolve_model(ModelName)
+        engine = self._model_engine(model)
+        feature_cols = self._model_feature_columns(engine)
+        if not feature_cols:
+            raise ValueError("No feature columns set; call create_model_data() first.")
+
+        if self.TargetType == "regression":
+            output_cols = [f"Predict_{self.TargetColumnName or 'target'}"]
+        elif self.TargetType == "classification":
+            output_cols = ["p1", "p0"]
+        else:
+            output_cols = [f"class_{i}" for i in range(self._infer_num_classes())]
+
+        classes = None
+        if self.LabelMappingInverse:
+            classes = [self.LabelMappingInverse[i] for i in sorted(self.LabelMappingInverse)]
+
+        # Only invert when the training target was actually transformed
+        inverse = None
+        if InverseTransform and self.TargetType == "regression" and \
+                self.TargetTransformParams.get("applied"):
+            inverse = _inverse_transform_fn(self.TargetTransform, self.TargetTransformParams)
+
+        # Same rule as _score_lightgbm: custom objectives leave raw scores
+        raw_score_link = (
+            engine == "lightgbm"
+            and getattr(model, "params", {}).get("objective") in ("none", "custom")
+        )
+
+        return CompiledPredictor(
+            model=model,
+            algorithm=engine,
+            target_type=self.TargetType,
+            feature_names=feature_cols,
+            categorical_names=self.CategoricalColumnNames if engine == "catboost" else None,
+            output_columns=output_cols,
+            inverse_transform=inverse,
+            classes=classes,
+            threads=Threads,
+            raw_score_link=raw_score_link,
+            cache=self.PredictionCache if UseCache else None,
+            cache_key=self._prediction_cache_key(model, f"compiled-{inverse is not None}"),
+            iteration_limit=self._tree_limit(model),
+        )
+
+    # Thread-safe scoring handle
+    def scoring_view(self, ModelName: str | None = None, Threads: int | None = None) -> ScoringView:
+        """
+        Build an immutable ScoringView for concurrent scoring.
+
+        The view snapshots the feature schema, label maps, target transform
+        params, post-processing config, ScoringTreeLimit and the model handle
+        of ModelName (default: self.Model). Later changes to this RetroFit do
+        not affect it, and calling it never changes this RetroFit, so a single
+        view can serve many request threads at once.
+
+        Threads sets engine threads per call (default: ScoreThreads / engine
+        default); with many request threads, 1 is usually best. The
+        "memmap" multiclass layout is emitted as "array" in views, since
+        the probability file is shared state. Views write to this RetroFit's
+        AuditLog (set_audit_log), if any.
+        """
+        model = self._resolve_model(ModelName)
+        name = ModelName or self._model_name(model) or "Model"
+        state = self._scoring_state(model, name, Threads)
+        state["AuditLog"] = getattr(self, "AuditLog", None)
+        return self._frozen_view(state, model, name)
+
+    def _scoring_state(self, model, name: str, Threads: int | None = None) -> dict:
+        """
+        Copies of everything scoring reads, minus the model handle.
+        """
+        limit = self._tree_limit(model)
+        return {
+            "Algorithm": self.Algorithm,
+            "TargetType": self.TargetType,
+            "GPU": self.GPU,
+            "TargetColumnName": self.TargetColumnName,
+            "NumericColumnNames": list(self.NumericColumnNames or []),
+            "CategoricalColumnNames": list(self.CategoricalColumnNames or []),
+            "TextColumnNames": list(self.TextColumnNames or []),
+            "WeightColumnName": self.WeightColumnName,
+            "ModelArgs": dict(self.ModelArgs or {}),
+            "ModelData": {},
+            "FitList": {},
+            "ScoringTreeLimit": {name: limit} if limit else {},
+            "ScoreThreads": Threads if Threads is not None else self.ScoreThreads,
+            "LabelMapping": copy(self.LabelMapping),
+            "LabelMappingInverse": copy(self.LabelMappingInverse),
+            "TargetTransform": self.TargetTransform,
+            "TargetTransformParams": dict(self.TargetTransformParams or {}),
+            "PostProcessing": deepcopy(self.PostProcessing),
+            "MulticlassOutput": "array" if self.MulticlassOutput == "memmap" else self.MulticlassOutput,
+            "MulticlassOutputPath": None,
+            "ProbabilityFile": None,
+            "PredictionCache": None,
+            "AuditLog": None,
+            "ShadowScorer": None,
+            "InputValidation": getattr(self, "InputValidation", None),
+        }
+
+    @staticmethod
+    def _frozen_view(state: dict, model, name: str) -> ScoringView:
+        frozen = RetroFit.__new__(RetroFit)
+        frozen.__dict__.update(state)
+        frozen.Model = model
+        frozen.ModelList = {name: model}
+        return ScoringView(frozen, model, name)
+
+    # Scoring-only artifact (native model + small state file)
+    def save_scoring_artifact(self, path, ModelName: str | None = None) -> Path:
+        """
+        Write only what scoring needs to directory `path`: the model in its
+        engine's native format plus scoring_state.pkl (feature schema, label
+        maps, transform params, post-processing, tree limit). No training data,
+        scored data or other models, so loading is fast and small.
+
+        Load with RetroFit.load_scoring_artifact(path) (returns a ScoringView)
+        or through retrofit.model_pool.ModelPool.
+        """
+        model = self._resolve_model(ModelName)
+        name = ModelName or self._model_name(model) or "Model"
+        engine = self._model_engine(model)
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self._save_native_model(model, engine, path)
+        state = self._scoring_state(model, name)
+        state["ScoreThreads"] = None
+        with (path / "scoring_state.pkl").open("wb") as f:
+            pickle.dump(
+                {"Engine": engine, "ModelName": name, "State": state},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        return path
+
+    @classmethod
+    def load_scoring_artifact(cls, path, Threads: int | None = None) -> ScoringView:
+        """
+        Load a directory written by save_scoring_artifact() as a ScoringView.
+        """
+        path = Path(path)
+        with (path / "scoring_state.pkl").open("rb") as f:
+            meta = pickle.load(f)
+        state = meta["State"]
+        state["ScoreThreads"] = Threads
+        model = cls._load_native_model(meta["Engine"], state["TargetType"], path)
+        return cls._frozen_view(state, model, meta["ModelName"])
+
+    # Engine-free flat-array export of the tree ensemble
+    def export_flat_trees(
+        self,
+        ModelName: str | None = None,
+        InverseTransform: bool = True,
+        Path: str | None = None,
+    ) -> FlatTreeEnsemble:
+        """
+        Flatten the trained model into a FlatTreeEnsemble (retrofit.flat_trees),
+        a set of node arrays with a vectorized NumPy evaluator whose predict()
+        reproduces score() output layouts. A ScoringTreeLimit set for the model
+        (set_scoring_tree_limit / tune_tree_truncation) is applied: only those
+        boosting iterations are exported.
+
+        Supported: XGBoost gbtree and LightGBM with numerical splits, CatBoost
+        with float features only (categorical / text features raise
+        NotImplementedError). Log-link XGBoost objectives (reg:tweedie,
+        count:poisson, reg:gamma, survival:cox) are exported with an exp
+        link; objectives the exporter does not know raise NotImplementedError.
+
+        Parameters
+        ----------
+        ModelName : str, optional
+            Model from ModelList / FitList; defaults to self.Model.
+        InverseTransform : bool
+            Regression only: store the target inverse transform so predictions
+            come back on the original scale (when the target was transformed).
+        Path : str, optional
+            If given, also write the ensemble to this .npz file. A scoring
+            container then needs only NumPy:
+                from retrofit.flat_trees import FlatTreeEnsemble
+                ens = FlatTreeEnsemble.load(Path); ens.predict(X)
+        """
+        model = self._resolve_model(ModelName)
+        engine = self._model_engine(model)
+        feature_cols = self._model_feature_columns(engine)
+
+        # Only the iterations score() uses (ScoringTreeLimit)
+        kwargs = dict(target_column=self.TargetColumnName, num_iterations=self._tree_limit(model))
+        if InverseTransform and self.TargetType == "regression":
+            kwargs.update(
+                target_transform=self.TargetTransform,
+                target_transform_params=self.TargetTransformParams,
+            )
+
+        if engine == "xgboost":
+            ens = flat_trees.from_xgboost(model, feature_cols, self.TargetType, **kwargs)
+        elif engine == "lightgbm":
+            ens = flat_trees.from_lightgbm(model, feature_cols, self.TargetType, **kwargs)
+        elif engine == "catboost":
+            if self.CategoricalColumnNames or self.TextColumnNames:
+                raise NotImplementedError(
+                    "CatBoost models with categorical or text features cannot be flattened."
+                )
+            ens = flat_trees.from_catboost(model, feature_cols, self.TargetType, **kwargs)
+        else:
+            raise ValueError(f"Unsupported Algorithm in export_flat_trees(): {engine}")
+
+        if Path is not None:
+            ens.save(Path)
+        return ens
+
 
     #################################################
     # Function: Evaluation
@@ -2140,21 +4611,8 @@ class RetroFit:
         # 4) Multiclass Classification
         # -------------------------------
         if self.TargetType == "multiclass":
-            # Expect columns 'class_0', 'class_1', ..., 'class_{K-1}' from score()
-            prob_cols = [c for c in df_pl.columns if c.startswith("class_")]
-            if not prob_cols:
-                raise ValueError(
-                    "No 'class_k' probability columns found for multiclass evaluation. "
-                    "Did you run score() with a multiclass model?"
-                )
-
-            def _class_idx(col_name: str) -> int:
-                try:
-                    return int(col_name.split("_", 1)[1])
-                except Exception:
-                    return 0
-
-            prob_cols = sorted(prob_cols, key=_class_idx)
+            # class_0..class_{K-1}, class_probs (Array) or class_probs_row (memmap)
+            self._class_probabilities(df_pl.head(0))
 
             # Cost + thresholds for per-class (one-vs-all) evaluation
             tpc = CostDict.get("tpcost", 0.0)
@@ -2178,7 +4636,7 @@ class RetroFit:
                 if y_true.size == 0:
                     continue
 
-                probs = gdf[prob_cols].to_numpy()  # shape: (N, K)
+                probs = self._class_probabilities(gdf)  # shape: (N, K)
                 n_classes = probs.shape[1]
                 N1 = len(y_true)
 
@@ -2212,8 +4670,8 @@ class RetroFit:
                 # -----------------------
                 # 4b) Per-class one-vs-all evaluation
                 # -----------------------
-                for class_pos, col_name in enumerate(prob_cols):
-                    class_idx = _class_idx(col_name)
+                for class_pos in range(n_classes):
+                    class_idx = class_pos
                     class_name = (
                         mapping_inv.get(class_idx)
                         if isinstance(mapping_inv, dict)
@@ -2304,6 +4762,657 @@ class RetroFit:
         )
 
 
+    #################################################
+    # Function: Learning Curve
+    #################################################
+
+    # Size the training window
+    def learning_curve(
+        self,
+        Fractions=(0.1, 0.2, 0.4, 0.6, 0.8, 1.0),
+        Order: str = "time",
+        TimeColumnName: str | None = None,
+        Metric: str | None = None,
+        TargetValue: float | None = None,
+        Workers: int | None = None,
+        Seed: int = 42,
+    ) -> pl.DataFrame:
+        """
+        Train on increasing fractions of the training rows (in parallel worker
+        processes) and evaluate each fit on the fixed validation split.
+
+        Parameters
+        ----------
+        Fractions : sequence of float in (0, 1]
+            Share of training rows used for each fit.
+        Order : {"time", "random"}
+            "time" keeps the most recent rows by TimeColumnName (the smallest
+            recent history window); "random" samples rows with Seed.
+        TimeColumnName : str or None
+            Required for Order="time".
+        Metric : str or None
+            Column of evaluate() output to report. Defaults to "r2" (regression)
+            or "Accuracy" (classification / multiclass).
+        TargetValue : float or None
+            Accuracy bar. If given, 'MeetsTarget' flags fits that reach it and
+            'Recommended' marks the smallest such fraction.
+        Workers : int or None
+            Worker processes (default: one per fraction, capped at CPU count).
+            Engine threads are split evenly across workers. Workers=1 runs in-process.
+
+        Returns
+        -------
+        pl.DataFrame
+            Fraction, TrainRows, TrainSeconds, Metric, MetricValue
+            (+ MeetsTarget, Recommended). Also stored in self.CompareModelsList.
+        """
+        train_df = self.DataFrames.get("train")
+        valid_df = self.DataFrames.get("validation")
+        if train_df is None or valid_df is None:
+            raise RuntimeError(
+                "learning_curve() needs train and validation data; call create_model_data() first."
+            )
+        if not self.ModelArgs:
+            raise RuntimeError("self.ModelArgs is empty. Call create_model_parameters() first.")
+
+        fractions = sorted(float(f) for f in Fractions)
+        if not fractions or fractions[0] <= 0 or fractions[-1] > 1:
+            raise ValueError("Fractions must be in (0, 1].")
+
+        if Metric is None:
+            Metric = "r2" if self.TargetType == "regression" else "Accuracy"
+        lower_is_better = Metric in {"mae", "median_ae", "mape", "mse", "max_error", "msle", "FPR", "FNR"}
+
+        # Row order: most recent rows last (time) or a seeded shuffle (random)
+        Order = Order.lower()
+        if Order == "time":
+            if TimeColumnName is None:
+                raise ValueError("TimeColumnName is required for Order='time'.")
+            ordered = train_df.sort(TimeColumnName)
+        elif Order == "random":
+            ordered = train_df.sample(fraction=1.0, shuffle=True, seed=Seed)
+        else:
+            raise ValueError("Order must be 'time' or 'random'.")
+
+        # Split engine threads across worker processes
+        n_cpu = os.cpu_count() or 1
+        Workers = Workers or min(len(fractions), n_cpu)
+        threads = max(1, n_cpu // Workers)
+        args = dict(self.ModelArgs)
+        thread_key = {"catboost": "thread_count", "xgboost": "nthread", "lightgbm": "num_threads"}[self.Algorithm]
+        args[thread_key] = threads
+
+        custom_name = getattr(self, "CustomObjectiveName", None)
+        custom = obj_reg.get_objective(custom_name) if custom_name else None
+
+        tasks = []
+        for frac in fractions:
+            n_rows = max(1, int(round(ordered.height * frac)))
+            tasks.append({
+                "Fraction": frac,
+                "train": ordered.tail(n_rows) if Order == "time" else ordered.head(n_rows),
+                "validation": valid_df,
+                "Algorithm": self.Algorithm,
+                "TargetType": self.TargetType,
+                "GPU": self.GPU,
+                "TargetColumnName": self.TargetColumnName,
+                "NumericColumnNames": self.NumericColumnNames,
+                "CategoricalColumnNames": self.CategoricalColumnNames,
+                "TextColumnNames": self.TextColumnNames,
+                "WeightColumnName": self.WeightColumnName,
+                "LabelMapping": self.LabelMapping,
+                "LabelMappingInverse": self.LabelMappingInverse,
+                "TargetTransform": self.TargetTransform,
+                "TargetTransformParams": self.TargetTransformParams,
+                "ModelArgs": args,
+                "Metric": Metric,
+                "custom_objective": custom,
+            })
+
+        if Workers == 1:
+            results = [_learning_curve_worker(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=Workers, mp_context=mp.get_context("spawn")) as ex:
+                results = list(ex.map(_learning_curve_worker, tasks))
+
+        out = pl.DataFrame(results).with_columns(pl.lit(Metric).alias("Metric")).select(
+            "Fraction", "TrainRows", "TrainSeconds", "Metric", "MetricValue"
+        )
+
+        if TargetValue is not None:
+            meets = (
+                pl.col("MetricValue") <= TargetValue
+                if lower_is_better
+                else pl.col("MetricValue") >= TargetValue
+            )
+            out = out.with_columns(meets.alias("MeetsTarget"))
+            first = out.filter(pl.col("MeetsTarget")).select(pl.col("Fraction").min()).item()
+            out = out.with_columns(
+                (pl.col("Fraction") == first if first is not None else pl.lit(False)).alias("Recommended")
+            )
+
+        key = f"{self.Algorithm}_learning_curve_{Order}"
+        self.CompareModelsList[key] = out
+        if key not in self.CompareModelsListNames:
+            self.CompareModelsListNames.append(key)
+
+        return out
+
+
+    #################################################
+    # Function: Tree Truncation
+    #################################################
+
+    # Boosting iterations in a trained model
+    def _num_iterations(self, model) -> int:
+        engine = self._model_engine(model)
+        if engine == "catboost":
+            return int(model.tree_count_)
+        if engine == "xgboost":
+            return int(model.num_boosted_rounds())
+        return int(model.current_iteration())
+
+    # ScoringTreeLimit entry for a model handle (None → all trees)
+    def _tree_limit(self, model) -> int | None:
+        limits = getattr(self, "ScoringTreeLimit", None)
+        if not limits:
+            return None
+        return limits.get(self._model_name(model))
+
+    # Default scoring range
+    def set_scoring_tree_limit(self, NumIterations: int | None = None, ModelName: str | None = None):
+        """
+        Use only the first NumIterations boosting iterations when scoring
+        ModelName (default: self.Model) in score(), compile_predictor() and
+        export_flat_trees().
+        NumIterations=None removes the limit.
+        """
+        model = self._resolve_model(ModelName)
+        name = ModelName or self._model_name(model)
+        if name is None:
+            raise KeyError("Model is not registered in ModelList / FitList; pass ModelName.")
+        if NumIterations is None:
+            self.ScoringTreeLimit.pop(name, None)
+            return
+        total = self._num_iterations(model)
+        if not 1 <= int(NumIterations) <= total:
+            raise ValueError(f"NumIterations must be in [1, {total}].")
+        self.ScoringTreeLimit[name] = int(NumIterations)
+
+    # Metric / latency by number of trees
+    def tune_tree_truncation(
+        self,
+        ModelName: str | None = None,
+        DataName: str = "validation",
+        LatencyBudgetMs: float | None = None,
+        MetricTolerance: float = 0.005,
+        Metric: str | None = None,
+        NumIterations=None,
+        BatchRows: int = 1,
+        Repeats: int = 200,
+        Quantile: float = 0.99,
+        Apply: bool = True,
+    ) -> pl.DataFrame:
+        """
+        Measure the evaluation metric on DataName and the scoring latency of
+        the compiled predictor as a function of the number of boosting
+        iterations used (CatBoost ntree_end, XGBoost iteration_range,
+        LightGBM num_iteration), and pick the smallest prefix that keeps the
+        metric within MetricTolerance of the full model and meets the latency
+        budget.
+
+        Parameters
+        ----------
+        ModelName : str or None
+            Model from ModelList / FitList; defaults to self.Model.
+        DataName : {"train", "validation", "test"}
+            Split the metric is computed on.
+        LatencyBudgetMs : float or None
+            Latency target (ms) at Quantile for one call on BatchRows rows.
+            None → only the metric tolerance is applied.
+        MetricTolerance : float
+            Largest allowed loss versus the full model, in metric units.
+        Metric : str or None
+            Column of evaluate() output. Defaults to "r2" (regression) or
+            "Accuracy" (classification / multiclass).
+        NumIterations : sequence of int or None
+            Prefix lengths to try (default: 10 evenly spaced up to the full model).
+        BatchRows, Repeats, Quantile
+            Latency is timed over Repeats calls of CompiledPredictor.predict on
+            BatchRows rows (single thread, no cache) and summarised at Quantile.
+        Apply : bool
+            Store the recommended prefix with set_scoring_tree_limit().
+
+        Returns
+        -------
+        pl.DataFrame
+            NumIterations, Metric, MetricValue, MetricLoss, LatencyP50Ms,
+            LatencyMs, WithinTolerance, MeetsBudget, Recommended.
+            Also stored in self.CompareModelsList.
+        """
+        model = self._resolve_model(ModelName)
+        name = ModelName or self._model_name(model) or "Model"
+        df = self.DataFrames.get(DataName)
+        if df is None:
+            raise RuntimeError(f"self.DataFrames['{DataName}'] is None; call create_model_data() first.")
+
+        total = self._num_iterations(model)
+        grid = NumIterations
+        if grid is None:
+            grid = np.linspace(total / 10, total, 10)
+        grid = sorted({min(total, max(1, int(round(n)))) for n in grid} | {total})
+
+        if Metric is None:
+            Metric = "r2" if self.TargetType == "regression" else "Accuracy"
+        lower_is_better = Metric in {"mae", "median_ae", "mape", "mse", "max_error", "msle", "FPR", "FNR"}
+        level = {
+            "regression": "regression",
+            "classification": "overall_binary",
+            "multiclass": "overall_multiclass",
+        }[self.TargetType]
+
+        engine = self._model_engine(model)
+        data = self._score_input(engine, df, DataName)
+        predictor = self.compile_predictor(ModelName, InverseTransform=False, Threads=1, UseCache=False)
+        batch = df.select(self._model_feature_columns(engine)).head(max(1, int(BatchRows))).rows()
+
+        rows = []
+        for n in grid:
+            # Metric on DataName
+            preds = self._score_predict(engine, model, data, tree_limit=n)
+            if self.TargetType == "multiclass":
+                cols = [pl.Series(f"class_{i}", preds[:, i]) for i in range(preds.shape[1])]
+            else:
+                cols = self._prediction_series(preds)
+            fit_name = f"{name}_trees_{n}"
+            ev = self.evaluate(df=df.with_columns(cols), FitName=fit_name)
+            self.EvaluationList.pop(fit_name, None)
+            if fit_name in self.EvaluationListNames:
+                self.EvaluationListNames.remove(fit_name)
+            value = float(ev.filter(pl.col("EvalLevel") == level).row(0, named=True)[Metric])
+
+            # Latency of the compiled predictor
+            predictor.iteration_limit = n
+            for _ in range(min(10, Repeats)):
+                predictor.predict(batch)
+            times = np.empty(Repeats)
+            for i in range(Repeats):
+                t0 = time.perf_counter()
+                predictor.predict(batch)
+                times[i] = time.perf_counter() - t0
+            rows.append({
+                "NumIterations": n,
+                "MetricValue": value,
+                "LatencyP50Ms": float(np.median(times) * 1e3),
+                "LatencyMs": float(np.quantile(times, Quantile) * 1e3),
+            })
+
+        out = pl.DataFrame(rows)
+        full = out.filter(pl.col("NumIterations") == total)["MetricValue"][0]
+        loss = (pl.col("MetricValue") - full) if lower_is_better else (full - pl.col("MetricValue"))
+        out = out.with_columns(
+            pl.lit(Metric).alias("Metric"),
+            loss.alias("MetricLoss"),
+        ).with_columns(
+            (pl.col("MetricLoss") <= MetricTolerance).alias("WithinTolerance"),
+            (pl.col("LatencyMs") <= LatencyBudgetMs if LatencyBudgetMs is not None else pl.lit(True))
+            .alias("MeetsBudget"),
+        )
+        best = out.filter(pl.col("WithinTolerance") & pl.col("MeetsBudget"))["NumIterations"].min()
+        out = out.with_columns(
+            (pl.col("NumIterations") == best if best is not None else pl.lit(False)).alias("Recommended")
+        ).select(
+            "NumIterations", "Metric", "MetricValue", "MetricLoss", "LatencyP50Ms",
+            "LatencyMs", "WithinTolerance", "MeetsBudget", "Recommended",
+        )
+
+        if Apply:
+            if best is None:
+                warnings.warn(
+                    f"tune_tree_truncation(): no prefix of '{name}' meets the latency budget "
+                    "within the metric tolerance; scoring range left unchanged.",
+                    stacklevel=2,
+                )
+            else:
+                self.set_scoring_tree_limit(None if best == total else int(best), ModelName=name)
+
+        key = f"{name}_tree_truncation"
+        self.CompareModelsList[key] = out
+        if key not in self.CompareModelsListNames:
+            self.CompareModelsListNames.append(key)
+
+        return out
+
+
+    #################################################
+    # Function: Distillation
+    #################################################
+
+    # Fit a student booster on soft targets (engine APIs directly)
+    def _fit_student(self, engine: str, df_pl: pl.DataFrame, soft: np.ndarray, weight, args: dict):
+        """
+        regression      student regresses on the teacher prediction
+        classification  soft p1 labels (CrossEntropy / binary:logistic / cross_entropy)
+        multiclass      each row repeated once per class with label k and
+                        weight p_k, i.e. cross-entropy against the teacher's
+                        class probabilities
+        """
+        n = df_pl.height
+        label = soft
+        k = soft.shape[1] if self.TargetType == "multiclass" else None
+        if k is not None:
+            weight = np.repeat(np.ones(n) if weight is None else weight, k) * soft.ravel()
+            label = np.tile(np.arange(k), n)
+            keep = weight > 1e-6
+            df_pl = df_pl[np.repeat(np.arange(n), k)[keep]]
+            label, weight = label[keep], weight[keep]
+
+        threads = self._score_threads(None) or -1
+        if engine == "catboost":
+            cat_cols = [c for c in (self.CategoricalColumnNames or []) if c in df_pl.columns]
+            text_cols = [c for c in (self.TextColumnNames or []) if c in df_pl.columns]
+            pool = Pool(
+                self._to_pandas(df_pl), label=label, weight=weight,
+                cat_features=cat_cols or None, text_features=text_cols or None,
+            )
+            params = {
+                "regression": {"loss_function": "RMSE"},
+                "classification": {"loss_function": "CrossEntropy"},
+                "multiclass": {"loss_function": "MultiClass"},
+            }[self.TargetType]
+            params.update({"iterations": 100, "depth": 4, "learning_rate": 0.1,
+                           "thread_count": threads, "verbose": 0, "allow_writing_files": False})
+            params.update(args)
+            cls = CatBoostRegressor if self.TargetType == "regression" else CatBoostClassifier
+            return cls(**params).fit(pool)
+
+        X = df_pl.to_numpy()
+        if engine == "xgboost":
+            params = {
+                "regression": {"objective": "reg:squarederror"},
+                "classification": {"objective": "binary:logistic"},
+                "multiclass": {"objective": "multi:softprob", "num_class": k},
+            }[self.TargetType]
+            params.update({"max_depth": 4, "eta": 0.1, "nthread": threads, "verbosity": 0})
+            rounds = int(args.pop("num_boost_round", 100))
+            params.update(args)
+            dtrain = xgb.DMatrix(X, label=label, weight=weight, feature_names=list(df_pl.columns))
+            return xgb.train(params, dtrain, num_boost_round=rounds)
+
+        if engine == "lightgbm":
+            params = {
+                "regression": {"objective": "regression"},
+                "classification": {"objective": "cross_entropy"},
+                "multiclass": {"objective": "multiclass", "num_class": k},
+            }[self.TargetType]
+            params.update({"num_leaves": 15, "max_depth": 4, "learning_rate": 0.1,
+                           "num_iterations": 100, "num_threads": max(threads, 0), "verbose": -1})
+            params.update(args)
+            dtrain = lgbm.Dataset(X, label=label, weight=weight, feature_name=list(df_pl.columns))
+            return lgbm.train(params, dtrain)
+
+        raise ValueError(f"Unsupported StudentAlgorithm: {engine}")
+
+    # Teacher → student
+    def distill(
+        self,
+        StudentAlgorithm: str | None = None,
+        StudentArgs: dict | None = None,
+        ModelName: str | None = None,
+        StudentName: str | None = None,
+        SyntheticRows: int = 0,
+        NoiseScale: float = 0.05,
+        DataName: str = "validation",
+        Seed: int = 42,
+    ) -> pl.DataFrame:
+        """
+        Distill a trained teacher model into a smaller / faster student.
+
+        Soft targets are the teacher's score() predictions on the train split,
+        optionally plus SyntheticRows perturbed copies of sampled train rows
+        (numeric features get Gaussian noise of NoiseScale * column std). The
+        student is a shallow booster (depth 4, 100 iterations unless
+        StudentArgs says otherwise) of StudentAlgorithm (default: the
+        teacher's engine) and is registered in ModelList / FitList, so
+        score(ModelName=...), score(ModelNames=[...]), compile_predictor()
+        and export_flat_trees() all accept it.
+
+        Student engines see the features RetroFit hands that engine:
+        XGBoost / LightGBM students use NumericColumnNames only.
+
+        Parameters
+        ----------
+        StudentAlgorithm : {"catboost", "xgboost", "lightgbm"} or None
+        StudentArgs : dict or None
+            Engine parameters merged over the student defaults (XGBoost:
+            num_boost_round for the number of rounds).
+        ModelName : str or None
+            Teacher from ModelList / FitList; defaults to self.Model.
+        StudentName : str or None
+            ModelList name for the student (default '<Engine>Student<n>').
+        SyntheticRows, NoiseScale, Seed
+            Synthetic perturbation rows added to the transfer set.
+        DataName : {"train", "validation", "test"}
+            Split used for the fidelity / speed report.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row: Teacher, Student, StudentAlgorithm, TransferRows,
+            FitSeconds, fidelity (regression: FidelityR2, FidelityRMSE;
+            classification / multiclass: Agreement, MeanAbsProbDiff),
+            TeacherMs, StudentMs, Speedup. Also stored in self.CompareModelsList.
+        """
+        teacher = self._resolve_model(ModelName)
+        teacher_name = ModelName or self._model_name(teacher) or "Model"
+        t_engine = self._model_engine(teacher)
+        s_engine = (StudentAlgorithm or t_engine).lower()
+        if s_engine not in ("catboost", "xgboost", "lightgbm"):
+            raise ValueError("StudentAlgorithm must be 'catboost', 'xgboost', or 'lightgbm'.")
+
+        train_df = self.DataFrames.get("train")
+        eval_df = self.DataFrames.get(DataName)
+        if train_df is None or eval_df is None:
+            raise RuntimeError("distill() needs train and DataName splits; call create_model_data() first.")
+
+        # Transfer set: train rows (+ perturbed copies)
+        transfer = train_df
+        weights = None
+        if self.WeightColumnName and self.WeightColumnName in train_df.columns:
+            weights = train_df.get_column(self.WeightColumnName).to_numpy().astype(np.float64)
+        if SyntheticRows:
+            rng = np.random.default_rng(Seed)
+            idx = rng.integers(0, train_df.height, int(SyntheticRows))
+            synth = train_df[idx]
+            noisy = []
+            for c in self.NumericColumnNames or []:
+                col = synth.get_column(c).cast(pl.Float64)
+                std = train_df.get_column(c).cast(pl.Float64).std() or 0.0
+                noise = rng.normal(0.0, NoiseScale * std, synth.height)
+                noisy.append((col + noise).cast(train_df.schema[c], strict=False).alias(c))
+            synth = synth.with_columns(noisy)
+            transfer = pl.concat([train_df, synth], how="vertical_relaxed")
+            if weights is not None:
+                weights = np.concatenate([weights, weights[idx]])
+
+        soft = self._score_predict(t_engine, teacher, self._score_input(t_engine, transfer))
+
+        # Student fit
+        s_features = self._model_feature_columns(s_engine)
+        args = dict(StudentArgs or {})
+        t0 = time.perf_counter()
+        student = self._fit_student(s_engine, transfer.select(s_features), soft, weights, args)
+        fit_seconds = time.perf_counter() - t0
+
+        prefix = {"catboost": "CatBoost", "xgboost": "XGBoost", "lightgbm": "LightGBM"}[s_engine]
+        name = StudentName or f"{prefix}Student{len(self.ModelList) + 1}"
+        self.ModelList[name] = student
+        self.FitList[name] = student
+        if name not in self.ModelListNames:
+            self.ModelListNames.append(name)
+        if name not in self.FitListNames:
+            self.FitListNames.append(name)
+
+        # Fidelity and speed on DataName
+        def _timed(engine, model):
+            data = self._score_input(engine, eval_df)
+            best, preds = float("inf"), None
+            for _ in range(3):
+                t = time.perf_counter()
+                preds = self._score_predict(engine, model, data)
+                best = min(best, time.perf_counter() - t)
+            return preds, best * 1e3
+
+        p_teacher, teacher_ms = _timed(t_engine, teacher)
+        p_student, student_ms = _timed(s_engine, student)
+
+        row = {
+            "Teacher": teacher_name,
+            "Student": name,
+            "StudentAlgorithm": s_engine,
+            "TransferRows": transfer.height,
+            "FitSeconds": fit_seconds,
+        }
+        if self.TargetType == "regression":
+            row["FidelityR2"] = float(r2_score(p_teacher, p_student))
+            row["FidelityRMSE"] = float(np.sqrt(np.mean((p_teacher - p_student) ** 2)))
+        elif self.TargetType == "classification":
+            row["Agreement"] = float(np.mean((p_teacher >= 0.5) == (p_student >= 0.5)))
+            row["MeanAbsProbDiff"] = float(np.mean(np.abs(p_teacher - p_student)))
+        else:
+            row["Agreement"] = float(np.mean(p_teacher.argmax(axis=1) == p_student.argmax(axis=1)))
+            row["MeanAbsProbDiff"] = float(np.mean(np.abs(p_teacher - p_student)))
+        row.update({
+            "TeacherMs": teacher_ms,
+            "StudentMs": student_ms,
+            "Speedup": teacher_ms / student_ms if student_ms > 0 else None,
+        })
+        out = pl.DataFrame([row])
+
+        key = f"{name}_distillation"
+        self.CompareModelsList[key] = out
+        if key not in self.CompareModelsListNames:
+            self.CompareModelsListNames.append(key)
+
+        return out
+
+
+    #################################################
+    # Function: Async API
+    #################################################
+
+    # Concurrency bound / executor for the async methods
+    def set_async_limits(self, MaxConcurrency: int = 1, Executor=None):
+        """
+        Bound how many async calls (atrain / ascore / aevaluate / ascore_stream)
+        run at once on this instance, and where they run.
+
+        MaxConcurrency : calls beyond this wait on an asyncio.Semaphore without
+            blocking the event loop. Keep 1 when calls mutate this instance
+            (atrain, ascore on internal splits); raise it for pure NewData scoring.
+        Executor : a concurrent.futures.ThreadPoolExecutor to run engine work on
+            (shared across instances, owned by the caller). None → a managed
+            per-instance pool with MaxConcurrency threads.
+        """
+        if int(MaxConcurrency) < 1:
+            raise ValueError("MaxConcurrency must be >= 1.")
+        self.shutdown_async()
+        self.AsyncMaxConcurrency = int(MaxConcurrency)
+        self.AsyncExecutor = Executor
+
+    def shutdown_async(self, wait: bool = False):
+        """
+        Shut down the managed async executor (a caller-supplied Executor is left alone).
+        """
+        state = getattr(self, "AsyncState", None) or {}
+        executor = state.pop("executor", None)
+        state.pop("semaphore", None)
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _async_executor(self):
+        if getattr(self, "AsyncExecutor", None) is not None:
+            return self.AsyncExecutor
+        if getattr(self, "AsyncState", None) is None:
+            self.AsyncState = {}
+        executor = self.AsyncState.get("executor")
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=getattr(self, "AsyncMaxConcurrency", 1),
+                thread_name_prefix="retrofit-async",
+            )
+            self.AsyncState["executor"] = executor
+        return executor
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per running loop (asyncio.run() creates a new loop each time)
+        if getattr(self, "AsyncState", None) is None:
+            self.AsyncState = {}
+        loop = asyncio.get_running_loop()
+        owner, sem = self.AsyncState.get("semaphore", (None, None))
+        if owner is not loop:
+            sem = asyncio.Semaphore(getattr(self, "AsyncMaxConcurrency", 1))
+            self.AsyncState["semaphore"] = (loop, sem)
+        return sem
+
+    async def _arun(self, fn, *args, Timeout: float | None = None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the async executor under the instance
+        semaphore. Cancellation or Timeout sets the call's cancel event, which
+        the engine callbacks / batch loops check, and the slot is held until
+        the worker thread has actually stopped.
+        """
+        event = threading.Event()
+
+        def _call():
+            _CANCEL.event = event
+            try:
+                _check_cancelled()
+                return fn(*args, **kwargs)
+            finally:
+                _CANCEL.event = None
+
+        async with self._async_semaphore():
+            fut = asyncio.get_running_loop().run_in_executor(self._async_executor(), _call)
+            try:
+                return await asyncio.wait_for(asyncio.shield(fut), Timeout)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                event.set()
+                await asyncio.wait({fut})
+                if not fut.cancelled():
+                    fut.exception()  # retrieved; the caller gets CancelledError / TimeoutError
+                raise
+
+    # Async counterparts
+    async def atrain(self, Timeout: float | None = None):
+        """
+        Async train(). Runs in the async executor; the event loop stays free.
+        On cancellation / Timeout the engine stops at its next iteration and no
+        model is registered (OperationCancelled in the worker thread).
+        """
+        return await self._arun(self.train, Timeout=Timeout)
+
+    async def ascore(self, *args, Timeout: float | None = None, **kwargs):
+        """
+        Async score(); same arguments. On cancellation / Timeout nothing is
+        written to ScoredData (the engine call in flight is allowed to finish).
+        """
+        return await self._arun(self.score, *args, Timeout=Timeout, **kwargs)
+
+    async def aevaluate(self, *args, Timeout: float | None = None, **kwargs):
+        """
+        Async evaluate(); same arguments.
+        """
+        return await self._arun(self.evaluate, *args, Timeout=Timeout, **kwargs)
+
+    async def ascore_stream(self, *args, Timeout: float | None = None, **kwargs):
+        """
+        Async score_stream(); same arguments. Cancellation / Timeout stops the
+        stream before its next batch and closes the sink.
+        """
+        return await self._arun(self.score_stream, *args, Timeout=Timeout, **kwargs)
+
+
     #################################################
     # Function: Save / Load entire RetroFit object
     #################################################
@@ -2313,6 +5422,10 @@ class RetroFit:
         """
         Save the entire RetroFit object (including models, args,
         scored data, etc.) to disk via pickle.
+
+        Engine data containers in self.ModelData (Pool / DMatrix / Dataset)
+        cannot be pickled and are not saved; call create_model_data() again
+        after loading to continue training.
         
         Parameters
         ----------
@@ -2325,6 +5438,18 @@ class RetroFit:
         with path.open("wb") as f:
             pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
 
+    # Pickle support: engine data containers hold native pointers
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["ModelData"] = {}
+        state["AsyncState"] = {}
+        state["ScoringPoolState"] = {}
+        state["ShadowScorer"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     # Load class object
     @classmethod
     def load_retrofit(cls, path):
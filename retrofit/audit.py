@@ -0,0 +1,322 @@
+# Module: audit
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Buffered, asynchronous prediction audit log.
+#
+#   rf.set_audit_log("audit/", KeyColumns="RequestID")
+#   rf.score(NewData=df)          # returns as soon as predictions are ready
+#   rf.AuditLog.scan()            # LazyFrame over everything written so far
+#
+# Scoring paths append one record per scored row (model name, UTC timestamp,
+# input hash, optional key columns, prediction columns) to an in-memory
+# buffer. A background thread writes the buffer to a hive-partitioned
+# Parquet dataset
+#
+#   <path>/ModelName=<name>/Date=<YYYY-MM-DD>/part-<time>-<id>.parquet
+#
+# when it holds FlushRows rows or its oldest record is FlushSeconds old.
+# Files are written to a hidden temp name and renamed, so readers never see
+# partial files. Failed writes stay in the buffer and are retried; close()
+# (also run at interpreter exit) drains the buffer: at-least-once on clean
+# shutdown. Memory is bounded by MaxBufferRows: when the disk falls behind,
+# appends block (OnFull="block") or are dropped and counted (OnFull="drop").
+
+from __future__ import annotations
+import atexit
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+import polars as pl
+
+
+class AuditLog:
+    """
+    Prediction audit sink (see module header). Create it with
+    RetroFit.set_audit_log(); scoring paths call append().
+
+    Thread-safe: any number of threads may append.
+    """
+
+    def __init__(
+        self,
+        path,
+        key_columns: List[str] | None = None,
+        flush_rows: int = 10_000,
+        flush_seconds: float = 5.0,
+        max_buffer_rows: int = 1_000_000,
+        on_full: str = "block",
+        compression: str = "zstd",
+    ):
+        on_full = on_full.lower()
+        if on_full not in ("block", "drop"):
+            raise ValueError("on_full must be 'block' or 'drop'.")
+        if flush_rows < 1 or max_buffer_rows < flush_rows:
+            raise ValueError("Need 1 <= flush_rows <= max_buffer_rows.")
+        self.path = Path(path)
+        self.key_columns = list(key_columns or [])
+        self.flush_rows = int(flush_rows)
+        self.flush_seconds = float(flush_seconds)
+        self.max_buffer_rows = int(max_buffer_rows)
+        self.on_full = on_full
+        self.compression = compression
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._buffer: List[tuple] = []          # (model_name, frame, appended_at)
+        self._buffered = 0                      # rows waiting in _buffer
+        self._writing = 0                       # rows taken by the writer, not yet on disk
+        self._flush_requested = False
+        self._closed = False
+        self.rows_appended = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.files_written = 0
+        self.write_errors = 0
+        self.last_error: BaseException | None = None
+        self.blocked_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="retrofit-audit", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __repr__(self):
+        return (
+            f"AuditLog(path={str(self.path)!r}, buffered={self._buffered}, "
+            f"written={self.rows_written}, closed={self._closed})"
+        )
+
+    # Pickling keeps the configuration; the loaded copy starts its own writer
+    def __getstate__(self):
+        return {
+            "path": str(self.path),
+            "key_columns": self.key_columns,
+            "flush_rows": self.flush_rows,
+            "flush_seconds": self.flush_seconds,
+            "max_buffer_rows": self.max_buffer_rows,
+            "on_full": self.on_full,
+            "compression": self.compression,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # Producer side
+    def append(self, model_name: str, records: pl.DataFrame) -> bool:
+        """
+        Queue records (one row per prediction) for model_name; a ScoredAt
+        (UTC) column is added here. Returns False if the records were dropped
+        (OnFull="drop" and the buffer is full).
+        """
+        n = records.height
+        if n == 0:
+            return True
+        records = records.with_columns(
+            pl.lit(datetime.now(timezone.utc)).dt.cast_time_unit("us").alias("ScoredAt")
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AuditLog is closed.")
+            # Always admit into an empty buffer, so one oversized batch can't deadlock
+            t0 = None
+            while self._buffered + self._writing > 0 and \
+                    self._buffered + self._writing + n > self.max_buffer_rows:
+                # Full: write now rather than at the next size / age trigger
+                self._flush_requested = True
+                self._cond.notify_all()
+                if self.on_full == "drop":
+                    self.rows_dropped += n
+                    return False
+                if t0 is None:
+                    t0 = time.perf_counter()
+                self._cond.wait()
+                if self._closed:
+                    raise RuntimeError("AuditLog is closed.")
+            if t0 is not None:
+                self.blocked_seconds += time.perf_counter() - t0
+            self._buffer.append((str(model_name), records, time.monotonic()))
+            self._buffered += n
+            self.rows_appended += n
+            if self._buffered >= self.flush_rows:
+                self._cond.notify_all()
+        return True
+
+    # Writer thread
+    def _due(self) -> float | None:
+        """
+        Seconds until the buffer must be written (0 → now, None → nothing buffered).
+        """
+        if not self._buffer:
+            return None
+        if self._closed or self._flush_requested or self._buffered >= self.flush_rows:
+            return 0.0
+        return max(0.0, self._buffer[0][2] + self.flush_seconds - time.monotonic())
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while True:
+                    due = self._due()
+                    if due == 0.0:
+                        break
+                    if due is None and self._closed:
+                        return
+                    self._cond.wait(due)
+                batch, self._buffer = self._buffer, []
+                self._writing += self._buffered
+                self._buffered = 0
+
+            failed = self._write(batch)
+
+            with self._cond:
+                if failed:
+                    failures += 1
+                    rows = sum(f.height for _, f, _ in failed)
+                    self._buffer[:0] = failed
+                    self._buffered += rows
+                    self._writing = 0
+                    if self._closed and failures >= 3:
+                        # Give up on shutdown; close() reports what is left
+                        self._cond.notify_all()
+                        return
+                else:
+                    failures = 0
+                    self._writing = 0
+                    if not self._buffer:
+                        self._flush_requested = False
+                self._cond.notify_all()
+            if failed:
+                time.sleep(min(0.1 * 2 ** failures, max(self.flush_seconds, 0.1)))
+
+    def _write(self, batch: List[tuple]) -> List[tuple]:
+        """
+        Write batch grouped by model and day; return the entries that failed.
+        """
+        groups: Dict[str, List[tuple]] = {}
+        for entry in batch:
+            groups.setdefault(entry[0], []).append(entry)
+
+        failed = []
+        for model_name, entries in groups.items():
+            try:
+                df = pl.concat([f for _, f, _ in entries], how="diagonal_relaxed")
+                parts = df.with_columns(
+                    pl.col("ScoredAt").dt.date().cast(pl.Utf8).alias("Date")
+                ).partition_by("Date", as_dict=True, include_key=False)
+                for (day,), part in parts.items():
+                    folder = self.path / f"ModelName={_partition_value(model_name)}" / f"Date={day}"
+                    folder.mkdir(parents=True, exist_ok=True)
+                    name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+                    tmp = folder / f".{name}.tmp"
+                    part.write_parquet(tmp, compression=self.compression)
+                    os.replace(tmp, folder / name)
+                    with self._cond:
+                        self.files_written += 1
+                with self._cond:
+                    self.rows_written += df.height
+            except Exception as e:
+                # A partially written group is retried whole: at-least-once
+                failed.extend(entries)
+                with self._cond:
+                    self.write_errors += 1
+                    self.last_error = e
+        return failed
+
+    # Control
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Write everything appended so far and wait for it. Returns False on
+        timeout or if the writer keeps failing (see last_error).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            errors = self.write_errors
+            while self._buffered + self._writing > 0:
+                if self.write_errors > errors and self._writing == 0:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None):
+        """
+        Stop accepting records, drain the buffer and stop the writer thread.
+        Raises RuntimeError if records could not be written.
+        """
+        with self._cond:
+            already = self._closed
+            self._closed = True
+            self._cond.notify_all()
+        if not already:
+            atexit.unregister(self.close)
+        self._thread.join(timeout)
+        if self._buffered or self._writing:
+            raise RuntimeError(
+                f"AuditLog closed with {self._buffered + self._writing} unwritten rows "
+                f"(last error: {self.last_error!r})."
+            )
+
+    # Introspection
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "path": str(self.path),
+                "rows_appended": self.rows_appended,
+                "rows_written": self.rows_written,
+                "rows_dropped": self.rows_dropped,
+                "rows_buffered": self._buffered + self._writing,
+                "files_written": self.files_written,
+                "write_errors": self.write_errors,
+                "last_error": repr(self.last_error) if self.last_error is not None else None,
+                "blocked_seconds": self.blocked_seconds,
+                "closed": self._closed,
+            }
+
+    def scan(self) -> pl.LazyFrame:
+        """
+        LazyFrame over the written dataset (see scan_prediction_log).
+        """
+        return scan_prediction_log(self.path)
+
+
+def scan_prediction_log(path) -> pl.LazyFrame:
+    """
+    LazyFrame over a dataset written by AuditLog (ModelName / Date from the
+    partition path). Files are combined by column name, so records written
+    before a change of output layout (e.g. set_postprocessing) read back
+    with nulls.
+    """
+    frames = []
+    for f in sorted(Path(path).glob("ModelName=*/Date=*/*.parquet")):
+        frames.append(pl.scan_parquet(f).with_columns(
+            pl.lit(f.parent.parent.name.split("=", 1)[1]).alias("ModelName"),
+            pl.lit(f.parent.name.split("=", 1)[1]).str.to_date().alias("Date"),
+        ))
+    if not frames:
+        return pl.LazyFrame()
+    return pl.concat(frames, how="diagonal_relaxed")
+
+
+def _partition_value(value: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in value) or "_"
@@ -0,0 +1,408 @@
+# Module: caching
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+import polars as pl
+
+
+def frame_fingerprint(df: pl.DataFrame | None) -> str | None:
+    """
+    Content hash of a Polars DataFrame: schema + row hashes (vectorized in Polars).
+    Returns None for None.
+    """
+    if df is None:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(list(df.schema.items())).encode())
+    h.update(str(df.height).encode())
+    if df.height and df.width:
+        h.update(df.hash_rows(seed=0).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class TrainingCache:
+    """
+    Content-addressed on-disk cache of fitted boosters.
+
+    Layout:
+        <cache_dir>/<key>/meta.json
+        <cache_dir>/<key>/<native model file(s)>
+
+    Entries are evicted least-recently-used first once the total size exceeds
+    max_size_mb. The last access time is kept in meta.json.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, cache_dir, max_size_mb: float = 2048):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_mb = float(max_size_mb)
+
+    # Key
+    @staticmethod
+    def make_key(parts: Dict) -> str:
+        """
+        Hash a dict of key parts (must be JSON-serializable after str() fallback).
+        """
+        payload = json.dumps(parts, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    # Read / write
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def _read_meta(self, entry: Path) -> Optional[Dict]:
+        try:
+            with (entry / self.META_FILE).open("r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, entry: Path, meta: Dict):
+        tmp = entry / f".{self.META_FILE}.{uuid.uuid4().hex}"
+        with tmp.open("w") as f:
+            json.dump(meta, f, default=repr)
+        os.replace(tmp, entry / self.META_FILE)
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Return the entry directory for `key` (and mark it as recently used),
+        or None on a miss.
+        """
+        entry = self._entry_dir(key)
+        meta = self._read_meta(entry)
+        if meta is None:
+            return None
+        meta["last_access"] = time.time()
+        meta["hits"] = int(meta.get("hits", 0)) + 1
+        self._write_meta(entry, meta)
+        return entry
+
+    def put(self, key: str, writer: Callable[[Path], None], meta: Dict | None = None) -> Path:
+        """
+        Store a new entry. `writer(directory)` writes the native model file(s).
+        The entry is built in a temp directory and moved into place atomically.
+        """
+        entry = self._entry_dir(key)
+        tmp = self.cache_dir / f".tmp-{key}-{uuid.uuid4().hex}"
+        tmp.mkdir(parents=True)
+        try:
+            writer(tmp)
+            size = sum(p.stat().st_size for p in tmp.iterdir() if p.is_file())
+            now = time.time()
+            self._write_meta(tmp, {
+                **(meta or {}),
+                "key": key,
+                "size_bytes": size,
+                "created": now,
+                "last_access": now,
+                "hits": 0,
+            })
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        self._evict()
+        return entry
+
+    # Inspection / maintenance
+    def _metas(self) -> list[Dict]:
+        out = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            meta = self._read_meta(entry)
+            if meta is not None:
+                out.append(meta)
+        return out
+
+    def size_bytes(self) -> int:
+        """
+        Total size of all cache entries.
+        """
+        return int(sum(m.get("size_bytes", 0) for m in self._metas()))
+
+    def entries(self) -> pl.DataFrame:
+        """
+        One row per cache entry, most recently used first.
+        """
+        metas = self._metas()
+        if not metas:
+            return pl.DataFrame(
+                schema={
+                    "key": pl.Utf8, "Algorithm": pl.Utf8, "TargetType": pl.Utf8,
+                    "size_bytes": pl.Int64, "hits": pl.Int64,
+                    "created": pl.Datetime, "last_access": pl.Datetime,
+                }
+            )
+        rows = [
+            {
+                "key": m.get("key"),
+                "Algorithm": m.get("Algorithm"),
+                "TargetType": m.get("TargetType"),
+                "size_bytes": int(m.get("size_bytes", 0)),
+                "hits": int(m.get("hits", 0)),
+                "created": float(m.get("created", 0.0)),
+                "last_access": float(m.get("last_access", 0.0)),
+            }
+            for m in metas
+        ]
+        return (
+            pl.DataFrame(rows)
+            .with_columns(
+                pl.from_epoch(pl.col("created") * 1_000_000, time_unit="us"),
+                pl.from_epoch(pl.col("last_access") * 1_000_000, time_unit="us"),
+            )
+            .sort("last_access", descending=True)
+        )
+
+    def purge(self, keys: Iterable[str] | str | None = None) -> int:
+        """
+        Remove the given entries (or everything if keys is None).
+        Returns the number of entries removed.
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        if keys is None:
+            keys = [m["key"] for m in self._metas()]
+
+        removed = 0
+        for key in keys:
+            entry = self._entry_dir(key)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _evict(self):
+        """
+        Drop least-recently-used entries until the cache fits in max_size_mb.
+        """
+        limit = self.max_size_mb * 1024 * 1024
+        metas = sorted(self._metas(), key=lambda m: m.get("last_access", 0.0))
+        total = sum(m.get("size_bytes", 0) for m in metas)
+        for m in metas:
+            if total <= limit:
+                break
+            self.purge(m["key"])
+            total -= m.get("size_bytes", 0)
+
+
+class _PredictionStore:
+    """
+    Prediction rows of one model: uint64 row hash → slot in a value matrix.
+    Capacity grows by doubling up to max_entries; after that the least
+    recently used slots are reused.
+    """
+
+    def __init__(self, width: int, max_entries: int, columns: List[str], schema: List):
+        self.columns = list(columns)
+        self.schema = list(schema)
+        self.max_entries = int(max_entries)
+        cap = min(1024, self.max_entries)
+        self.index: Dict[int, int] = {}
+        self.keys = np.zeros(cap, dtype=np.uint64)
+        self.values = np.empty((cap, width), dtype=np.float64)
+        self.last_access = np.zeros(cap, dtype=np.float64)
+        self.created = np.zeros(cap, dtype=np.float64)
+        self.size = 0
+
+    def _grow(self, needed: int):
+        cap = len(self.keys)
+        if self.size + needed <= cap or cap >= self.max_entries:
+            return
+        new_cap = min(self.max_entries, max(cap * 2, self.size + needed))
+        extra = new_cap - cap
+        self.keys = np.concatenate([self.keys, np.zeros(extra, dtype=np.uint64)])
+        self.values = np.concatenate([self.values, np.empty((extra, self.values.shape[1]))])
+        self.last_access = np.concatenate([self.last_access, np.zeros(extra)])
+        self.created = np.concatenate([self.created, np.zeros(extra)])
+
+    def slots_for(self, hashes: np.ndarray) -> np.ndarray:
+        get = self.index.get
+        return np.fromiter((get(h, -1) for h in hashes.tolist()), dtype=np.int64, count=len(hashes))
+
+    def allocate(self, n_new: int, protect: np.ndarray) -> tuple[np.ndarray, int]:
+        """
+        Return n_new slots (appended, or LRU victims) and the eviction count.
+        Slots in `protect` (refreshed in the same batch) are never evicted.
+        """
+        self._grow(n_new)
+        free = len(self.keys) - self.size
+        appended = np.arange(self.size, self.size + min(free, n_new))
+        self.size += len(appended)
+        n_evict = n_new - len(appended)
+        if n_evict <= 0:
+            return appended, 0
+
+        occupied = self.last_access[: self.size].copy()
+        occupied[appended] = np.inf
+        occupied[protect] = np.inf
+        victims = np.argpartition(occupied, n_evict - 1)[:n_evict]
+        for k in self.keys[victims].tolist():
+            self.index.pop(k, None)
+        return np.concatenate([appended, victims]), n_evict
+
+    def nbytes(self) -> int:
+        return int(self.keys.nbytes + self.values.nbytes + self.last_access.nbytes + self.created.nbytes)
+
+
+class PredictionCache:
+    """
+    In-memory prediction cache keyed by (model key, row hash).
+
+    Row hashes are computed for the whole batch at once (Polars hash_rows or
+    hash_array below); only rows that miss are sent to the engine. Each model
+    keeps at most max_entries rows (LRU eviction). With ttl_seconds set,
+    entries older than that count as misses and are refreshed.
+
+    Keys are 64-bit hashes of the feature values, so two different rows can
+    collide with probability ~n^2 / 2^65. This is negligible for caches of
+    millions of rows but not zero.
+    """
+
+    def __init__(self, max_entries: int = 1_000_000, ttl_seconds: float | None = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._stores: Dict[str, _PredictionStore] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def lookup(self, model_key: str, hashes: np.ndarray):
+        """
+        Returns (values, hit_mask, columns, schema). values has one row per hash
+        (rows where hit_mask is False are undefined); columns / schema are None
+        if the model has no entries yet.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        n = len(hashes)
+        with self._lock:
+            store = self._stores.get(model_key)
+            if store is None:
+                self.misses += n
+                return None, np.zeros(n, dtype=bool), None, None
+
+            slots = store.slots_for(hashes)
+            hit = slots >= 0
+            now = time.time()
+            if self.ttl_seconds is not None and hit.any():
+                fresh = np.ones(n, dtype=bool)
+                fresh[hit] = (now - store.created[slots[hit]]) <= self.ttl_seconds
+                self.expired += int((hit & ~fresh).sum())
+                hit &= fresh
+
+            values = np.empty((n, store.values.shape[1]), dtype=np.float64)
+            if hit.any():
+                values[hit] = store.values[slots[hit]]
+                store.last_access[slots[hit]] = now
+
+            n_hit = int(hit.sum())
+            self.hits += n_hit
+            self.misses += n - n_hit
+            return values, hit, store.columns, store.schema
+
+    def put(self, model_key: str, hashes: np.ndarray, values: np.ndarray, columns: List[str], schema: List | None = None):
+        """
+        Insert or refresh prediction rows for model_key.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(hashes), -1)
+        if len(hashes) == 0:
+            return
+
+        # Last occurrence wins for duplicate rows within a batch
+        _, last = np.unique(hashes[::-1], return_index=True)
+        keep = np.sort(len(hashes) - 1 - last)[-self.max_entries:]
+        hashes, values = hashes[keep], values[keep]
+
+        with self._lock:
+            store = self._stores.get(model_key)
+            if store is None or store.values.shape[1] != values.shape[1]:
+                store = _PredictionStore(values.shape[1], self.max_entries, columns, schema or [])
+                self._stores[model_key] = store
+
+            now = time.time()
+            slots = store.slots_for(hashes)
+            new = slots < 0
+            if new.any():
+                fresh_slots, n_evicted = store.allocate(int(new.sum()), slots[~new])
+                self.evictions += n_evicted
+                slots[new] = fresh_slots
+                for h, s in zip(hashes[new].tolist(), fresh_slots.tolist()):
+                    store.index[h] = s
+
+            store.keys[slots] = hashes
+            store.values[slots] = values
+            store.created[slots] = now
+            store.last_access[slots] = now
+
+    def clear(self, model_key: str | None = None):
+        """
+        Drop one model's entries (or everything) and keep the counters.
+        """
+        with self._lock:
+            if model_key is None:
+                self._stores.clear()
+            else:
+                self._stores.pop(model_key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": int(sum(s.size for s in self._stores.values())),
+                "models": len(self._stores),
+                "bytes": int(sum(s.nbytes() for s in self._stores.values())),
+            }
+
+
+def hash_array(X: np.ndarray) -> np.ndarray:
+    """
+    Vectorized 64-bit row hash of a 2-D numeric array (float64 bit patterns,
+    mixed column by column). Object arrays (e.g. CatBoost rows with strings)
+    fall back to hashing each row tuple.
+    """
+    X = np.asarray(X)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if X.dtype == object:
+        return np.fromiter(
+            (hash(tuple(r)) & 0xFFFFFFFFFFFFFFFF for r in X.tolist()),
+            dtype=np.uint64, count=X.shape[0],
+        )
+
+    bits = np.ascontiguousarray(X, dtype=np.float64).view(np.uint64)
+    h = np.full(X.shape[0], 0xCBF29CE484222325, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(bits.shape[1]):
+            h ^= bits[:, j]
+            h *= np.uint64(0x100000001B3)
+            h ^= h >> np.uint64(29)
+    return h
@@ -0,0 +1,513 @@
+# Module: flat_trees
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Scoring-side dependencies: NumPy only. The exporters read the engine model
+# objects they are given but never import catboost / xgboost / lightgbm.
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+from typing import Dict, List
+import numpy as np
+from .predictor import _inverse_transform_fn
+
+
+# Node missing-value handling
+MISSING_NONE = 0    # NaN is treated as 0.0 (LightGBM missing_type=None)
+MISSING_ZERO = 1    # NaN → 0.0, then 0.0 takes the default branch (LightGBM Zero)
+MISSING_NAN = 2     # NaN takes the default branch
+
+_K_ZERO_THRESHOLD = 1e-35
+
+
+class FlatTreeEnsemble:
+    """
+    Tree ensemble as flat node arrays plus a vectorized NumPy evaluator.
+
+    Node arrays (all trees concatenated, child indices absolute):
+      feature       int32   split feature index, -1 for leaves
+      threshold     float64 split threshold
+      left, right   int32   children (leaves point to themselves)
+      default_left  bool    branch taken by missing values
+      missing_type  int8    MISSING_NONE / MISSING_ZERO / MISSING_NAN
+      value         float64 (n_nodes, D) leaf values
+
+    Tree arrays:
+      roots         int32   root node per tree
+      tree_group    int32   output column per tree (used when D == 1)
+
+    A row goes left when x < threshold (decision="lt", XGBoost) or
+    x <= threshold (decision="le", LightGBM / CatBoost). Raw scores are
+    scale * sum(leaf values) + base, then mapped by `link`:
+      identity | exp | sigmoid | softmax | ova_sigmoid
+
+    predict() returns the same layouts as RetroFit.score():
+      regression      (n,)   Predict_<target> (inverse target transform applied)
+      classification  (n,)   p1
+      multiclass      (n, K) class_0..class_{K-1}
+    """
+
+    ARRAYS = (
+        "feature", "threshold", "left", "right", "default_left",
+        "missing_type", "value", "roots", "tree_group", "base",
+    )
+
+    def __init__(
+        self,
+        feature, threshold, left, right, default_left, missing_type, value,
+        roots, tree_group, base,
+        feature_names: List[str],
+        target_type: str,
+        link: str = "identity",
+        decision: str = "le",
+        float32_inputs: bool = False,
+        scale: float = 1.0,
+        sigmoid: float = 1.0,
+        target_column: str | None = None,
+        target_transform: str | None = None,
+        target_transform_params: Dict | None = None,
+        source: str | None = None,
+    ):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        value = np.asarray(value, dtype=np.float64)
+        self.value = value.reshape(len(value), -1)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.tree_group = np.asarray(tree_group, dtype=np.int32)
+        self.base = np.atleast_1d(np.asarray(base, dtype=np.float64))
+
+        if link not in ("identity", "exp", "sigmoid", "softmax", "ova_sigmoid"):
+            raise ValueError(f"Unsupported link '{link}'.")
+        if decision not in ("lt", "le"):
+            raise ValueError(f"Unsupported decision '{decision}'.")
+
+        self.feature_names = list(feature_names)
+        self.target_type = target_type
+        self.link = link
+        self.decision = decision
+        self.float32_inputs = bool(float32_inputs)
+        self.scale = float(scale)
+        self.sigmoid = float(sigmoid)
+        self.target_column = target_column
+        self.target_transform = target_transform
+        self.target_transform_params = dict(target_transform_params or {})
+        self.source = source
+
+        self.n_outputs = len(self.base)
+        self._inverse = None
+        if target_type == "regression" and self.target_transform_params.get("applied"):
+            self._inverse = _inverse_transform_fn(target_transform, self.target_transform_params)
+
+        # Tree → output one-hot (only for per-group trees)
+        self._group_matrix = np.zeros((len(self.roots), self.n_outputs))
+        if self.value.shape[1] == 1:
+            self._group_matrix[np.arange(len(self.roots)), self.tree_group] = 1.0
+        self._max_depth = self._compute_max_depth()
+        self._children = np.stack([self.left, self.right], axis=1)
+        self._has_zero_missing = bool((self.missing_type == MISSING_ZERO).any())
+
+    def __repr__(self):
+        return (
+            f"FlatTreeEnsemble(source={self.source!r}, target_type={self.target_type!r}, "
+            f"trees={len(self.roots)}, nodes={len(self.feature)}, link={self.link!r})"
+        )
+
+    @property
+    def output_columns(self) -> List[str]:
+        if self.target_type == "regression":
+            return [f"Predict_{self.target_column or 'target'}"]
+        if self.target_type == "classification":
+            return ["p1", "p0"]
+        return [f"class_{i}" for i in range(self.n_outputs)]
+
+    def _compute_max_depth(self) -> int:
+        frontier = self.roots.copy()
+        d = 0
+        while frontier.size:
+            internal = frontier[self.feature[frontier] >= 0]
+            if internal.size == 0:
+                break
+            d += 1
+            frontier = np.concatenate([self.left[internal], self.right[internal]])
+        return d
+
+    # Input
+    def _matrix(self, X) -> np.ndarray:
+        """
+        2-D array in feature_names order, or a column mapping (dict, DataFrame).
+        """
+        if isinstance(X, np.ndarray):
+            arr = X
+        elif isinstance(X, dict) or hasattr(X, "columns"):
+            arr = np.column_stack([np.asarray(X[c], dtype=np.float64) for c in self.feature_names])
+        else:
+            arr = np.asarray(X)
+        arr = np.asarray(arr, dtype=np.float32 if self.float32_inputs else np.float64)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features, got {arr.shape[1]}.")
+        return arr.astype(np.float64, copy=False)
+
+    # Evaluation
+    def predict_raw(self, X) -> np.ndarray:
+        """
+        Raw scores (margins), shape (n, n_outputs).
+        """
+        X = self._matrix(X)
+        n = X.shape[0]
+        rows = np.arange(n)[:, None]
+        idx = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+
+        # Leaves point to themselves, so every row can step max_depth times.
+        # Leaf feature -1 reads the last column; the result is discarded.
+        # Missing-value rules only cost time when X has NaN / exact zeros.
+        nan_rows = np.isnan(X).any()
+        zero_rows = self._has_zero_missing and not np.all(X)
+        less = np.less if self.decision == "lt" else np.less_equal
+
+        for _ in range(self._max_depth):
+            x = X[rows, self.feature[idx]]
+            if nan_rows or zero_rows:
+                mt = self.missing_type[idx]
+                is_nan = np.isnan(x)
+                x = np.where(is_nan & (mt != MISSING_NAN), 0.0, x)
+                use_default = np.where(
+                    mt == MISSING_NAN, is_nan,
+                    (mt == MISSING_ZERO) & (np.abs(x) <= _K_ZERO_THRESHOLD),
+                )
+                go_right = np.where(use_default, ~self.default_left[idx], ~less(x, self.threshold[idx]))
+            else:
+                go_right = ~less(x, self.threshold[idx])
+            idx = self._children[idx, go_right.view(np.int8)]
+
+        if self.value.shape[1] == 1:
+            raw = self.value[idx, 0] @ self._group_matrix
+        else:
+            raw = np.stack([self.value[idx, k].sum(axis=1) for k in range(self.value.shape[1])], axis=1)
+        return raw * self.scale + self.base
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Score X; layouts as in RetroFit.score() (see class docstring).
+        """
+        raw = self.predict_raw(X)
+
+        if self.link == "sigmoid" or self.link == "ova_sigmoid":
+            out = 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        elif self.link == "softmax":
+            e = np.exp(raw - raw.max(axis=1, keepdims=True))
+            out = e / e.sum(axis=1, keepdims=True)
+        elif self.link == "exp":
+            out = np.exp(raw)
+        else:
+            out = raw
+
+        if self.target_type == "regression":
+            out = out[:, 0]
+            return self._inverse(out) if self._inverse is not None else out
+        if self.target_type == "classification":
+            return out[:, 0]
+        return out
+
+    __call__ = predict
+
+    def predict_dict(self, X) -> Dict[str, np.ndarray]:
+        """
+        predict() keyed by score() output column names.
+        """
+        preds = self.predict(X)
+        if self.target_type == "regression":
+            return {self.output_columns[0]: preds}
+        if self.target_type == "classification":
+            return {"p1": preds, "p0": 1.0 - preds}
+        return {c: preds[:, i] for i, c in enumerate(self.output_columns)}
+
+    # Persistence (NumPy .npz, no pickle)
+    def _meta(self) -> Dict:
+        return {
+            "feature_names": self.feature_names,
+            "target_type": self.target_type,
+            "link": self.link,
+            "decision": self.decision,
+            "float32_inputs": self.float32_inputs,
+            "scale": self.scale,
+            "sigmoid": self.sigmoid,
+            "target_column": self.target_column,
+            "target_transform": self.target_transform,
+            "target_transform_params": self.target_transform_params,
+            "source": self.source,
+        }
+
+    def save(self, path):
+        """
+        Write all arrays and metadata to a single .npz file.
+        """
+        arrays = {k: getattr(self, k) for k in self.ARRAYS}
+        np.savez_compressed(path, meta=np.array(json.dumps(self._meta())), **arrays)
+
+    @classmethod
+    def load(cls, path) -> "FlatTreeEnsemble":
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            arrays = {k: z[k] for k in cls.ARRAYS}
+        return cls(**arrays, **meta)
+
+
+# Exporters
+class _NodeBuffer:
+    """
+    Accumulates nodes of several trees into flat lists.
+    """
+    def __init__(self):
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.default_left, self.missing_type, self.value = [], [], []
+        self.roots, self.tree_group = [], []
+
+    def add(self, feature=-1, threshold=0.0, default_left=True, missing_type=MISSING_NAN, value=0.0) -> int:
+        i = len(self.feature)
+        self.feature.append(feature)
+        self.threshold.append(threshold)
+        self.left.append(i)
+        self.right.append(i)
+        self.default_left.append(default_left)
+        self.missing_type.append(missing_type)
+        self.value.append(value)
+        return i
+
+    def arrays(self) -> Dict:
+        return dict(
+            feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            default_left=self.default_left, missing_type=self.missing_type, value=self.value,
+            roots=self.roots, tree_group=self.tree_group,
+        )
+
+
+def _logit(p: float) -> float:
+    return float(np.log(p / (1.0 - p)))
+
+
+def from_xgboost(
+    booster, feature_names: List[str], target_type: str, num_iterations: int | None = None, **kwargs
+) -> FlatTreeEnsemble:
+    """
+    Flatten an xgboost.Booster (gbtree, numeric splits) from its JSON model.
+    num_iterations keeps only the first boosting iterations (all if None).
+    """
+    model = json.loads(bytes(booster.save_raw("json")))
+    learner = model["learner"]
+    gb = learner["gradient_booster"]
+    if gb.get("name") != "gbtree":
+        raise NotImplementedError(f"Only gbtree boosters can be flattened (got {gb.get('name')}).")
+    trees = gb["model"]["trees"]
+    tree_info = gb["model"]["tree_info"]
+    if num_iterations is not None:
+        indptr = gb["model"].get("iteration_indptr")
+        n_trees = int(indptr[num_iterations]) if indptr else \
+            len(trees) * int(num_iterations) // max(booster.num_boosted_rounds(), 1)
+        trees, tree_info = trees[:n_trees], tree_info[:n_trees]
+    objective = learner["objective"]["name"]
+
+    base = np.asarray(
+        json.loads(learner["learner_model_param"]["base_score"].replace("E", "e")),
+        dtype=np.float64,
+    ).ravel()
+    if objective in ("binary:logistic", "reg:logistic"):
+        base = np.array([_logit(b) for b in base])
+        link = "sigmoid"
+    elif objective in ("multi:softprob", "multi:softmax"):
+        link = "softmax"
+    elif objective in ("reg:tweedie", "count:poisson", "reg:gamma", "survival:cox"):
+        # Log-link objectives store base_score on the response scale
+        base = np.log(base)
+        link = "exp"
+    elif objective in ("reg:squarederror", "reg:squaredlogerror", "reg:pseudohubererror",
+                       "reg:absoluteerror", "reg:quantileerror"):
+        link = "identity"
+    else:
+        raise NotImplementedError(f"XGBoost objective '{objective}' is not supported.")
+    n_outputs = max(int(learner["learner_model_param"].get("num_class", "0")), 1)
+    if base.size != n_outputs:
+        base = np.resize(base, n_outputs)
+
+    buf = _NodeBuffer()
+    for t, group in zip(trees, tree_info):
+        if any(int(s) != 0 for s in t.get("split_type", [])):
+            raise NotImplementedError("Categorical XGBoost splits are not supported.")
+        offset = len(buf.feature)
+        left, right = t["left_children"], t["right_children"]
+        for i in range(len(left)):
+            if left[i] == -1:
+                buf.add(value=float(t["split_conditions"][i]))
+            else:
+                j = buf.add(
+                    feature=int(t["split_indices"][i]),
+                    threshold=float(np.float32(t["split_conditions"][i])),
+                    default_left=bool(t["default_left"][i]),
+                    missing_type=MISSING_NAN,
+                )
+                buf.left[j] = offset + left[i]
+                buf.right[j] = offset + right[i]
+        buf.roots.append(offset)
+        buf.tree_group.append(int(group))
+
+    return FlatTreeEnsemble(
+        **buf.arrays(), base=base, feature_names=feature_names, target_type=target_type,
+        link=link, decision="lt", float32_inputs=True, source="xgboost", **kwargs,
+    )
+
+
+def from_lightgbm(
+    booster, feature_names: List[str], target_type: str, num_iterations: int | None = None, **kwargs
+) -> FlatTreeEnsemble:
+    """
+    Flatten a lightgbm.Booster (numerical splits) from dump_model().
+    Uses the same iterations as Booster.predict(): num_iterations if given,
+    else best_iteration if set.
+    """
+    dump = booster.dump_model(num_iteration=num_iterations)
+    per_iter = int(dump.get("num_tree_per_iteration", 1))
+    objective = str(dump.get("objective", "")).split()
+    name = objective[0] if objective else ""
+    opts = dict(o.split(":", 1) for o in objective[1:] if ":" in o)
+    sigmoid = float(opts.get("sigmoid", 1.0))
+
+    if name in ("binary", "cross_entropy", "xentropy"):
+        link = "sigmoid"
+    elif name == "multiclass":
+        link = "softmax"
+    elif name == "multiclassova":
+        link = "ova_sigmoid"
+    elif name in ("regression", "regression_l1", "huber", "fair", "quantile", "mape", "custom", "none", ""):
+        link = "identity"
+    else:
+        raise NotImplementedError(f"LightGBM objective '{name}' is not supported.")
+    if dump.get("average_output"):
+        raise NotImplementedError("LightGBM random-forest (average_output) models are not supported.")
+
+    missing_codes = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+    buf = _NodeBuffer()
+
+    def _walk(node) -> int:
+        if "leaf_value" in node or "split_feature" not in node:
+            return buf.add(value=float(node.get("leaf_value", 0.0)))
+        if node.get("decision_type", "<=") != "<=":
+            raise NotImplementedError("Categorical LightGBM splits are not supported.")
+        j = buf.add(
+            feature=int(node["split_feature"]),
+            threshold=float(node["threshold"]),
+            default_left=bool(node.get("default_left", True)),
+            missing_type=missing_codes[node.get("missing_type", "None")],
+        )
+        buf.left[j] = _walk(node["left_child"])
+        buf.right[j] = _walk(node["right_child"])
+        return j
+
+    for k, info in enumerate(dump["tree_info"]):
+        buf.roots.append(_walk(info["tree_structure"]))
+        buf.tree_group.append(k % per_iter)
+
+    return FlatTreeEnsemble(
+        **buf.arrays(), base=np.zeros(per_iter), feature_names=feature_names,
+        target_type=target_type, link=link, decision="le", sigmoid=sigmoid,
+        source="lightgbm", **kwargs,
+    )
+
+
+def from_catboost_json(
+    model: Dict, feature_names: List[str], target_type: str, num_iterations: int | None = None, **kwargs
+) -> FlatTreeEnsemble:
+    """
+    Flatten a CatBoost JSON model (save_model(format="json")) with float
+    features only. Each oblivious tree of depth d becomes a complete binary
+    tree; split i decides bit i of the leaf index (x > border → 1 → right).
+    num_iterations keeps only the first trees (all if None).
+    """
+    features_info = model.get("features_info", {})
+    if features_info.get("categorical_features") or features_info.get("text_features") \
+            or features_info.get("ctrs"):
+        raise NotImplementedError(
+            "CatBoost models with categorical or text features cannot be flattened."
+        )
+
+    float_features = features_info.get("float_features", [])
+    flat_index = {f["feature_index"]: f["flat_feature_index"] for f in float_features}
+    nan_left = {
+        f["feature_index"]: f.get("nan_value_treatment", "AsIs") != "AsTrue"
+        for f in float_features
+    }
+
+    scale, bias = model.get("scale_and_bias", [1.0, [0.0]])
+    bias = np.atleast_1d(np.asarray(bias, dtype=np.float64))
+    dim = len(bias)
+
+    loss = (model.get("model_info", {}).get("params", {}).get("loss_function") or {}).get("type")
+    if target_type == "regression":
+        link = "identity"
+    elif target_type == "classification":
+        link = "sigmoid"
+    elif loss == "MultiClassOneVsAll":
+        link = "ova_sigmoid"
+    else:
+        link = "softmax"
+
+    buf = _NodeBuffer()
+    for tree in model["oblivious_trees"][:num_iterations]:
+        splits = tree.get("splits") or []
+        depth = len(splits)
+        leaf_values = np.asarray(tree["leaf_values"], dtype=np.float64).reshape(2 ** depth, dim)
+
+        def _build(level: int, leaf_index: int) -> int:
+            if level == depth:
+                return buf.add(value=leaf_values[leaf_index].tolist())
+            s = splits[level]
+            if s.get("split_type", "FloatFeature") != "FloatFeature":
+                raise NotImplementedError(f"CatBoost split type {s.get('split_type')} is not supported.")
+            fi = s["float_feature_index"]
+            j = buf.add(
+                feature=int(flat_index.get(fi, fi)),
+                threshold=float(s["border"]),
+                default_left=nan_left.get(fi, True),
+                missing_type=MISSING_NAN,
+                value=[0.0] * dim,
+            )
+            buf.left[j] = _build(level + 1, leaf_index)
+            buf.right[j] = _build(level + 1, leaf_index | (1 << level))
+            return j
+
+        buf.roots.append(_build(0, 0))
+        buf.tree_group.append(0)
+
+    # Leaves carry all output dimensions; internal nodes need the same width
+    buf.value = [v if isinstance(v, list) else [v] * dim for v in buf.value]
+
+    return FlatTreeEnsemble(
+        **buf.arrays(), base=bias, feature_names=feature_names, target_type=target_type,
+        link=link, decision="le", float32_inputs=True, scale=float(scale),
+        source="catboost", **kwargs,
+    )
+
+
+def from_catboost(
+    model, feature_names: List[str], target_type: str, num_iterations: int | None = None, **kwargs
+) -> FlatTreeEnsemble:
+    """
+    Flatten a fitted CatBoost model via its JSON export.
+    """
+    fd, path = tempfile.mkstemp(suffix=".json", prefix="retrofit-cb-")
+    os.close(fd)
+    try:
+        model.save_model(path, format="json")
+        with open(path, "r") as f:
+            model_json = json.load(f)
+    finally:
+        os.remove(path)
+    return from_catboost_json(model_json, feature_names, target_type, num_iterations=num_iterations, **kwargs)
@@ -0,0 +1,233 @@
+# Module: model_pool
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Multi-tenant scoring pool: many registered models, few resident.
+#
+#   pool = ModelPool(MaxBytes=2 * 1024**3)
+#   pool.register("client_17", "artifacts/client_17")     # save_scoring_artifact dir
+#   pool.register("client_18", "models/client_18.pkl")    # or a save_retrofit pickle
+#   pool.score("client_17", df)
+#
+# Models load on first use, are kept in LRU order and evicted when the sum of
+# their resident sizes exceeds MaxBytes. Concurrent first requests for the
+# same model share one load.
+
+from __future__ import annotations
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Union
+
+from .MachineLearning import RetroFit, ScoringView
+
+
+def estimate_model_bytes(model) -> int:
+    """
+    Approximate resident size of a booster: its serialized native size.
+    """
+    engine = RetroFit._model_engine(model)
+    if engine == "xgboost":
+        return len(model.save_raw())
+    if engine == "lightgbm":
+        return len(model.model_to_string())
+    with tempfile.TemporaryDirectory(prefix="retrofit-pool-") as tmp:
+        return RetroFit._save_native_model(model, engine, tmp).stat().st_size
+
+
+class _PoolEntry:
+    __slots__ = ("view", "nbytes", "load_seconds", "last_used", "hits")
+
+    def __init__(self, view: ScoringView, nbytes: int, load_seconds: float):
+        self.view = view
+        self.nbytes = int(nbytes)
+        self.load_seconds = load_seconds
+        self.last_used = time.time()
+        self.hits = 0
+
+
+class ModelPool:
+    """
+    Lazily loaded, memory-capped pool of ScoringViews keyed by tenant / model id.
+
+    Sources (register):
+      directory     written by RetroFit.save_scoring_artifact(): only the native
+                    model and scoring state are read
+      .pkl file     written by RetroFit.save_retrofit(): loaded once, reduced to a
+                    ScoringView, the rest (training data, scored data) is dropped
+      RetroFit      an in-memory instance (reduced to a ScoringView on first use)
+
+    Resident size per model is estimate_model_bytes() (serialized native model
+    size). When the total exceeds MaxBytes the least recently used models are
+    evicted; a model larger than MaxBytes on its own is still served. Views
+    handed out stay valid after eviction (the pool only drops its reference).
+
+    Thread-safe: lookups take a short lock; loads run outside it and are
+    deduplicated per key.
+    """
+
+    def __init__(self, MaxBytes: int = 2 * 1024 ** 3, Threads: int | None = 1, ModelName: str | None = None):
+        self.MaxBytes = int(MaxBytes)
+        self.Threads = Threads
+        self.ModelName = ModelName
+        self._sources: Dict[str, object] = {}
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.shared_loads = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (
+            f"ModelPool(registered={len(self._sources)}, resident={len(self._entries)}, "
+            f"resident_bytes={self._resident}, max_bytes={self.MaxBytes})"
+        )
+
+    def __len__(self):
+        return len(self._sources)
+
+    def __contains__(self, key):
+        return key in self._sources
+
+    # Registration
+    def register(self, key: str, source: Union[str, Path, RetroFit]):
+        """
+        Register (or replace) the source for key. Nothing is loaded until get().
+        """
+        with self._lock:
+            self._sources[key] = source
+            self._drop(key)
+
+    def unregister(self, key: str):
+        with self._lock:
+            self._sources.pop(key, None)
+            self._drop(key)
+
+    # Lookup / load
+    def get(self, key: str) -> ScoringView:
+        """
+        ScoringView for key, loading it on first use (and evicting LRU models
+        when the pool goes over MaxBytes).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                entry.last_used = time.time()
+                self.hits += 1
+                return entry.view
+            if key not in self._sources:
+                raise KeyError(f"Model '{key}' is not registered in the pool.")
+            fut = self._loading.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._loading[key] = fut
+                self.misses += 1
+                source = self._sources[key]
+            else:
+                self.shared_loads += 1
+
+        if not owner:
+            return fut.result()
+
+        try:
+            t0 = time.perf_counter()
+            view = self._load(source)
+            nbytes = estimate_model_bytes(view._model)
+            seconds = time.perf_counter() - t0
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            fut.set_exception(e)
+            raise
+
+        with self._lock:
+            self._loading.pop(key, None)
+            # Source replaced while loading: serve this view, but don't keep it
+            if self._sources.get(key) is source:
+                self._entries[key] = _PoolEntry(view, nbytes, seconds)
+                self._resident += nbytes
+                self.loads += 1
+                self._evict_over_cap(protect=key)
+        fut.set_result(view)
+        return view
+
+    def _load(self, source) -> ScoringView:
+        if isinstance(source, RetroFit):
+            return source.scoring_view(self.ModelName, Threads=self.Threads)
+        path = Path(source)
+        if path.is_dir():
+            return RetroFit.load_scoring_artifact(path, Threads=self.Threads)
+        return RetroFit.load_retrofit(path).scoring_view(self.ModelName, Threads=self.Threads)
+
+    # Scoring shortcuts
+    def score(self, key: str, df):
+        return self.get(key).score(df)
+
+    def predict(self, key: str, df):
+        return self.get(key).predict(df)
+
+    # Eviction
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._resident -= entry.nbytes
+        return entry
+
+    def _evict_over_cap(self, protect: str | None = None):
+        while self._resident > self.MaxBytes:
+            victim = next((k for k in self._entries if k != protect), None)
+            if victim is None:
+                break
+            self._drop(victim)
+            self.evictions += 1
+
+    def evict(self, key: str) -> bool:
+        with self._lock:
+            return self._drop(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._resident = 0
+
+    # Introspection
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident
+
+    def resident(self) -> list:
+        """
+        Resident keys, least recently used first.
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "registered": len(self._sources),
+                "resident": len(self._entries),
+                "resident_bytes": self._resident,
+                "max_bytes": self.MaxBytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "shared_loads": self.shared_loads,
+                "evictions": self.evictions,
+                "models": {
+                    k: {"bytes": e.nbytes, "hits": e.hits, "load_seconds": e.load_seconds}
+                    for k, e in self._entries.items()
+                },
+            }
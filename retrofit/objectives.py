@@ -0,0 +1,351 @@
+# Module: objectives
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+from __future__ import annotations
+import time
+import types
+from functools import partial
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CustomObjective:
+    """
+    A custom loss written once as NumPy-vectorized functions.
+
+    grad_hess(y_true, y_pred) -> (grad, hess)
+        First and second derivative of the loss w.r.t. the raw score, one value
+        per row. Sample weights are applied by the engine adapters.
+    metric(y_true, y_pred, weight) -> float
+        Evaluation metric over the whole array (weight may be None).
+
+    y_pred is always the raw score (margin): the value itself for regression,
+    the log-odds for binary classification.
+    """
+    name: str
+    grad_hess: Optional[Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]] = None
+    metric: Optional[Callable[[np.ndarray, np.ndarray, Optional[np.ndarray]], float]] = None
+    higher_is_better: bool = False
+
+
+@dataclass
+class CallbackStats:
+    """
+    Call counter + wall time spent inside Python callbacks during training.
+    """
+    objective_calls: int = 0
+    objective_seconds: float = 0.0
+    metric_calls: int = 0
+    metric_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "objective_calls": self.objective_calls,
+            "objective_seconds": self.objective_seconds,
+            "metric_calls": self.metric_calls,
+            "metric_seconds": self.metric_seconds,
+        }
+
+
+# Registry
+_OBJECTIVES: Dict[str, CustomObjective] = {}
+
+
+def register_objective(
+    name: str,
+    grad_hess=None,
+    metric=None,
+    higher_is_better: bool = False,
+    overwrite: bool = False,
+) -> CustomObjective:
+    """
+    Register a custom objective and/or eval metric under `name`.
+
+    Example:
+        def grad_hess(y, p):
+            r = p - y
+            w = np.where(r < 0, 3.0, 1.0)   # under-forecast costs 3x
+            return 2.0 * w * r, 2.0 * w
+
+        register_objective("asym_leads", grad_hess=grad_hess, metric=my_metric)
+
+    Use module-level functions (not lambdas) if the trained RetroFit object
+    will be pickled; CatBoost keeps the objective inside the model params.
+    """
+    if grad_hess is None and metric is None:
+        raise ValueError("Provide grad_hess, metric, or both.")
+    if name in _OBJECTIVES and not overwrite:
+        raise KeyError(f"Objective '{name}' is already registered; pass overwrite=True to replace it.")
+
+    obj = CustomObjective(
+        name=name,
+        grad_hess=grad_hess,
+        metric=metric,
+        higher_is_better=bool(higher_is_better),
+    )
+    _OBJECTIVES[name] = obj
+    return obj
+
+
+def get_objective(name: str) -> CustomObjective:
+    """
+    Look up a registered objective by name.
+    """
+    try:
+        return _OBJECTIVES[name]
+    except KeyError:
+        raise KeyError(
+            f"Objective '{name}' is not registered. Registered: {sorted(_OBJECTIVES)}"
+        ) from None
+
+
+def objective_fingerprint(name: str | None):
+    """
+    JSON-serializable description of the functions registered under `name`
+    (code, constants, defaults, partial arguments), stable across processes.
+    Re-registering a name with different functions changes it; used in the
+    training-cache key.
+    """
+    if name is None:
+        return None
+    obj = get_objective(name)
+    return {
+        "name": obj.name,
+        "grad_hess": _callable_fingerprint(obj.grad_hess),
+        "metric": _callable_fingerprint(obj.metric),
+        "higher_is_better": obj.higher_is_better,
+    }
+
+
+def _callable_fingerprint(fn):
+    if fn is None:
+        return None
+    if isinstance(fn, partial):
+        return ["partial", _callable_fingerprint(fn.func), repr(fn.args), repr(sorted(fn.keywords.items()))]
+    code = getattr(fn, "__code__", None)
+    if code is None:
+        # Callable instance: its class and __call__
+        call = getattr(type(fn), "__call__", None)
+        return [type(fn).__module__, type(fn).__qualname__, _callable_fingerprint(call), repr(fn)]
+    cells = []
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            value = None
+        cells.append(_callable_fingerprint(value) if callable(value) else repr(value))
+    return [
+        getattr(fn, "__module__", None),
+        getattr(fn, "__qualname__", None),
+        _code_fingerprint(code),
+        repr(getattr(fn, "__defaults__", None)),
+        repr(getattr(fn, "__kwdefaults__", None)),
+        cells,
+    ]
+
+
+def _code_fingerprint(code: types.CodeType):
+    return [
+        code.co_code.hex(),
+        [_code_fingerprint(c) if isinstance(c, types.CodeType) else repr(c) for c in code.co_consts],
+        list(code.co_names),
+    ]
+
+
+def list_objectives() -> List[str]:
+    """
+    Names of all registered objectives.
+    """
+    return sorted(_OBJECTIVES)
+
+
+def unregister_objective(name: str):
+    """
+    Remove an objective from the registry (no-op if missing).
+    """
+    _OBJECTIVES.pop(name, None)
+
+
+# Built-in: asymmetric squared error (under- vs over-forecast cost)
+def _asymmetric_grad_hess(y_true, y_pred, under_cost=1.0, over_cost=1.0):
+    r = y_pred - y_true
+    c = np.where(r < 0, under_cost, over_cost)
+    return 2.0 * c * r, 2.0 * c
+
+
+def _asymmetric_metric(y_true, y_pred, weight, under_cost=1.0, over_cost=1.0):
+    r = y_pred - y_true
+    loss = np.where(r < 0, under_cost, over_cost) * r * r
+    return float(np.average(loss, weights=weight))
+
+
+def register_asymmetric_squared_error(
+    name: str = "asymmetric_squared_error",
+    under_cost: float = 1.0,
+    over_cost: float = 1.0,
+    overwrite: bool = False,
+) -> CustomObjective:
+    """
+    Register cost * (y_pred - y_true)^2 where cost is under_cost when the model
+    under-forecasts (y_pred < y_true) and over_cost otherwise.
+    """
+    costs = dict(under_cost=float(under_cost), over_cost=float(over_cost))
+    return register_objective(
+        name,
+        grad_hess=partial(_asymmetric_grad_hess, **costs),
+        metric=partial(_asymmetric_metric, **costs),
+        higher_is_better=False,
+        overwrite=overwrite,
+    )
+
+
+# Adapter helpers
+def _as_1d(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64).ravel()
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-15, 1.0 - 1e-15)
+    return np.log(p / (1.0 - p))
+
+
+def _weighted(grad, hess, weight):
+    if weight is None:
+        return grad, hess
+    return grad * weight, hess * weight
+
+
+# CatBoost adapters
+class CatBoostObjectiveAdapter:
+    """
+    CatBoost calc_ders_range() interface. CatBoost expects derivatives of the
+    log-likelihood, i.e. the negated gradient / hessian of the loss.
+    """
+    def __init__(self, objective: CustomObjective, stats: CallbackStats):
+        self.objective = objective
+        self.stats = stats
+
+    # CatBoost deep-copies its params; keep the shared stats object
+    def __deepcopy__(self, memo):
+        return self
+
+    def calc_ders_range(self, approxes, targets, weights):
+        t0 = time.perf_counter()
+        y_pred = _as_1d(approxes)
+        y_true = _as_1d(targets)
+        w = _as_1d(weights) if weights is not None else None
+        grad, hess = self.objective.grad_hess(y_true, y_pred)
+        grad, hess = _weighted(_as_1d(grad), _as_1d(hess), w)
+        out = list(zip((-grad).tolist(), (-hess).tolist()))
+        self.stats.objective_calls += 1
+        self.stats.objective_seconds += time.perf_counter() - t0
+        return out
+
+
+class CatBoostMetricAdapter:
+    """
+    CatBoost custom eval_metric interface. The vectorized metric is computed in
+    evaluate() and returned as (value * weight_sum, weight_sum).
+    """
+    def __init__(self, objective: CustomObjective, stats: CallbackStats):
+        self.objective = objective
+        self.stats = stats
+
+    # CatBoost deep-copies its params; keep the shared stats object
+    def __deepcopy__(self, memo):
+        return self
+
+    def is_max_optimal(self):
+        return self.objective.higher_is_better
+
+    def evaluate(self, approxes, target, weight):
+        t0 = time.perf_counter()
+        y_pred = _as_1d(approxes[0])
+        y_true = _as_1d(target)
+        w = _as_1d(weight) if weight is not None else None
+        value = float(self.objective.metric(y_true, y_pred, w))
+        weight_sum = float(w.sum()) if w is not None else float(y_true.size)
+        self.stats.metric_calls += 1
+        self.stats.metric_seconds += time.perf_counter() - t0
+        return value * weight_sum, weight_sum
+
+    def get_final_error(self, error, weight):
+        return error / weight if weight else 0.0
+
+
+# XGBoost adapters
+def xgboost_objective(objective: CustomObjective, stats: CallbackStats):
+    """
+    Build an `obj=` callable for xgb.train().
+    """
+    def _obj(preds, dtrain):
+        t0 = time.perf_counter()
+        y_true = dtrain.get_label()
+        w = dtrain.get_weight()
+        w = w if w.size else None
+        grad, hess = objective.grad_hess(y_true, _as_1d(preds))
+        grad, hess = _weighted(_as_1d(grad), _as_1d(hess), w)
+        stats.objective_calls += 1
+        stats.objective_seconds += time.perf_counter() - t0
+        return grad, hess
+    return _obj
+
+
+def xgboost_metric(objective: CustomObjective, stats: CallbackStats, to_raw: bool = False):
+    """
+    Build a `custom_metric=` callable for xgb.train(). If to_raw is True the
+    engine passes probabilities (built-in binary objective), so map them back
+    to log-odds before calling the metric.
+    """
+    def _metric(preds, dmat):
+        t0 = time.perf_counter()
+        y_pred = _as_1d(preds)
+        if to_raw:
+            y_pred = _logit(y_pred)
+        w = dmat.get_weight()
+        value = float(objective.metric(dmat.get_label(), y_pred, w if w.size else None))
+        stats.metric_calls += 1
+        stats.metric_seconds += time.perf_counter() - t0
+        return objective.name, value
+    return _metric
+
+
+# LightGBM adapters
+def lightgbm_objective(objective: CustomObjective, stats: CallbackStats):
+    """
+    Build a callable objective for params['objective'] in lgbm.train().
+    """
+    def _obj(preds, train_data):
+        t0 = time.perf_counter()
+        y_true = _as_1d(train_data.get_label())
+        w = train_data.get_weight()
+        w = _as_1d(w) if w is not None else None
+        grad, hess = objective.grad_hess(y_true, _as_1d(preds))
+        grad, hess = _weighted(_as_1d(grad), _as_1d(hess), w)
+        stats.objective_calls += 1
+        stats.objective_seconds += time.perf_counter() - t0
+        return grad, hess
+    return _obj
+
+
+def lightgbm_metric(objective: CustomObjective, stats: CallbackStats, to_raw: bool = False):
+    """
+    Build a `feval=` callable for lgbm.train().
+    """
+    def _metric(preds, eval_data):
+        t0 = time.perf_counter()
+        y_pred = _as_1d(preds)
+        if to_raw:
+            y_pred = _logit(y_pred)
+        w = eval_data.get_weight()
+        w = _as_1d(w) if w is not None else None
+        value = float(objective.metric(_as_1d(eval_data.get_label()), y_pred, w))
+        stats.metric_calls += 1
+        stats.metric_seconds += time.perf_counter() - t0
+        return objective.name, value, objective.higher_is_better
+    return _metric
@@ -0,0 +1,217 @@
+# Module: pipeline
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Bounded producer / consumer pipeline with per-stage utilization.
+#
+#   source (reader thread) → stage 1 (N workers) → ... → sink (calling thread)
+#
+# Queues between stages hold at most QueueDepth items, so a slow stage
+# back-pressures the ones before it. Items carry a sequence number and the
+# sink receives them in source order.
+
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+_DONE = object()
+_POLL = 0.05
+
+
+class StageStats:
+    """
+    Timing of one stage. busy: inside the stage function; starved: waiting for
+    input; blocked: waiting for room downstream (back-pressure).
+    """
+    __slots__ = ("name", "workers", "items", "busy", "starved", "blocked", "_lock")
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = int(workers)
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, busy=0.0, starved=0.0, blocked=0.0, items=0):
+        with self._lock:
+            self.busy += busy
+            self.starved += starved
+            self.blocked += blocked
+            self.items += items
+
+    def as_dict(self, wall: float) -> dict:
+        cap = wall * self.workers
+        return {
+            "Stage": self.name,
+            "Workers": self.workers,
+            "Items": self.items,
+            "BusySeconds": self.busy,
+            "StarvedSeconds": self.starved,
+            "BlockedSeconds": self.blocked,
+            "Utilization": self.busy / cap if cap > 0 else 0.0,
+        }
+
+
+class _Stopped(Exception):
+    pass
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> float:
+    t0 = time.perf_counter()
+    while True:
+        if stop.is_set():
+            raise _Stopped
+        try:
+            q.put(item, timeout=_POLL)
+            return time.perf_counter() - t0
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    t0 = time.perf_counter()
+    while True:
+        if stop.is_set():
+            raise _Stopped
+        try:
+            return q.get(timeout=_POLL), time.perf_counter() - t0
+        except queue.Empty:
+            continue
+
+
+def run_pipeline(
+    source: Iterable,
+    stages: Sequence[Tuple[str, Callable, int]],
+    sink: Callable,
+    queue_depth: int = 2,
+    source_name: str = "read",
+    sink_name: str = "write",
+    check: Callable[[], None] | None = None,
+) -> dict:
+    """
+    Run source → stages → sink.
+
+    source      iterable consumed by one reader thread (its next() is timed)
+    stages      [(name, fn, workers), ...]; fn(item) → item for the next stage
+    sink        called on the calling thread, in source order
+    queue_depth max items waiting between two stages
+    check       called on the calling thread between sink items; raise to abort
+
+    The first exception from any stage (or check / sink) stops every stage
+    and is re-raised here.
+
+    Returns {"Seconds", "Items", "Stages": [StageStats.as_dict(), ...],
+    "Bottleneck"} where Bottleneck is the stage with the highest utilization.
+    """
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    queues = [queue.Queue(maxsize=max(1, int(queue_depth))) for _ in range(len(stages) + 1)]
+    stats = [StageStats(source_name, 1)] + [StageStats(n, w) for n, _, w in stages] + [StageStats(sink_name, 1)]
+
+    def _fail(e):
+        if not isinstance(e, _Stopped):
+            errors.append(e)
+        stop.set()
+
+    def _reader():
+        st = stats[0]
+        try:
+            it = iter(source)
+            seq = 0
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                busy = time.perf_counter() - t0
+                blocked = _put(queues[0], (seq, item), stop)
+                st.add(busy=busy, blocked=blocked, items=1)
+                seq += 1
+            for _ in range(stages[0][2] if stages else 1):
+                _put(queues[0], _DONE, stop)
+        except BaseException as e:
+            _fail(e)
+
+    def _worker(k: int, fn: Callable, remaining: list, lock: threading.Lock):
+        st = stats[k + 1]
+        q_in, q_out = queues[k], queues[k + 1]
+        n_next = stages[k + 1][2] if k + 1 < len(stages) else 1
+        try:
+            while True:
+                msg, starved = _get(q_in, stop)
+                if msg is _DONE:
+                    st.add(starved=starved)
+                    break
+                seq, item = msg
+                t0 = time.perf_counter()
+                out = fn(item)
+                busy = time.perf_counter() - t0
+                blocked = _put(q_out, (seq, out), stop)
+                st.add(busy=busy, starved=starved, blocked=blocked, items=1)
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(n_next):
+                    _put(q_out, _DONE, stop)
+        except BaseException as e:
+            _fail(e)
+
+    threads = [threading.Thread(target=_reader, name=f"retrofit-{source_name}", daemon=True)]
+    for k, (name, fn, workers) in enumerate(stages):
+        remaining, lock = [int(workers)], threading.Lock()
+        for w in range(int(workers)):
+            threads.append(threading.Thread(
+                target=_worker, args=(k, fn, remaining, lock), name=f"retrofit-{name}-{w}", daemon=True
+            ))
+
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+
+    # Sink: reorder by sequence number
+    st = stats[-1]
+    pending = {}
+    next_seq = 0
+    try:
+        while True:
+            if check is not None:
+                check()
+            msg, starved = _get(queues[-1], stop)
+            if msg is _DONE:
+                st.add(starved=starved)
+                break
+            seq, item = msg
+            pending[seq] = item
+            busy = 0.0
+            while next_seq in pending:
+                t0 = time.perf_counter()
+                sink(pending.pop(next_seq))
+                busy += time.perf_counter() - t0
+                next_seq += 1
+                st.add(items=1)
+            st.add(busy=busy, starved=starved)
+    except BaseException as e:
+        _fail(e)
+    finally:
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+    wall = time.perf_counter() - t_start
+    rows = [s.as_dict(wall) for s in stats]
+    return {
+        "Seconds": wall,
+        "Items": next_seq,
+        "Stages": rows,
+        "Bottleneck": max(rows, key=lambda r: r["Utilization"])["Stage"],
+    }
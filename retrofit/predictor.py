@@ -0,0 +1,226 @@
+# Module: predictor
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+
+def _inverse_transform_fn(transform: str | None, params: Dict) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+    """
+    NumPy version of RetroFit._inverse_target_transform_expr (None → identity).
+    """
+    t = (transform or "none").lower()
+    if t == "none":
+        return None
+    if t == "log":
+        shift = float(params.get("shift", 0.0))
+        return lambda p: np.exp(p) - shift
+    if t == "sqrt":
+        return lambda p: p ** 2
+    if t == "standardize":
+        mean = float(params["mean"])
+        std = float(params["std"])
+        return lambda p: p * std + mean
+    raise ValueError(f"Unsupported TargetTransform '{t}'.")
+
+
+class CompiledPredictor:
+    """
+    Low-latency scorer for single rows and micro-batches.
+
+    Built once from a trained RetroFit (see RetroFit.compile_predictor). All
+    per-call work that score() does on a DataFrame (normalization, pandas
+    conversion, Pool / DMatrix construction, with_columns) is skipped: the
+    feature order, categorical positions, output layout and target inverse
+    transform are resolved up front and each call goes straight to the
+    engine's in-place prediction path.
+
+    Inputs (features in `feature_names` order unless given by name):
+      dict                    one row, keyed by feature name
+      list of dicts           batch
+      1-D array / list        one row
+      2-D array               batch
+
+    An optional PredictionCache (RetroFit.set_prediction_cache) is consulted
+    per row before the engine is called.
+
+    Outputs (NumPy, one entry per input row):
+      regression      (n,)   prediction (original target scale if InverseTransform)
+      classification  (n,)   p1
+      multiclass      (n, K) class probabilities
+    """
+
+    def __init__(
+        self,
+        model,
+        algorithm: str,
+        target_type: str,
+        feature_names: List[str],
+        categorical_names: List[str] | None = None,
+        output_columns: List[str] | None = None,
+        inverse_transform: Callable[[np.ndarray], np.ndarray] | None = None,
+        classes: List | None = None,
+        threads: int = 1,
+        raw_score_link: bool = False,
+        cache=None,
+        cache_key: str | None = None,
+        iteration_limit: int | None = None,
+    ):
+        self.model = model
+        self.algorithm = algorithm
+        self.target_type = target_type
+        self.feature_names = list(feature_names)
+        self.categorical_names = list(categorical_names or [])
+        self.output_columns = list(output_columns or [])
+        self.classes = classes
+        self.threads = int(threads)
+        self._inverse = inverse_transform
+        self._raw_score_link = bool(raw_score_link)
+        self.cache = cache
+        self._cache_key = cache_key
+        self.iteration_limit = iteration_limit
+        if cache is not None:
+            from .caching import hash_array
+            self._hash_rows = hash_array
+        self._n_features = len(self.feature_names)
+        cats = set(self.categorical_names)
+        self._cat_idx = [i for i, c in enumerate(self.feature_names) if c in cats]
+
+        # Bind the engine call once
+        if algorithm == "xgboost":
+            self._predict_raw = self._predict_xgboost
+        elif algorithm == "lightgbm":
+            self._predict_raw = self._predict_lightgbm
+        elif algorithm == "catboost":
+            self._ptype = "RawFormulaVal" if target_type == "regression" else "Probability"
+            self._predict_raw = self._predict_catboost
+        else:
+            raise ValueError(f"Unsupported Algorithm for CompiledPredictor: {algorithm}")
+
+    def __repr__(self):
+        return (
+            f"CompiledPredictor(algorithm={self.algorithm!r}, target_type={self.target_type!r}, "
+            f"n_features={self._n_features}, threads={self.threads})"
+        )
+
+    # Input coercion
+    def _rows(self, X):
+        """
+        Coerce X to a list of rows (CatBoost) or a 2-D float32 array (XGBoost / LightGBM).
+        """
+        names = self.feature_names
+        if isinstance(X, dict):
+            try:
+                rows = [[X[c] for c in names]]
+            except KeyError as e:
+                raise KeyError(f"Missing feature {e} in input row.") from None
+        elif isinstance(X, (list, tuple)) and X and isinstance(X[0], dict):
+            try:
+                rows = [[r[c] for c in names] for r in X]
+            except KeyError as e:
+                raise KeyError(f"Missing feature {e} in input row.") from None
+        else:
+            rows = X
+
+        if self._cat_idx:
+            # CatBoost takes mixed rows; categorical values must be strings
+            arr = np.asarray(rows, dtype=object)
+            if arr.ndim == 1:
+                arr = arr.reshape(1, -1)
+            if arr.shape[1] != self._n_features:
+                raise ValueError(f"Expected {self._n_features} features, got {arr.shape[1]}.")
+            for j in self._cat_idx:
+                arr[:, j] = [str(v) for v in arr[:, j]]
+            return arr
+
+        arr = np.asarray(rows, dtype=np.float32)
+        if arr.ndim == 1:
+            arr = arr.reshape(1, -1)
+        if arr.shape[1] != self._n_features:
+            raise ValueError(f"Expected {self._n_features} features, got {arr.shape[1]}.")
+        return arr
+
+    # Engine calls (iteration_limit: first N boosting iterations only)
+    def _predict_xgboost(self, X):
+        return self.model.inplace_predict(
+            X, iteration_range=(0, self.iteration_limit or 0), validate_features=False
+        )
+
+    def _predict_lightgbm(self, X):
+        return self.model.predict(X, num_iteration=self.iteration_limit, num_threads=self.threads)
+
+    def _predict_catboost(self, X):
+        return self.model.predict(
+            X, prediction_type=self._ptype, ntree_end=self.iteration_limit or 0, thread_count=self.threads
+        )
+
+    # Public API
+    def predict(self, X) -> np.ndarray:
+        """
+        Score one row or a micro-batch; see class docstring for layouts.
+        With a PredictionCache only rows that miss reach the engine.
+        """
+        rows = self._rows(X)
+        if self.cache is None:
+            return self._predict_rows(rows)
+
+        hashes = self._hash_rows(rows)
+        values, hit, columns, _ = self.cache.lookup(self._cache_key, hashes)
+        if not hit.all():
+            miss = np.flatnonzero(~hit)
+            preds = self._predict_rows(rows[miss] if len(miss) < len(rows) else rows)
+            preds2d = preds.reshape(len(miss), -1)
+            self.cache.put(self._cache_key, hashes[miss], preds2d, self.output_columns[: preds2d.shape[1]])
+            if values is None:
+                return preds
+            values[miss] = preds2d
+        if self.target_type == "multiclass":
+            return values
+        return values[:, 0]
+
+    def _predict_rows(self, rows) -> np.ndarray:
+        preds = np.asarray(self._predict_raw(rows))
+
+        if self.target_type == "regression":
+            preds = preds.reshape(-1)
+            return self._inverse(preds) if self._inverse is not None else preds
+
+        if self.target_type == "classification":
+            if self._raw_score_link:
+                preds = 1.0 / (1.0 + np.exp(-preds))
+            if preds.ndim == 2:
+                # CatBoost returns [p0, p1]; XGBoost / LightGBM may return (N, 1)
+                preds = preds[:, 1] if preds.shape[1] == 2 else preds[:, 0]
+            return preds
+
+        return preds.reshape(preds.shape[0], -1)
+
+    __call__ = predict
+
+    def predict_dict(self, X) -> Dict[str, np.ndarray]:
+        """
+        Same as predict() but keyed by score() output column names
+        (Predict_<target> / p1, p0 / class_0..class_{K-1}).
+        """
+        preds = self.predict(X)
+        if self.target_type == "regression":
+            return {self.output_columns[0]: preds}
+        if self.target_type == "classification":
+            return {"p1": preds, "p0": 1.0 - preds}
+        return {c: preds[:, i] for i, c in enumerate(self.output_columns)}
+
+    def predict_label(self, X) -> np.ndarray:
+        """
+        Original class labels (classification: p1 >= 0.5; multiclass: argmax).
+        """
+        if self.target_type == "regression":
+            raise ValueError("predict_label() is only available for classification / multiclass.")
+        preds = self.predict(X)
+        idx = (preds >= 0.5).astype(np.int64) if self.target_type == "classification" else preds.argmax(axis=1)
+        if not self.classes:
+            return idx
+        return np.asarray(self.classes, dtype=object)[idx]
@@ -0,0 +1,537 @@
+# Module: serving
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Local scoring server: asyncio + stdlib HTTP/1.1, no web framework.
+#
+#   POST /score    {"rows": [{feature: value, ...}, ...]}  (or one row object)
+#                  → {"predictions": [{output_column: value, ...}, ...]}
+#   GET  /health   → {"status": "ok", ...}
+#   GET  /metrics  → request / batch / latency counters (JSON)
+#
+# Concurrent requests are queued and coalesced into micro-batches; each batch
+# is scored with one vectorized CompiledPredictor call. With challengers
+# (shadow mode) each answered batch is also handed to a ShadowScorer.
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import numpy as np
+
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ServerMetrics:
+    """
+    Counters and a rolling latency window for /metrics.
+    """
+    def __init__(self, window: int = 4096):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.batch_errors = 0
+        self.shadow_errors = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows_max = 0
+        self.predict_seconds = 0.0
+        self.latency_ms = deque(maxlen=window)
+        self.batch_rows = deque(maxlen=window)
+
+    def record_batch(self, n_rows: int, seconds: float):
+        self.batches += 1
+        self.rows += n_rows
+        self.batch_rows.append(n_rows)
+        self.batch_rows_max = max(self.batch_rows_max, n_rows)
+        self.predict_seconds += seconds
+
+    def snapshot(self, queue_depth: int) -> Dict:
+        lat = np.asarray(self.latency_ms, dtype=np.float64)
+        pct = (
+            dict(zip(("p50", "p95", "p99"), np.percentile(lat, [50, 95, 99]).round(3).tolist()))
+            if lat.size else {"p50": None, "p95": None, "p99": None}
+        )
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "requests_total": self.requests,
+            "errors_total": self.errors,
+            "batch_errors_total": self.batch_errors,
+            "shadow_errors_total": self.shadow_errors,
+            "rows_total": self.rows,
+            "batches_total": self.batches,
+            "batch_rows_mean": round(float(np.mean(self.batch_rows)), 3) if self.batch_rows else None,
+            "batch_rows_max": self.batch_rows_max,
+            "predict_seconds_total": round(self.predict_seconds, 6),
+            "queue_depth": queue_depth,
+            "latency_ms": pct,
+        }
+
+
+class ScoringServer:
+    """
+    Asyncio HTTP scoring server with adaptive micro-batching.
+
+    Parameters
+    ----------
+    Model : RetroFit or str
+        A trained RetroFit object or the path of a save_retrofit() artifact.
+    ModelName : str, optional
+        Model from ModelList / FitList; defaults to Model.Model.
+    Host, Port : str, int
+        Bind address. Port=0 picks a free port (see self.port after start).
+    MaxBatchRows : int
+        Flush a batch once it holds this many rows.
+    MaxWaitMs : float
+        Latency window: the longest the first queued request waits for others.
+        The window is cut short (adaptive) when every outstanding request is
+        already in the batch, or when the observed arrival rate says no further
+        request is likely to arrive in time, so a lone request under light load
+        is scored immediately.
+    MaxBodyBytes : int
+        Reject larger request bodies with 413.
+    Challengers : list[str], optional
+        Shadow mode: after a batch is answered, these models score it in a
+        background pool and their predictions (with the champion's) go to a
+        prediction log under ShadowPath; see RetroFit.set_shadow_scoring.
+        ShadowWorkers / ShadowMaxQueue size the pool and its drop limit.
+        Without Challengers, Model.ShadowScorer (if set) is used.
+
+    Usage:
+        # blocking
+        ScoringServer("models/leads.pkl", Port=8080).run()
+
+        # background thread (tests / notebooks)
+        srv = ScoringServer(model, Port=0).start_background()
+        ... POST to srv.url + "/score" ...
+        srv.stop()
+
+        # command line
+        python -m retrofit.serving models/leads.pkl --port 8080
+    """
+
+    def __init__(
+        self,
+        Model,
+        ModelName: str | None = None,
+        Host: str = "127.0.0.1",
+        Port: int = 8080,
+        MaxBatchRows: int = 256,
+        MaxWaitMs: float = 5.0,
+        MaxBodyBytes: int = 16 * 1024 * 1024,
+        Challengers: List[str] | None = None,
+        ShadowPath: str | None = None,
+        ShadowWorkers: int = 1,
+        ShadowMaxQueue: int = 8,
+    ):
+        if isinstance(Model, str) or hasattr(Model, "__fspath__"):
+            from .MachineLearning import RetroFit
+            Model = RetroFit.load_retrofit(Model)
+
+        self.retrofit = Model
+        self.ModelName = ModelName
+        self.predictor = Model.compile_predictor(ModelName=ModelName)
+        self.host = Host
+        self.port = int(Port)
+        self.MaxBatchRows = int(MaxBatchRows)
+        self.MaxWaitMs = float(MaxWaitMs)
+        self.MaxBodyBytes = int(MaxBodyBytes)
+        self.metrics = ServerMetrics()
+
+        # Shadow scoring: our own scorer is closed on stop(), Model's is left running
+        self._own_shadow = bool(Challengers)
+        if Challengers:
+            if ShadowPath is None:
+                raise ValueError("ShadowPath is required with Challengers.")
+            from .shadow import ShadowScorer
+            self.shadow = ShadowScorer(
+                Model, list(Challengers), ShadowPath, workers=ShadowWorkers, max_queue=ShadowMaxQueue
+            )
+        else:
+            self.shadow = getattr(Model, "ShadowScorer", None)
+        self.champion_name = ModelName or Model._model_name(Model._resolve_model(ModelName))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._arrival_gap = None     # EWMA of seconds between queued requests
+        self._last_arrival = None
+        self._inflight = 0           # /score requests waiting for a result
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # Micro-batching
+    def _note_arrival(self):
+        now = time.perf_counter()
+        if self._last_arrival is not None:
+            gap = now - self._last_arrival
+            self._arrival_gap = gap if self._arrival_gap is None else 0.8 * self._arrival_gap + 0.2 * gap
+        self._last_arrival = now
+
+    async def _submit(self, rows: List[Dict]) -> List[Dict]:
+        fut = asyncio.get_running_loop().create_future()
+        self._note_arrival()
+        self._inflight += 1
+        try:
+            await self._queue.put((rows, fut))
+            return await fut
+        finally:
+            self._inflight -= 1
+
+    async def _batch_loop(self):
+        while True:
+            items = []
+            try:
+                items = await self._next_batch()
+                await self._score_batch(items)
+            except Exception as e:
+                # Never leave a caller waiting on a failed batch, and keep serving
+                self.metrics.batch_errors += 1
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+    async def _next_batch(self) -> List[tuple]:
+        first = await self._queue.get()
+        items = [first]
+        n_rows = len(first[0])
+        deadline = time.perf_counter() + self.MaxWaitMs / 1000.0
+
+        while n_rows < self.MaxBatchRows:
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                # Every outstanding request is already in this batch
+                if len(items) >= self._inflight:
+                    break
+                # Adaptive cut: next request not expected inside the window
+                if self._arrival_gap is None or self._arrival_gap > remaining:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            items.append(item)
+            n_rows += len(item[0])
+        return items
+
+    async def _score_batch(self, items: List[tuple]):
+        loop = asyncio.get_running_loop()
+        rows = [r for batch_rows, _ in items for r in batch_rows]
+        t0 = time.perf_counter()
+        try:
+            preds = await loop.run_in_executor(None, self.predictor.predict_dict, rows)
+        except Exception:
+            # One bad request must not fail the others: rescore one by one
+            await self._score_individually(items)
+            return
+        self.metrics.record_batch(len(rows), time.perf_counter() - t0)
+
+        cols = {k: np.asarray(v).tolist() for k, v in preds.items()}
+        start = 0
+        for batch_rows, fut in items:
+            end = start + len(batch_rows)
+            if not fut.done():
+                fut.set_result([
+                    {k: v[i] for k, v in cols.items()} for i in range(start, end)
+                ])
+            start = end
+        # Callers are answered; challengers run in the shadow pool (or are dropped)
+        self._shadow_submit(rows, preds)
+
+    async def _score_individually(self, items):
+        loop = asyncio.get_running_loop()
+        ok_rows, ok_preds = [], []
+        for rows, fut in items:
+            t0 = time.perf_counter()
+            try:
+                preds = await loop.run_in_executor(None, self.predictor.predict_dict, rows)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                continue
+            self.metrics.record_batch(len(rows), time.perf_counter() - t0)
+            cols = {k: np.asarray(v).tolist() for k, v in preds.items()}
+            if not fut.done():
+                fut.set_result([{k: v[i] for k, v in cols.items()} for i in range(len(rows))])
+            ok_rows.extend(rows)
+            ok_preds.append(preds)
+        # The requests that scored go to the challengers as one batch
+        if ok_preds:
+            self._shadow_submit(ok_rows, {
+                k: np.concatenate([np.asarray(p[k]) for p in ok_preds]) for k in ok_preds[0]
+            })
+
+    def _shadow_submit(self, rows: List[Dict], preds: Dict):
+        # Shadow scoring must never affect callers: failures are only counted
+        if self.shadow is None:
+            return
+        try:
+            self.shadow.submit(rows, preds, self.champion_name)
+        except Exception:
+            self.metrics.shadow_errors += 1
+
+    # HTTP
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        except ValueError:
+            raise _HTTPError(400, "Malformed request line.")
+
+        headers = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        length = int(headers.get("content-length", "0") or 0)
+        if length > self.MaxBodyBytes:
+            raise _HTTPError(413, f"Body exceeds {self.MaxBodyBytes} bytes.")
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return method.upper(), target.split("?", 1)[0], body, keep_alive
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def _route(self, method: str, path: str, body: bytes) -> Dict:
+        if path == "/health":
+            if method != "GET":
+                raise _HTTPError(405, "Use GET.")
+            return {
+                "status": "ok",
+                "algorithm": self.predictor.algorithm,
+                "target_type": self.predictor.target_type,
+                "model": self.ModelName,
+                "features": self.predictor.feature_names,
+                "outputs": self.predictor.output_columns,
+            }
+
+        if path == "/metrics":
+            if method != "GET":
+                raise _HTTPError(405, "Use GET.")
+            out = self.metrics.snapshot(self._queue.qsize())
+            if self.shadow is not None:
+                out["shadow"] = self.shadow.stats()
+            return out
+
+        if path == "/score":
+            if method != "POST":
+                raise _HTTPError(405, "Use POST.")
+            try:
+                data = json.loads(body or b"null")
+            except ValueError:
+                raise _HTTPError(400, "Body is not valid JSON.")
+            rows = data.get("rows") if isinstance(data, dict) and "rows" in data else data
+            if isinstance(rows, dict):
+                rows = [rows]
+            if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+                raise _HTTPError(400, "Expected a row object, a list of row objects, or {'rows': [...]}.")
+            missing = [c for c in self.predictor.feature_names if c not in rows[0]]
+            if missing:
+                raise _HTTPError(400, f"Missing features: {missing}")
+            try:
+                preds = await self._submit(rows)
+            except (KeyError, ValueError, TypeError) as e:
+                raise _HTTPError(400, str(e))
+            return {"predictions": preds}
+
+        raise _HTTPError(404, f"Unknown path {path}.")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    req = await self._read_request(reader)
+                except _HTTPError as e:
+                    self.metrics.errors += 1
+                    self._write_response(writer, e.status, {"error": e.message}, False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if req is None:
+                    break
+
+                method, path, body, keep_alive = req
+                t0 = time.perf_counter()
+                try:
+                    status, payload = 200, await self._route(method, path, body)
+                except _HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+                if path == "/score":
+                    self.metrics.requests += 1
+                    self.metrics.latency_ms.append((time.perf_counter() - t0) * 1000.0)
+                if status != 200:
+                    self.metrics.errors += 1
+
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # Lifecycle
+    async def start(self):
+        """
+        Bind the socket and start the batcher (inside a running event loop).
+        """
+        self._queue = asyncio.Queue()
+        self._stopped = asyncio.Event()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._own_shadow and not self.shadow.closed:
+            # Finish queued shadow batches and write their records
+            await asyncio.get_running_loop().run_in_executor(None, self.shadow.close)
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    def run(self):
+        """
+        Serve in the current thread until interrupted.
+        """
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    def start_background(self, timeout: float = 10.0) -> "ScoringServer":
+        """
+        Serve from a daemon thread; returns once the socket is listening.
+        """
+        ready = threading.Event()
+        errors = []
+
+        def _main():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            try:
+                self._loop.run_until_complete(self._stopped.wait())
+                self._loop.run_until_complete(self.close())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_main, name="retrofit-serving", daemon=True)
+        self._thread.start()
+        if not ready.wait(timeout):
+            raise TimeoutError("Scoring server did not start in time.")
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop a server started with start_background().
+        """
+        if self._loop is None or self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a saved RetroFit model over HTTP.")
+    parser.add_argument("artifact", help="Path written by RetroFit.save_retrofit()")
+    parser.add_argument("--model-name", default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-rows", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--challenger", action="append", default=None,
+                        help="Shadow-score this model too (repeatable); needs --shadow-path")
+    parser.add_argument("--shadow-path", default=None)
+    parser.add_argument("--shadow-workers", type=int, default=1)
+    parser.add_argument("--shadow-max-queue", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(
+        args.artifact,
+        ModelName=args.model_name,
+        Host=args.host,
+        Port=args.port,
+        MaxBatchRows=args.max_batch_rows,
+        MaxWaitMs=args.max_wait_ms,
+        Challengers=args.challenger,
+        ShadowPath=args.shadow_path,
+        ShadowWorkers=args.shadow_workers,
+        ShadowMaxQueue=args.shadow_max_queue,
+    )
+    print(f"RetroFit scoring server on {server.url}")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# Module: shadow
+# Author: Adrian Antico <adrianantico@gmail.com>
+# License: MIT
+# Release: retrofit 0.2.0
+# Last modified : 2026-10-19
+
+# Shadow scoring of challenger models on live traffic.
+#
+#   rf.set_shadow_scoring(["Student", "XGBoost2"], "shadow/", KeyColumns="RequestID")
+#   rf.score(NewData=df)                    # champion result, returned at once
+#   rf.evaluate_shadow(Labels=outcomes)     # later, once outcomes are known
+#
+# After the champion has answered, the batch (and the champion's predictions)
+# is handed to a small worker pool that scores it with every challenger and
+# appends the results to a prediction log (AuditLog) under Path. Nothing on
+# the caller's path waits for challengers: when MaxQueue batches are already
+# waiting, new shadow work is dropped and counted.
+
+from __future__ import annotations
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import polars as pl
+
+from .audit import AuditLog
+
+
+class ShadowScorer:
+    """
+    Scores batches with challenger models off the critical path (see module
+    header). Built by RetroFit.set_shadow_scoring() or ScoringServer.
+
+    Each challenger is scored through a ScoringView snapshot, so later changes
+    to the RetroFit do not affect it and views are shared safely by workers.
+
+    Records (per model and row): Role ("champion" / "challenger"), BatchId,
+    Row (position in the batch), the key columns and target column present in
+    the batch, the prediction columns and ScoredAt. BatchId / Row pair a
+    challenger's rows with the champion's.
+    """
+
+    def __init__(
+        self,
+        rf,
+        challengers: List[str],
+        path,
+        key_columns: List[str] | None = None,
+        workers: int = 1,
+        max_queue: int = 8,
+        threads: int | None = 1,
+        flush_rows: int = 10_000,
+        flush_seconds: float = 5.0,
+    ):
+        if not challengers:
+            raise ValueError("At least one challenger model is required.")
+        self.views = {}
+        for name in challengers:
+            model = rf._resolve_model(name)
+            # Views built from _scoring_state carry no AuditLog: shadow rows are not served
+            self.views[name] = rf._frozen_view(rf._scoring_state(model, name, threads), model, name)
+        self.target = rf.TargetColumnName
+        self.key_columns = list(key_columns or [])
+        self.max_queue = int(max_queue)
+        self.log = AuditLog(
+            path,
+            key_columns=self.key_columns,
+            flush_rows=flush_rows,
+            flush_seconds=flush_seconds,
+            max_buffer_rows=max(flush_rows, 100 * flush_rows),
+            on_full="drop",
+        )
+        self._pool = ThreadPoolExecutor(max_workers=int(workers), thread_name_prefix="retrofit-shadow")
+        self._lock = threading.Lock()
+        self._batch_ids = itertools.count()
+        self._pending = 0
+        self._closed = False
+        self.batches_submitted = 0
+        self.batches_dropped = 0
+        self.rows_dropped = 0
+        self.batches_scored = 0
+        self.batches_failed = 0
+        self.last_error: BaseException | None = None
+        self.challenger_seconds: Dict[str, float] = {name: 0.0 for name in self.views}
+
+    def __repr__(self):
+        return (
+            f"ShadowScorer(challengers={list(self.views)}, pending={self._pending}, "
+            f"scored={self.batches_scored}, dropped={self.batches_dropped})"
+        )
+
+    @property
+    def path(self):
+        return self.log.path
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # Producer side (caller's thread: never blocks)
+    def submit(self, data, champion=None, champion_name: str | None = None) -> bool:
+        """
+        Queue a batch for the challengers. data: Polars / pandas frame or a
+        list of row dicts; champion: the champion's prediction columns (frame
+        or dict of arrays), logged alongside. Returns False if dropped.
+        """
+        n = len(data)
+        with self._lock:
+            if self._closed:
+                return False
+            if self._pending >= self.max_queue:
+                self.batches_dropped += 1
+                self.rows_dropped += n
+                return False
+            self._pending += 1
+            self.batches_submitted += 1
+            batch_id = next(self._batch_ids)
+        fut = self._pool.submit(self._score, batch_id, data, champion, champion_name)
+        fut.add_done_callback(self._done)
+        return True
+
+    def _done(self, fut):
+        with self._lock:
+            self._pending -= 1
+            if fut.exception() is not None:
+                self.batches_failed += 1
+                self.last_error = fut.exception()
+            else:
+                self.batches_scored += 1
+
+    # Worker side
+    def _score(self, batch_id: int, data, champion, champion_name):
+        df = data if isinstance(data, pl.DataFrame) else (
+            pl.DataFrame(data) if isinstance(data, list) else pl.from_pandas(data)
+        )
+        keep = [c for c in dict.fromkeys(self.key_columns + [self.target]) if c in df.columns]
+        base = pl.select(
+            pl.lit(batch_id, dtype=pl.UInt64).alias("BatchId"),
+            pl.int_range(0, df.height, dtype=pl.UInt32).alias("Row"),
+        ).hstack(df.select(keep).get_columns())
+        if champion is not None:
+            preds = champion if isinstance(champion, pl.DataFrame) else pl.DataFrame(champion)
+            self.log.append(champion_name or "Champion", self._records(base, "champion", preds))
+        for name, view in self.views.items():
+            t0 = time.perf_counter()
+            scored = view.score(df)
+            preds = scored.select([c for c in scored.columns if c not in df.columns])
+            with self._lock:
+                self.challenger_seconds[name] += time.perf_counter() - t0
+            self.log.append(name, self._records(base, "challenger", preds))
+
+    @staticmethod
+    def _records(base: pl.DataFrame, role: str, preds: pl.DataFrame) -> pl.DataFrame:
+        return base.with_columns(pl.lit(role).alias("Role")).hstack(
+            preds.drop([c for c in preds.columns if c in base.columns]).get_columns()
+        )
+
+    # Control
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+        Wait for queued batches to be scored and their records written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._pending == 0:
+                    break
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return self.log.flush(remaining)
+
+    def close(self):
+        """
+        Finish queued batches, write their records and stop the workers.
+        """
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=True)
+        self.log.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {
+                "challengers": list(self.views),
+                "pending": self._pending,
+                "max_queue": self.max_queue,
+                "batches_submitted": self.batches_submitted,
+                "batches_scored": self.batches_scored,
+                "batches_failed": self.batches_failed,
+                "batches_dropped": self.batches_dropped,
+                "rows_dropped": self.rows_dropped,
+                "last_error": repr(self.last_error) if self.last_error is not None else None,
+                "challenger_seconds": dict(self.challenger_seconds),
+            }
+        out["log"] = self.log.stats()
+        return out
+
+    def scan(self) -> pl.LazyFrame:
+        return self.log.scan()
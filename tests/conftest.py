@@ -0,0 +1,52 @@
+import polars as pl
+import pytest
+
+from retrofit.MachineLearning import RetroFit
+from retrofit.utils import make_retrofit_demo_data
+
+TARGETS = {"regression": "Leads", "classification": "Label_binary", "multiclass": "Label"}
+ROUNDS = {"catboost": "iterations", "xgboost": "num_boost_round", "lightgbm": "num_iterations"}
+QUIET = {"catboost": {"verbose": 0}, "xgboost": {"verbosity": 0}, "lightgbm": {"verbose": -1}}
+
+
+@pytest.fixture(scope="session")
+def demo_data():
+    df = make_retrofit_demo_data(n_rows=2000, seed=7)
+    df = df.with_columns(
+        pl.col("Label_binary").cast(pl.Int64),
+        pl.Series("CalendarDateColumn", df["CalendarDateColumn"].to_list()),  # Object → Date
+    )
+    n = df.height
+    return df[: int(n * 0.6)], df[int(n * 0.6): int(n * 0.8)], df[int(n * 0.8):]
+
+
+@pytest.fixture(scope="session")
+def make_retrofit(demo_data, tmp_path_factory):
+    """
+    Factory: a small RetroFit ready to train() (train / validation / test
+    splits of the demo data, 30 boosting rounds). CatBoost also gets
+    MarketingSegments as a categorical feature unless categorical=False.
+    """
+    tr, va, te = demo_data
+
+    def _make(algorithm: str, target_type: str, rounds: int = 30, categorical: bool = True) -> RetroFit:
+        rf = RetroFit(Algorithm=algorithm, TargetType=target_type)
+        rf.create_model_data(
+            TrainData=tr,
+            ValidationData=va,
+            TestData=te,
+            TargetColumnName=TARGETS[target_type],
+            NumericColumnNames=["XREGS1", "XREGS2", "XREGS3"],
+            CategoricalColumnNames=["MarketingSegments"] if algorithm == "catboost" and categorical else None,
+        )
+        rf.update_model_parameters(**{ROUNDS[algorithm]: rounds}, **QUIET[algorithm], allow_new=True)
+        if algorithm == "catboost":
+            # CPU-friendly: the defaults mix Bayesian bootstrap with subsample
+            for key in ("subsample", "diffusion_temperature", "posterior_sampling", "langevin", "sampling_frequency"):
+                rf.ModelArgs.pop(key, None)
+            rf.update_model_parameters(train_dir=str(tmp_path_factory.mktemp("catboost_info")), allow_new=True)
+        if algorithm == "lightgbm":
+            rf.update_model_parameters(num_gpu=1)
+        return rf
+
+    return _make
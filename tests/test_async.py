@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+from polars.testing import assert_frame_equal
+
+
+def test_ascore_matches_score(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "regression")
+    rf.train()
+    expected = rf.score(NewData=te)
+
+    async def main():
+        return await asyncio.gather(*(rf.ascore(NewData=te) for _ in range(3)))
+
+    rf.set_async_limits(MaxConcurrency=2)
+    try:
+        for scored in asyncio.run(main()):
+            assert_frame_equal(scored, expected)
+    finally:
+        rf.shutdown_async(wait=True)
+
+
+def test_atrain_timeout_registers_no_model(make_retrofit):
+    rf = make_retrofit("xgboost", "regression", rounds=100_000)
+    rf.update_model_parameters(early_stopping_rounds=100_000, allow_new=True)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(rf.atrain(Timeout=0.2))
+        assert not rf.ModelList
+    finally:
+        rf.shutdown_async(wait=True)
@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import polars as pl
+import pytest
+
+from retrofit.audit import AuditLog, scan_prediction_log
+
+
+def _records(n, start=0):
+    return pl.DataFrame({"RequestID": np.arange(start, start + n), "p1": np.linspace(0, 1, n)})
+
+
+def test_concurrent_appends_are_written_once(tmp_path):
+    log = AuditLog(tmp_path, flush_rows=500, flush_seconds=60)
+
+    def _producer(i):
+        for j in range(20):
+            log.append(f"Model{i % 2}", _records(50, start=(i * 20 + j) * 50))
+
+    threads = [threading.Thread(target=_producer, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    log.close()
+
+    df = scan_prediction_log(tmp_path).collect()
+    assert df.height == 4000 and df["RequestID"].n_unique() == 4000
+    assert sorted(df["ModelName"].unique().to_list()) == ["Model0", "Model1"]
+    assert not list(tmp_path.rglob(".*.tmp"))
+    with pytest.raises(RuntimeError):
+        log.append("Model0", _records(1))
+
+
+def test_drop_mode_counts_instead_of_blocking(tmp_path):
+    log = AuditLog(tmp_path, flush_rows=10, flush_seconds=60, max_buffer_rows=10, on_full="drop")
+    accepted = sum(log.append("M", _records(10, start=i * 10)) for i in range(50))
+    assert log.flush(timeout=10)
+    stats = log.stats()
+    assert stats["rows_written"] == accepted * 10
+    assert stats["rows_written"] + stats["rows_dropped"] == 500
+    log.close()
+
+
+def test_score_records_match_predictions(make_retrofit, demo_data, tmp_path):
+    _, _, te = demo_data
+    rf = make_retrofit("lightgbm", "classification")
+    rf.train()
+    te = te.with_row_index("RequestID")
+    rf.set_audit_log(tmp_path, KeyColumns="RequestID", FlushSeconds=0.05)
+    scored = rf.score(NewData=te)
+    assert rf.AuditLog.flush(timeout=10)
+
+    logged = rf.AuditLog.scan().collect().sort("RequestID")
+    assert logged.height == te.height
+    np.testing.assert_array_equal(logged["p1"].to_numpy(), scored["p1"].to_numpy())
+    assert logged["InputHash"].n_unique() > 1
+    rf.set_audit_log(None)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+OUTPUTS = {"regression": ["Predict_Leads"], "classification": ["p1"]}
+
+
+@pytest.mark.parametrize("algorithm", ["catboost", "xgboost", "lightgbm"])
+@pytest.mark.parametrize("target_type", ["regression", "classification", "multiclass"])
+def test_compiled_predictor_matches_score(make_retrofit, demo_data, algorithm, target_type):
+    _, _, te = demo_data
+    rf = make_retrofit(algorithm, target_type)
+    rf.train()
+    scored = rf.score(NewData=te)
+    cols = OUTPUTS.get(target_type) or [c for c in scored.columns if c.startswith("class_")]
+    expected = scored.select(cols).to_numpy()
+
+    pred = rf.compile_predictor()
+    batch = pred(te.select(pred.feature_names).rows(named=True))
+    np.testing.assert_allclose(batch.reshape(len(te), -1), expected, rtol=1e-5, atol=1e-6)
+
+    one = pred(te.row(3, named=True))
+    np.testing.assert_allclose(one.reshape(1, -1), expected[3:4], rtol=1e-5, atol=1e-6)
+    if target_type != "regression":
+        assert len(pred.predict_label(te.head(5).rows(named=True))) == 5
@@ -0,0 +1,50 @@
+import polars as pl
+
+
+def test_unseen_codes_and_raw_labels_decode_to_null(make_retrofit):
+    rf = make_retrofit("xgboost", "multiclass")
+    rf.train()
+    scored = rf.score(DataName="test", return_results=True)
+    target = rf.TargetColumnName
+    n = len(rf.LabelMappingInverse)
+
+    decoded = rf.decode_predictions(DataName="test")
+    expected = [rf.LabelMappingInverse[i] for i in scored[target].to_list()]
+    assert decoded["TrueLabel"].to_list() == expected
+
+    unseen = scored.head(2).with_columns(pl.Series(target, [0, n + 2]))
+    assert rf.decode_predictions(df=unseen)["TrueLabel"].to_list() == [rf.LabelMappingInverse[0], None]
+
+    raw = scored.head(2).with_columns(pl.Series(target, ["not-a-code", None]))
+    assert rf.decode_predictions(df=raw)["TrueLabel"].to_list() == [None, None]
+
+
+def test_postprocessing_matches_numpy(make_retrofit, demo_data):
+    import numpy as np
+
+    _, _, te = demo_data
+    rf = make_retrofit("lightgbm", "multiclass")
+    rf.train()
+    rf.set_postprocessing(TopK=2)
+    scored = rf.score(NewData=te)
+    probs = scored.select(sorted((c for c in scored.columns if c.startswith("class_")),
+                                 key=lambda c: int(c.split("_")[1]))).to_numpy()
+    idx = probs.argmax(axis=1)
+    assert scored["PredictedClassIdx"].to_list() == idx.tolist()
+    assert scored["PredictedLabel"].to_list() == [rf.LabelMappingInverse[i] for i in idx]
+    second = np.argsort(-probs, axis=1)[:, 1]
+    assert scored["Top2_Label"].to_list() == [rf.LabelMappingInverse[i] for i in second]
+    np.testing.assert_allclose(scored["Top1_Prob"].to_numpy(), probs.max(axis=1))
+
+    # A class threshold of 0 makes that class win whenever nothing else clears 1.0
+    rf.set_postprocessing(ClassThresholds={0: 0.0, 1: 1.0, 2: 1.0, 3: 1.0})
+    assert set(rf.score(NewData=te)["PredictedClassIdx"].to_list()) == {0}
+
+
+def test_binary_threshold(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "classification")
+    rf.train()
+    rf.set_postprocessing(Threshold=0.3)
+    scored = rf.score(NewData=te)
+    assert scored["PredictedClassIdx"].to_list() == (scored["p1"] >= 0.3).cast(int).to_list()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+
+def _check_student(rf, teacher, out, student_algorithm):
+    name = out["Student"][0]
+    assert rf.Model is teacher
+    assert rf.ModelList[name] is not teacher
+    assert name in rf.ModelListNames and name in rf.FitList
+    assert out["StudentAlgorithm"][0] == student_algorithm
+    assert out["TransferRows"][0] == rf.DataFrames["train"].height + 200
+    assert f"{name}_distillation" in rf.CompareModelsList
+    assert out["TeacherMs"][0] > 0 and out["StudentMs"][0] > 0
+    return name
+
+
+def test_same_engine_regression(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "regression", rounds=60)
+    rf.train()
+    teacher = rf.Model
+    out = rf.distill(StudentArgs={"num_boost_round": 40}, SyntheticRows=200)
+    name = _check_student(rf, teacher, out, "xgboost")
+    assert out["FidelityR2"][0] > 0.8
+
+    # The student scores like any other registered model
+    student = rf.score(NewData=te, ModelName=name)["Predict_Leads"].to_numpy()
+    champion = rf.score(NewData=te)["Predict_Leads"].to_numpy()
+    assert np.corrcoef(student, champion)[0, 1] > 0.9
+
+
+def test_cross_engine_classification(make_retrofit):
+    rf = make_retrofit("xgboost", "classification", rounds=60)
+    rf.train()
+    teacher = rf.Model
+    out = rf.distill(StudentAlgorithm="lightgbm", StudentArgs={"num_gpu": 1, "verbose": -1},
+                     StudentName="Small", SyntheticRows=200)
+    assert _check_student(rf, teacher, out, "lightgbm") == "Small"
+    assert out["Agreement"][0] > 0.8
+    assert 0.0 <= out["MeanAbsProbDiff"][0] < 0.2
+
+    # Re-distilling under the same name replaces the student
+    rf.distill(StudentAlgorithm="lightgbm", StudentArgs={"num_gpu": 1, "verbose": -1}, StudentName="Small")
+    assert rf.ModelListNames.count("Small") == 1
+    assert rf.CompareModelsListNames.count("Small_distillation") == 1
+
+
+def test_multiclass_soft_labels(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("lightgbm", "multiclass", rounds=60)
+    rf.train()
+    teacher = rf.Model
+    out = rf.distill(StudentArgs={"num_gpu": 1, "verbose": -1}, SyntheticRows=200)
+    name = _check_student(rf, teacher, out, "lightgbm")
+    assert {"Agreement", "MeanAbsProbDiff"} <= set(out.columns)
+    assert out["Agreement"][0] > 0.5
+
+    scored = rf.score(NewData=te, ModelName=name)
+    probs = scored.select([c for c in scored.columns if c.startswith("class_")]).to_numpy()
+    np.testing.assert_allclose(probs.sum(axis=1), 1.0, rtol=1e-6)
+
+
+def test_unknown_student_algorithm(make_retrofit):
+    rf = make_retrofit("xgboost", "regression")
+    rf.train()
+    with pytest.raises(ValueError):
+        rf.distill(StudentAlgorithm="sklearn")
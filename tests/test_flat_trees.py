@@ -0,0 +1,74 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from retrofit.flat_trees import FlatTreeEnsemble, from_xgboost
+
+
+@pytest.mark.parametrize("algorithm", ["xgboost", "lightgbm"])
+@pytest.mark.parametrize("target_type", ["regression", "classification", "multiclass"])
+def test_flat_trees_match_score_and_round_trip(make_retrofit, demo_data, tmp_path, algorithm, target_type):
+    _, _, te = demo_data
+    # Missing values exercise the default-direction branches
+    te = te.with_columns(
+        pl.when(pl.int_range(pl.len()) % 7 == 0).then(None).otherwise(pl.col("XREGS1")).alias("XREGS1")
+    )
+    rf = make_retrofit(algorithm, target_type)
+    rf.train()
+    scored = rf.score(NewData=te)
+
+    ens = rf.export_flat_trees(Path=str(tmp_path / "ens.npz"))
+    X = te.select(rf.NumericColumnNames).to_numpy()
+    got = ens.predict_dict(X)
+    for col, values in got.items():
+        np.testing.assert_allclose(values, scored[col].to_numpy(), rtol=1e-5, atol=1e-6)
+
+    loaded = FlatTreeEnsemble.load(tmp_path / "ens.npz")
+    np.testing.assert_array_equal(loaded.predict(X), ens.predict(X))
+
+
+@pytest.mark.parametrize("objective", ["reg:tweedie", "count:poisson", "reg:gamma", "survival:cox"])
+def test_xgboost_log_link_objectives(make_retrofit, demo_data, objective):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "regression")
+    rf.update_model_parameters(
+        objective=objective, eval_metric="cox-nloglik" if objective == "survival:cox" else "rmse"
+    )
+    rf.train()
+    scored = rf.score(NewData=te)
+    ens = rf.export_flat_trees()
+    assert ens.link == "exp"
+    np.testing.assert_allclose(
+        ens.predict(te.select(rf.NumericColumnNames).to_numpy()), scored["Predict_Leads"].to_numpy(), rtol=1e-4
+    )
+
+
+def test_xgboost_unknown_objective_is_rejected(demo_data):
+    xgb = pytest.importorskip("xgboost")
+    tr, _, _ = demo_data
+    dtrain = xgb.DMatrix(tr.select("XREGS1", "XREGS2").to_numpy(), label=tr["Label_binary"].to_numpy())
+    booster = xgb.train({"objective": "binary:hinge", "verbosity": 0}, dtrain, num_boost_round=3)
+    with pytest.raises(NotImplementedError):
+        from_xgboost(booster, ["XREGS1", "XREGS2"], "classification")
+
+
+@pytest.mark.parametrize("target_type", ["regression", "classification"])
+def test_catboost_oblivious_trees_match_score(make_retrofit, demo_data, target_type):
+    _, _, te = demo_data
+    te = te.with_columns(
+        pl.when(pl.int_range(pl.len()) % 7 == 0).then(None).otherwise(pl.col("XREGS1")).alias("XREGS1")
+    )
+    rf = make_retrofit("catboost", target_type, categorical=False)
+    rf.train()
+    scored = rf.score(NewData=te)
+    ens = rf.export_flat_trees()
+    got = ens.predict_dict(te.select(rf.NumericColumnNames).to_numpy())
+    for col, values in got.items():
+        np.testing.assert_allclose(values, scored[col].to_numpy(), rtol=1e-5, atol=1e-6)
+
+
+def test_catboost_categorical_features_are_rejected(make_retrofit):
+    rf = make_retrofit("catboost", "regression")
+    rf.train()
+    with pytest.raises(NotImplementedError):
+        rf.export_flat_trees()
@@ -0,0 +1,52 @@
+import polars as pl
+
+from retrofit.MachineLearning import VALIDATION_FLAGS
+
+
+def test_catboost_scores_missing_and_null_categoricals(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("catboost", "classification")
+    rf.train()
+    rf.set_input_validation()
+
+    dropped = rf.score(NewData=te.drop("MarketingSegments"))
+    assert dropped.height == te.height
+    assert dropped["p1"].null_count() == 0
+    assert (dropped["ValidationFlags"] & VALIDATION_FLAGS["MissingColumn"]).min() > 0
+    assert rf.ValidationReport["MissingColumns"] == ["MarketingSegments"]
+
+    nulled = te.with_columns(
+        pl.when(pl.int_range(pl.len()) % 2 == 0).then(None).otherwise(pl.col("MarketingSegments"))
+        .alias("MarketingSegments")
+    )
+    scored = rf.score(NewData=nulled)
+    null_rows = (scored["ValidationFlags"] & VALIDATION_FLAGS["Null"]) > 0
+    assert null_rows.sum() == (te.height + 1) // 2
+    assert scored["p1"].null_count() == 0
+
+
+def test_flags_and_report(make_retrofit, demo_data):
+    tr, _, te = demo_data
+    rf = make_retrofit("catboost", "regression")
+    rf.train()
+    rf.set_input_validation()
+
+    # Training rows are in range by construction
+    clean = rf.score(NewData=tr)
+    assert clean["ValidationFlags"].max() == 0 and rf.ValidationReport["RowsFlagged"] == 0
+
+    xregs2 = [str(v) for v in tr.head(3)["XREGS2"].to_list()] + ["oops"]
+    bad = tr.head(4).with_columns(
+        pl.Series("XREGS1", [1e12, None, float("nan"), 0.0]),
+        pl.Series("MarketingSegments", ["never-seen", "S1", "S1", "S1"]),
+        pl.Series("XREGS2", xregs2),
+    )
+    flags = rf.score(NewData=bad)["ValidationFlags"].to_list()
+    assert flags[0] == VALIDATION_FLAGS["OutOfRange"] | VALIDATION_FLAGS["UnseenCategory"]
+    assert flags[1] == flags[2] == VALIDATION_FLAGS["Null"]
+    assert flags[3] & VALIDATION_FLAGS["TypeMismatch"]
+    report = rf.ValidationReport
+    assert report["RowsFlagged"] == 4 and report["CoercedColumns"] == ["XREGS2"]
+
+    rf.set_input_validation(Enabled=False)
+    assert "ValidationFlags" not in rf.score(NewData=te).columns
@@ -0,0 +1,50 @@
+import polars as pl
+import pytest
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("order", ["time", "random"])
+def test_learning_curve(make_retrofit, workers, order):
+    rf = make_retrofit("xgboost", "regression")
+    out = rf.learning_curve(
+        Fractions=(1.0, 0.25, 0.5), Order=order, TimeColumnName="CalendarDateColumn",
+        TargetValue=0.0, Workers=workers,
+    )
+    assert out["Fraction"].to_list() == [0.25, 0.5, 1.0]
+    assert out["TrainRows"].to_list() == [300, 600, 1200]
+    assert out["Metric"].unique().to_list() == ["r2"]
+    assert out["MetricValue"].is_finite().all()
+    # The smallest fraction that meets the target is the only one recommended
+    meets = out["MetricValue"] >= 0.0
+    assert out["MeetsTarget"].to_list() == meets.to_list()
+    if meets.any():
+        assert out.filter(pl.col("Recommended"))["Fraction"].to_list() == [out.filter(meets)["Fraction"].min()]
+    else:
+        assert not out["Recommended"].any()
+
+
+def test_rerun_keeps_one_key(make_retrofit):
+    rf = make_retrofit("lightgbm", "classification")
+    for _ in range(2):
+        rf.learning_curve(Fractions=(0.5, 1.0), Order="random", Workers=1)
+    assert rf.CompareModelsListNames.count("lightgbm_learning_curve_random") == 1
+
+
+def test_metric_matches_parent_evaluate(make_retrofit):
+    rf = make_retrofit("xgboost", "regression")
+    rf.set_target_transform("sqrt")
+    rf.update_model_parameters(subsample=1.0, colsample_bytree=1.0, colsample_bylevel=1.0, colsample_bynode=1.0)
+    out = rf.learning_curve(Fractions=(1.0,), Order="time", TimeColumnName="CalendarDateColumn", Workers=1)
+
+    rf.train()
+    rf.score(DataName="validation")
+    ev = rf.evaluate(DataName="validation").filter(pl.col("EvalLevel") == "regression")
+    assert out["MetricValue"][0] == pytest.approx(ev["r2"][0], abs=0.02)
+
+
+def test_catboost_workers_use_separate_train_dirs(make_retrofit):
+    rf = make_retrofit("catboost", "regression")
+    train_dir = rf.ModelArgs["train_dir"]
+    out = rf.learning_curve(Fractions=(0.5, 1.0), Order="random", Workers=2)
+    assert out.height == 2
+    assert rf.ModelArgs["train_dir"] == train_dir
@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pytest
+
+from retrofit.model_pool import ModelPool, estimate_model_bytes
+
+
+@pytest.fixture(scope="module")
+def tenants(make_retrofit, tmp_path_factory):
+    """
+    Three trained models: an artifact directory, a pickle and an instance.
+    """
+    root = tmp_path_factory.mktemp("pool")
+    out = {}
+    for i, key in enumerate(["artifact", "pickle", "instance"]):
+        rf = make_retrofit("xgboost", "regression", rounds=20 + i)
+        rf.train()
+        if key == "artifact":
+            out[key] = (rf, rf.save_scoring_artifact(root / "artifact"))
+        elif key == "pickle":
+            rf.save_retrofit(root / "rf.pkl")
+            out[key] = (rf, root / "rf.pkl")
+        else:
+            out[key] = (rf, rf)
+    return out
+
+
+def test_every_source_scores_like_its_retrofit(tenants, demo_data):
+    _, _, te = demo_data
+    pool = ModelPool()
+    for key, (_, source) in tenants.items():
+        pool.register(key, source)
+    for key, (rf, _) in tenants.items():
+        target = f"Predict_{rf.TargetColumnName}"
+        np.testing.assert_array_equal(
+            pool.score(key, te)[target].to_numpy(), rf.score(NewData=te)[target].to_numpy()
+        )
+    assert pool.stats()["loads"] == 3
+
+
+def test_lru_eviction_under_memory_cap(tenants, demo_data):
+    _, _, te = demo_data
+    sizes = [estimate_model_bytes(rf.Model) for rf, _ in tenants.values()]
+    pool = ModelPool(MaxBytes=max(sizes) + min(sizes))  # room for two
+    for key, (_, source) in tenants.items():
+        pool.register(key, source)
+    pool.get("artifact")
+    pool.get("pickle")
+    pool.get("artifact")  # now most recently used
+    pool.get("instance")
+    assert set(pool.resident()) == {"artifact", "instance"}
+    assert pool.resident_bytes <= pool.MaxBytes
+    assert pool.stats()["evictions"] == 1
+
+
+def test_concurrent_first_requests_share_one_load(tenants):
+    pool = ModelPool()
+    pool.register("artifact", tenants["artifact"][1])
+    views, barrier = [], threading.Barrier(8)
+
+    def _get():
+        barrier.wait()
+        views.append(pool.get("artifact"))
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.stats()["loads"] == 1
+    assert all(v is views[0] for v in views)
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import polars as pl
+import pytest
+
+from retrofit.MachineLearning import RetroFit
+
+
+@pytest.fixture
+def memmap_retrofit(make_retrofit):
+    rf = make_retrofit("xgboost", "multiclass")
+    rf.train()
+    rf.set_multiclass_output("memmap")
+    rf.score(DataName="test")
+    return rf
+
+
+def test_changing_output_releases_probability_file(memmap_retrofit, tmp_path):
+    rf = memmap_retrofit
+    pf = rf.ProbabilityFile
+    assert pf.owned_dir is not None and os.path.isdir(pf.owned_dir)
+    expected = pf.take(rf.ScoredData["test"]["class_probs_row"].to_numpy())
+
+    rf.set_multiclass_output("memmap", Path=str(tmp_path))
+    assert pf.closed and not os.path.exists(pf.owned_dir)
+    assert rf.ProbabilityFile is None
+    np.testing.assert_array_equal(np.stack(rf.ScoredData["test"]["class_probs"].to_numpy()), expected)
+    assert rf.evaluate(DataName="test").height > 0
+
+    rf.score(DataName="validation")
+    assert rf.ProbabilityFile.owned_dir is None
+    assert os.path.dirname(rf.ProbabilityFile.path) == str(tmp_path)
+
+
+def test_truncate_and_close(memmap_retrofit):
+    pf = memmap_retrofit.ProbabilityFile
+    assert pf.rows > 0
+    pf.truncate()
+    assert pf.rows == 0 and os.path.getsize(pf.path) == 0
+    pf.close()
+    pf.close()
+    assert not os.path.exists(pf.path)
+    with pytest.raises(RuntimeError):
+        pf.append(np.zeros((1, pf.n_classes)))
+
+
+def test_pickle_copies_temp_backed_matrix(memmap_retrofit, tmp_path):
+    rf = memmap_retrofit
+    expected = rf.evaluate(DataName="test").drop("CreateTime")
+    rf.save_retrofit(tmp_path / "rf.pkl")
+    rf.ProbabilityFile.close()  # as if the saving process had exited
+
+    loaded = RetroFit.load_retrofit(tmp_path / "rf.pkl")
+    assert loaded.ProbabilityFile.path != rf.ProbabilityFile.path
+    assert loaded.evaluate(DataName="test").drop("CreateTime").equals(expected)
+
+
+def test_score_stream_writes_probabilities(memmap_retrofit, demo_data, tmp_path):
+    rf = memmap_retrofit
+    _, _, te = demo_data
+    te.write_parquet(tmp_path / "in.parquet")
+    rf.score_stream(tmp_path / "in.parquet", tmp_path / "out.parquet", BatchRows=100)
+    out = pl.read_parquet(tmp_path / "out.parquet")
+    assert "class_probs_row" not in out.columns
+    ref = rf.score(NewData=te)
+    np.testing.assert_allclose(
+        np.stack(out["class_probs"].to_numpy()),
+        rf.ProbabilityFile.take(ref["class_probs_row"].to_numpy()),
+    )
+
+
+def test_prediction_cache_follows_output_layout(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "multiclass")
+    rf.train()
+    rf.set_prediction_cache()
+    columns = rf.score(NewData=te)
+    assert "class_0" in columns.columns
+
+    rf.set_multiclass_output("array")
+    array = rf.score(NewData=te)
+    assert "class_probs" in array.columns and "class_0" not in array.columns
+
+    rf.set_multiclass_output("memmap")
+    first = rf.score(NewData=te)
+    probs = rf.ProbabilityFile.take(first["class_probs_row"].to_numpy())
+    rf.ProbabilityFile.truncate()
+    again = rf.score(NewData=te)
+    np.testing.assert_array_equal(rf.ProbabilityFile.take(again["class_probs_row"].to_numpy()), probs)
+    np.testing.assert_array_equal(np.stack(array["class_probs"].to_numpy()), probs)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from retrofit import objectives as obj_reg
+
+
+@pytest.fixture
+def asymmetric():
+    obj_reg.register_asymmetric_squared_error("test_asym", under_cost=10.0, over_cost=1.0, overwrite=True)
+    obj_reg.register_asymmetric_squared_error("test_sym", overwrite=True)
+    yield "test_asym"
+    obj_reg.unregister_objective("test_asym")
+    obj_reg.unregister_objective("test_sym")
+
+
+def test_asymmetric_gradient_matches_finite_differences(asymmetric):
+    obj = obj_reg.get_objective(asymmetric)
+    rng = np.random.default_rng(0)
+    y, p = rng.normal(size=50), rng.normal(size=50)
+    grad, hess = obj.grad_hess(y, p)
+    eps = 1e-6
+
+    def loss(q):
+        return np.where(q - y < 0, 10.0, 1.0) * (q - y) ** 2
+
+    np.testing.assert_allclose(grad, (loss(p + eps) - loss(p - eps)) / (2 * eps), rtol=1e-4)
+    assert (hess > 0).all()
+
+
+def test_duplicate_registration_needs_overwrite(asymmetric):
+    with pytest.raises(KeyError):
+        obj_reg.register_asymmetric_squared_error(asymmetric)
+    assert asymmetric in obj_reg.list_objectives()
+
+
+@pytest.mark.parametrize("algorithm", ["xgboost", "lightgbm"])
+def test_under_forecast_cost_raises_predictions(make_retrofit, demo_data, asymmetric, algorithm):
+    _, _, te = demo_data
+    # Same custom path on both sides (engines start custom objectives from 0)
+    plain = make_retrofit(algorithm, "regression")
+    plain.set_custom_objective("test_sym")
+    plain.train()
+    costly = make_retrofit(algorithm, "regression")
+    costly.set_custom_objective(asymmetric)
+    costly.train()
+    target = f"Predict_{plain.TargetColumnName}"
+    assert costly.score(NewData=te)[target].mean() > plain.score(NewData=te)[target].mean()
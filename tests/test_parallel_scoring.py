@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+
+
+def test_worker_pool_is_reused_until_shutdown(make_retrofit, demo_data):
+    _, _, te = demo_data
+    with make_retrofit("lightgbm", "classification") as rf:
+        rf.train()
+        serial = rf.score(NewData=te)
+
+        first = rf.score(NewData=te, Workers=2, ChunkRows=100)
+        pool = rf.ScoringPoolState["executor"]
+        second = rf.score(NewData=te, Workers=2, ChunkRows=100)
+        assert rf.ScoringPoolState["executor"] is pool
+        for out in (first, second):
+            np.testing.assert_allclose(out["p1"].to_numpy(), serial["p1"].to_numpy(), rtol=1e-6)
+
+        model_dir = rf.ScoringPoolState["dir"].name
+        rf.shutdown_scoring_pool()
+        assert rf.ScoringPoolState == {}
+        assert not os.path.exists(model_dir)
+
+        rf.score(NewData=te, Workers=2)
+        assert rf.ScoringPoolState["executor"] is not pool
+    assert rf.ScoringPoolState == {}
@@ -0,0 +1,78 @@
+import random
+import threading
+import time
+
+import numpy as np
+import polars as pl
+import pytest
+
+from retrofit.pipeline import run_pipeline
+
+
+def test_order_is_preserved_with_parallel_stages():
+    rng = random.Random(0)
+
+    def _jitter(x):
+        time.sleep(rng.random() * 0.002)
+        return x
+
+    out = []
+    result = run_pipeline(
+        range(200),
+        [("square", lambda x: _jitter(x * x), 4), ("plus", lambda x: _jitter(x + 1), 3)],
+        out.append,
+        queue_depth=2,
+    )
+    assert out == [x * x + 1 for x in range(200)]
+    assert result["Items"] == 200
+    assert [s["Stage"] for s in result["Stages"]] == ["read", "square", "plus", "write"]
+
+
+def test_stage_error_stops_everything_and_is_reraised():
+    started = threading.active_count()
+
+    def _boom(x):
+        if x == 50:
+            raise ValueError("bad item")
+        return x
+
+    with pytest.raises(ValueError, match="bad item"):
+        run_pipeline(iter(range(10_000)), [("boom", _boom, 2)], lambda x: None)
+    time.sleep(0.05)
+    assert threading.active_count() <= started
+
+
+def test_pipelined_score_stream_matches_serial(make_retrofit, demo_data, tmp_path):
+    _, _, te = demo_data
+    rf = make_retrofit("catboost", "classification")
+    rf.train()
+    te.write_parquet(tmp_path / "in.parquet")
+    rf.score_stream(tmp_path / "in.parquet", tmp_path / "serial.parquet", BatchRows=37)
+    stats = rf.score_stream(
+        tmp_path / "in.parquet", tmp_path / "piped.parquet", BatchRows=37,
+        Pipeline=True, ConvertWorkers=2, PredictWorkers=2,
+    )
+    assert stats["rows"] == te.height
+    serial = pl.read_parquet(tmp_path / "serial.parquet")
+    piped = pl.read_parquet(tmp_path / "piped.parquet")
+    assert piped.equals(serial)
+    np.testing.assert_allclose(piped["p1"].to_numpy(), rf.score(NewData=te)["p1"].to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+@pytest.mark.parametrize("algorithm, target_type", [("xgboost", "multiclass"), ("catboost", "classification")])
+def test_empty_source_writes_an_empty_sink(make_retrofit, demo_data, tmp_path, pipeline, algorithm, target_type):
+    _, _, te = demo_data
+    rf = make_retrofit(algorithm, target_type)
+    rf.train()
+    te.write_parquet(tmp_path / "full.parquet")
+    te.head(0).write_parquet(tmp_path / "empty.parquet")
+    rf.score_stream(tmp_path / "full.parquet", tmp_path / "full_out.parquet", KeyColumns="CalendarDateColumn")
+    stats = rf.score_stream(
+        tmp_path / "empty.parquet", tmp_path / "empty_out.parquet", KeyColumns="CalendarDateColumn",
+        Pipeline=pipeline,
+    )
+    assert stats["rows"] == 0 and stats["batches"] == 0
+    empty = pl.read_parquet(tmp_path / "empty_out.parquet")
+    assert empty.height == 0
+    assert empty.schema == pl.read_parquet(tmp_path / "full_out.parquet").schema
@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+import polars as pl
+
+
+def test_cached_rows_skip_the_engine_and_match(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("lightgbm", "regression")
+    rf.train()
+    reference = rf.score(NewData=te)
+    rf.set_prediction_cache(MaxEntries=10_000)
+    cache = rf.PredictionCache
+
+    first = rf.score(NewData=te)
+    assert cache.stats()["misses"] == te.height
+    # Half old rows, half new: only the new ones are misses
+    mixed = pl.concat([te.head(100), te.head(100).with_columns(pl.col("XREGS1") + 1.0)])
+    out = rf.score(NewData=mixed)
+    stats = cache.stats()
+    assert stats["hits"] == 100 and stats["misses"] == te.height + 100
+
+    target = f"Predict_{rf.TargetColumnName}"
+    np.testing.assert_array_equal(first[target].to_numpy(), reference[target].to_numpy())
+    np.testing.assert_array_equal(out[target].to_numpy(), rf.score(NewData=mixed)[target].to_numpy())
+    np.testing.assert_array_equal(out[target].head(100).to_numpy(), reference[target].head(100).to_numpy())
+
+
+def test_lru_eviction_and_ttl(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "classification")
+    rf.train()
+    rf.set_prediction_cache(MaxEntries=50)
+    for start in range(0, 200, 50):
+        rf.score(NewData=te.slice(start, 50))
+    stats = rf.PredictionCache.stats()
+    assert stats["entries"] <= 50 and stats["evictions"] >= 150
+
+    rf.set_prediction_cache(TTLSeconds=0.05)
+    rf.score(NewData=te.head(10))
+    time.sleep(0.1)
+    rf.score(NewData=te.head(10))
+    assert rf.PredictionCache.stats()["expired"] == 10
+
+
+def test_cache_key_uses_a_token_not_the_object_id(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "regression")
+    rf.train()
+    rf.set_prediction_cache(MaxEntries=10_000)
+    key = rf._prediction_cache_key(rf.Model)
+    assert f"{id(rf.Model):x}" not in key
+    assert rf._prediction_cache_key(rf.Model) == key
+    rf.score(NewData=te)
+
+    # A retrained model under the same name never reads the old model's entries
+    name = rf.ModelListNames[-1]
+    rf.update_model_parameters(num_boost_round=5)
+    rf.train()
+    retrained = rf.Model
+    rf.ModelList[name] = rf.FitList[name] = retrained
+    assert rf._prediction_cache_key(retrained) != key
+
+    target = f"Predict_{rf.TargetColumnName}"
+    cache, rf.PredictionCache = rf.PredictionCache, None
+    expected = rf.score(NewData=te, ModelName=name)[target].to_numpy()
+    rf.PredictionCache = cache
+    np.testing.assert_array_equal(rf.score(NewData=te, ModelName=name)[target].to_numpy(), expected)
+    assert cache.stats()["hits"] == 0
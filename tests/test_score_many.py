@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(
+    "algorithm, target_type",
+    [
+        ("xgboost", "regression"),
+        ("xgboost", "classification"),
+        ("lightgbm", "multiclass"),
+        ("catboost", "classification"),
+    ],
+)
+def test_score_model_names_then_evaluate(make_retrofit, algorithm, target_type):
+    rf = make_retrofit(algorithm, target_type)
+    rf.train()
+    rf.update_model_parameters(**{"catboost": {"iterations": 15}, "xgboost": {"num_boost_round": 15},
+                                  "lightgbm": {"num_iterations": 15}}[algorithm])
+    rf.train()
+    names = list(rf.ModelList)
+    assert len(names) == 2
+
+    rf.score(ModelNames=names)
+    multi = {split: rf.ScoredData[split] for split in ("train", "validation", "test")}
+    metrics = rf.evaluate(DataName="test")
+    assert metrics.height > 0
+
+    # Plain columns are the first (champion) model's predictions
+    rf.score(DataName="test", ModelName=names[0], return_results=True)
+    single = rf.ScoredData["test"]
+    plain = [c for c in single.columns if c not in rf.DataFrames["test"].columns]
+    assert plain
+    for c in plain:
+        if single.schema[c].is_numeric():
+            np.testing.assert_allclose(multi["test"][c].to_numpy(), single[c].to_numpy(), rtol=1e-6)
+            np.testing.assert_allclose(multi["test"][f"{c}_{names[0]}"].to_numpy(), single[c].to_numpy(), rtol=1e-6)
+        assert f"{c}_{names[1]}" in multi["test"].columns
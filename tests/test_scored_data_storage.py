@@ -0,0 +1,29 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from retrofit.MachineLearning import PredictionColumns
+
+
+def test_predictions_only_matches_full_frames(make_retrofit):
+    rf = make_retrofit("xgboost", "classification")
+    rf.train()
+    rf.score()
+    full = {split: rf.ScoredData[split] for split in ("train", "validation", "test")}
+    metrics = rf.evaluate(DataName="test").drop("CreateTime", strict=False)
+
+    rf.set_scored_data_storage(PredictionsOnly=True)
+    rf.score()
+    for split, frame in full.items():
+        assert isinstance(dict.__getitem__(rf.ScoredData, split), PredictionColumns)
+        assert_frame_equal(rf.ScoredData[split], frame)
+    assert_frame_equal(rf.evaluate(DataName="test").drop("CreateTime", strict=False), metrics)
+
+
+def test_float32_predictions(make_retrofit):
+    rf = make_retrofit("lightgbm", "regression")
+    rf.train()
+    rf.set_scored_data_storage(PredictionsOnly=True, Float32=True)
+    rf.score(DataName="test")
+    stored = dict.__getitem__(rf.ScoredData, "test").frame
+    assert all(dtype == pl.Float32 for dtype in stored.schema.values() if dtype.is_float())
+    assert rf.ScoredData["test"].height == rf.DataFrames["test"].height
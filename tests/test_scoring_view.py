@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(
+    "algorithm, target_type",
+    [("catboost", "classification"), ("xgboost", "multiclass"), ("lightgbm", "regression")],
+)
+def test_concurrent_scoring_matches_serial(make_retrofit, demo_data, algorithm, target_type):
+    _, _, te = demo_data
+    rf = make_retrofit(algorithm, target_type)
+    rf.train()
+    view = rf.scoring_view(Threads=1)
+
+    # Random row slices scored serially, then from 8 threads on the one view
+    rng = np.random.default_rng(42)
+    sizes = rng.integers(1, 257, 200)
+    slices = [te.slice(int(rng.integers(0, te.height - n + 1)), int(n)) for n in sizes]
+    reference = [view.score(x) for x in slices]
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(view.score, slices))
+
+    mismatches = sum(not a.equals(b) for a, b in zip(reference, results))
+    assert mismatches == 0
+
+
+def test_view_is_read_only_and_isolated(make_retrofit, demo_data):
+    _, _, te = demo_data
+    rf = make_retrofit("xgboost", "classification")
+    rf.train()
+    view = rf.scoring_view()
+    before = view.score(te)
+
+    with pytest.raises(AttributeError):
+        view.model_name = "other"
+    rf.set_postprocessing(Threshold=0.9)
+    rf.train()
+    assert view.score(te).equals(before)
+    assert not rf.ScoredData
@@ -0,0 +1,111 @@
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from retrofit.serving import ScoringServer
+
+
+def _request(url, payload=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+@pytest.fixture
+def server(make_retrofit):
+    rf = make_retrofit("xgboost", "classification")
+    rf.train()
+    srv = ScoringServer(rf, Port=0, MaxWaitMs=2.0).start_background()
+    yield rf, srv
+    srv.stop()
+
+
+def test_concurrent_requests_match_score(server, demo_data):
+    rf, srv = server
+    _, _, te = demo_data
+    rows = te.head(64).select(rf.NumericColumnNames).rows(named=True)
+    expected = rf.score(NewData=te.head(64))["p1"].to_numpy()
+
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        replies = list(ex.map(_request, [srv.url + "/score"] * len(rows), rows))
+    got = np.array([r["predictions"][0]["p1"] for r in replies])
+    np.testing.assert_allclose(got, expected, rtol=1e-5)
+
+    batch = _request(srv.url + "/score", {"rows": rows[:5]})
+    assert len(batch["predictions"]) == 5
+    assert _request(srv.url + "/health")["features"] == rf.NumericColumnNames
+    metrics = _request(srv.url + "/metrics")
+    assert metrics["rows_total"] == 69 and metrics["batches_total"] <= 65
+
+
+def test_bad_requests_are_rejected(server):
+    _, srv = server
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _request(srv.url + "/score", {"XREGS1": 1.0})
+    assert e.value.code == 400
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _request(srv.url + "/nope")
+    assert e.value.code == 404
+
+
+class _RecordingShadow:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def submit(self, rows, preds, champion_name=None):
+        if self.fail:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        self.batches.append((list(rows), {k: np.asarray(v) for k, v in preds.items()}))
+        return True
+
+    def stats(self):
+        return {}
+
+
+def test_failed_batch_answers_callers_and_keeps_serving(server, demo_data):
+    rf, srv = server
+    _, _, te = demo_data
+    row = te.head(1).select(rf.NumericColumnNames).rows(named=True)[0]
+    predict_dict = srv.predictor.predict_dict
+
+    # Result fan-out fails: the caller gets an error instead of waiting forever
+    srv.predictor.predict_dict = lambda rows: {"p1": 0.5}
+    with pytest.raises(urllib.error.HTTPError):
+        _request(srv.url + "/score", row)
+    srv.predictor.predict_dict = predict_dict
+    assert len(_request(srv.url + "/score", row)["predictions"]) == 1
+
+    # A shadow scorer that cannot take work does not affect callers
+    srv.shadow = _RecordingShadow(fail=True)
+    assert len(_request(srv.url + "/score", row)["predictions"]) == 1
+    metrics = _request(srv.url + "/metrics")
+    assert metrics["batch_errors_total"] == 1 and metrics["shadow_errors_total"] == 1
+
+
+def test_individually_scored_requests_reach_the_shadow_log(server, demo_data):
+    rf, srv = server
+    _, _, te = demo_data
+    rows = te.head(3).select(rf.NumericColumnNames).rows(named=True)
+    shadow = srv.shadow = _RecordingShadow()
+    predict_dict = srv.predictor.predict_dict
+    calls = []
+
+    def flaky(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise ValueError("batch failed")
+        return predict_dict(batch)
+
+    srv.predictor.predict_dict = flaky
+    assert len(_request(srv.url + "/score", {"rows": rows})["predictions"]) == 3
+    assert calls == [3, 3]
+    assert len(shadow.batches) == 1
+    logged_rows, logged = shadow.batches[0]
+    assert logged_rows == rows
+    np.testing.assert_allclose(logged["p1"], rf.score(NewData=te.head(3))["p1"].to_numpy(), rtol=1e-5)
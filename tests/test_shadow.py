@@ -0,0 +1,50 @@
+import numpy as np
+import polars as pl
+
+
+def _two_models(make_retrofit, target_type):
+    rf = make_retrofit("xgboost", target_type)
+    rf.train()
+    rf.update_model_parameters(num_boost_round=10)
+    rf.train()
+    return rf, list(rf.ModelList)
+
+
+def test_challenger_predictions_are_logged_and_evaluated(make_retrofit, demo_data, tmp_path):
+    _, _, te = demo_data
+    rf, (challenger, champion) = _two_models(make_retrofit, "classification")
+    te = te.with_row_index("RequestID")
+    rf.set_shadow_scoring([challenger], tmp_path, KeyColumns="RequestID", FlushSeconds=0.05)
+
+    batches = [te.slice(i, 100) for i in range(0, te.height, 100)]
+    served = pl.concat([rf.score(NewData=b.drop(rf.TargetColumnName)) for b in batches])
+    assert rf.ShadowScorer.drain(timeout=30)
+    stats = rf.ShadowScorer.stats()
+    assert stats["batches_scored"] == len(batches) and stats["batches_failed"] == 0
+
+    log = rf.ShadowScorer.scan().collect()
+    champ = log.filter(pl.col("Role") == "champion").sort("RequestID")
+    chall = log.filter(pl.col("Role") == "challenger").sort("RequestID")
+    np.testing.assert_array_equal(champ["p1"].to_numpy(), served["p1"].to_numpy())
+    expected = rf.score(NewData=te, ModelName=challenger)["p1"].to_numpy()
+    np.testing.assert_allclose(chall["p1"].to_numpy(), expected, rtol=1e-6)
+
+    labels = te.select("RequestID", rf.TargetColumnName)
+    ev = rf.evaluate_shadow(Labels=labels)
+    assert set(ev["Role"].unique()) == {"champion", "challenger"}
+    assert set(ev["ModelName"].unique()) == {champion, challenger}
+    rf.set_shadow_scoring(None)
+
+
+def test_full_queue_drops_instead_of_waiting(make_retrofit, demo_data, tmp_path):
+    _, _, te = demo_data
+    rf, (challenger, _) = _two_models(make_retrofit, "regression")
+    big = pl.concat([te] * 20)  # slow enough that the queue fills up
+    scorer = rf.set_shadow_scoring([challenger], tmp_path, MaxQueue=1)
+    accepted = [scorer.submit(big) for _ in range(20)]
+    assert not all(accepted)
+    assert scorer.drain(timeout=30)
+    stats = scorer.stats()
+    assert stats["batches_dropped"] == accepted.count(False)
+    assert stats["rows_dropped"] == accepted.count(False) * big.height
+    rf.set_shadow_scoring(None)
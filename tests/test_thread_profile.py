@@ -0,0 +1,59 @@
+import json
+
+
+def test_calibrated_predict_threads_drive_scoring(make_retrofit, tmp_path):
+    profile = tmp_path / "threads.json"
+    rf = make_retrofit("lightgbm", "regression")
+    timings = rf.calibrate_threads(ThreadCounts=[1, 2], SampleRows=500, Iterations=5, ProfilePath=profile)
+    assert timings.height == 2
+
+    (entry,) = json.loads(profile.read_text()).values()
+    assert rf.ScoreThreads == entry["predict_threads"]
+
+    # A new RetroFit with the same data shape picks the profile up
+    fresh = make_retrofit("lightgbm", "regression")
+    fresh.ThreadProfilePath = str(profile)
+    fresh.create_model_parameters()
+    assert fresh.ScoreThreads == entry["predict_threads"]
+
+    # An explicit ScoreThreads wins
+    fresh.ScoreThreads = 3
+    fresh.create_model_parameters()
+    assert fresh.ScoreThreads == 3
+
+
+def test_profile_is_opt_in(make_retrofit, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("RETROFIT_THREAD_PROFILE", raising=False)
+    rf = make_retrofit("xgboost", "regression")
+    rf.calibrate_threads(ThreadCounts=[3], SampleRows=300, Iterations=3)
+    assert (tmp_path / ".retrofit" / "thread_profile.json").exists()
+
+    # The default file alone is not read
+    fresh = make_retrofit("xgboost", "regression")
+    assert fresh.ScoreThreads is None and fresh.ModelArgs["nthread"] != 3
+
+    monkeypatch.setenv("RETROFIT_THREAD_PROFILE", str(tmp_path / ".retrofit" / "thread_profile.json"))
+    fresh.create_model_parameters()
+    assert fresh.ScoreThreads == 3 and fresh.ModelArgs["nthread"] == 3
+
+    monkeypatch.delenv("RETROFIT_THREAD_PROFILE")
+    fresh.UseThreadProfile = False
+    fresh.ScoreThreads = None
+    fresh.create_model_parameters()
+    assert fresh.ScoreThreads is None
+
+
+def test_recalibration_replaces_profile_threads_only(make_retrofit, tmp_path):
+    profile = tmp_path / "threads.json"
+    rf = make_retrofit("lightgbm", "regression")
+    rf.calibrate_threads(ThreadCounts=[1], SampleRows=300, Iterations=3, ProfilePath=profile)
+    assert rf.ScoreThreads == 1
+    rf.calibrate_threads(ThreadCounts=[2], SampleRows=300, Iterations=3, ProfilePath=profile)
+    assert rf.ScoreThreads == 2
+
+    rf.ScoreThreads = 4
+    rf.calibrate_threads(ThreadCounts=[1], SampleRows=300, Iterations=3, ProfilePath=profile)
+    assert rf.ScoreThreads == 4
+    rf.create_model_parameters()
+    assert rf.ScoreThreads == 4
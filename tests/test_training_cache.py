@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def test_second_train_is_a_cache_hit(make_retrofit, demo_data, tmp_path):
+    _, _, te = demo_data
+    first = make_retrofit("xgboost", "regression")
+    first.set_training_cache(tmp_path)
+    first.train()
+    assert first.TrainingCache.entries().height == 1
+
+    second = make_retrofit("xgboost", "regression")
+    second.set_training_cache(tmp_path)
+    second.train()
+    entries = second.TrainingCache.entries()
+    assert entries.height == 1 and entries["hits"].sum() == 1
+
+    target = f"Predict_{first.TargetColumnName}"
+    np.testing.assert_array_equal(
+        first.score(NewData=te)[target].to_numpy(), second.score(NewData=te)[target].to_numpy()
+    )
+
+
+def test_changed_parameters_miss_and_purge(make_retrofit, tmp_path):
+    rf = make_retrofit("lightgbm", "regression")
+    rf.set_training_cache(tmp_path)
+    rf.train()
+    rf.update_model_parameters(num_iterations=12)
+    rf.train()
+    assert rf.TrainingCache.entries().height == 2
+    assert rf.TrainingCache.purge() == 2
+    assert rf.TrainingCache.size_bytes() == 0
+
+
+def _squared_error(y, p):
+    return 2.0 * (p - y), np.full_like(p, 2.0)
+
+
+def _pseudo_huber(y, p):
+    r = p - y
+    s = np.sqrt(1.0 + r * r)
+    return r / s, 1.0 / (s * s * s)
+
+
+def test_reregistered_objective_misses(make_retrofit, tmp_path):
+    from retrofit import objectives
+
+    def train_with(**kwargs):
+        objectives.register_objective("cache_test", overwrite=True, **kwargs)
+        rf = make_retrofit("xgboost", "regression")
+        rf.set_training_cache(tmp_path)
+        rf.set_custom_objective("cache_test")
+        rf.train()
+        return rf.TrainingCache.entries()
+
+    try:
+        assert train_with(grad_hess=_squared_error).height == 1
+        assert train_with(grad_hess=_pseudo_huber).height == 2
+        # Same functions again: a hit, not a new entry
+        entries = train_with(grad_hess=_squared_error)
+        assert entries.height == 2 and entries["hits"].sum() == 1
+
+        # Partial arguments are part of the fingerprint too
+        objectives.register_asymmetric_squared_error("cache_test", under_cost=3.0, overwrite=True)
+        key = make_retrofit("xgboost", "regression")
+        key.set_custom_objective("cache_test")
+        first = key._training_cache_key()
+        objectives.register_asymmetric_squared_error("cache_test", under_cost=5.0, overwrite=True)
+        assert key._training_cache_key() != first
+    finally:
+        objectives.unregister_objective("cache_test")
@@ -0,0 +1,55 @@
+import numpy as np
+import polars as pl
+import pytest
+
+
+def test_unmet_latency_budget_warns_and_keeps_limit(make_retrofit):
+    rf = make_retrofit("xgboost", "regression")
+    rf.train()
+    with pytest.warns(UserWarning, match="latency budget"):
+        out = rf.tune_tree_truncation(LatencyBudgetMs=1e-9, NumIterations=[10, 20], Repeats=5)
+    assert not out["Recommended"].any()
+    assert not rf.ScoringTreeLimit
+
+
+def _truncated(model, algorithm, X, n):
+    if algorithm == "xgboost":
+        import xgboost as xgb
+        return model.predict(xgb.DMatrix(X, feature_names=model.feature_names), iteration_range=(0, n))
+    if algorithm == "lightgbm":
+        return model.predict(X, num_iteration=n)
+    return model.predict(X, prediction_type="Probability", ntree_end=n)[:, 1]
+
+
+@pytest.mark.parametrize(
+    "algorithm, target_type",
+    [("xgboost", "regression"), ("lightgbm", "multiclass"), ("catboost", "classification")],
+)
+def test_met_budget_sets_limit_everywhere(make_retrofit, demo_data, algorithm, target_type):
+    _, _, te = demo_data
+    rf = make_retrofit(algorithm, target_type, categorical=False)
+    rf.train()
+    name = rf.ModelListNames[-1]
+    full = rf.score(NewData=te)
+
+    # Generous budget and tolerance: the shortest prefix wins
+    out = rf.tune_tree_truncation(LatencyBudgetMs=1e6, MetricTolerance=10.0, NumIterations=[5, 15], Repeats=5)
+    assert out.filter(pl.col("Recommended"))["NumIterations"].to_list() == [5]
+    assert rf.ScoringTreeLimit == {name: 5}
+    rf.tune_tree_truncation(LatencyBudgetMs=1e6, MetricTolerance=10.0, NumIterations=[5, 15], Repeats=5)
+    assert rf.CompareModelsListNames.count(f"{name}_tree_truncation") == 1
+
+    X = te.select(rf.NumericColumnNames).to_numpy()
+    expected = np.asarray(_truncated(rf.Model, algorithm, X, 5)).reshape(len(te), -1)
+
+    scored = rf.score(NewData=te)
+    cols = [c for c in scored.columns if c in ("Predict_Leads", "p1") or c.startswith("class_")]
+    np.testing.assert_allclose(scored.select(cols).to_numpy(), expected, rtol=1e-5, atol=1e-6)
+    assert not np.allclose(full.select(cols).to_numpy(), expected)
+
+    pred = rf.compile_predictor()
+    np.testing.assert_allclose(
+        pred(te.select(pred.feature_names).rows(named=True)).reshape(len(te), -1), expected, rtol=1e-5, atol=1e-6
+    )
+    ens = rf.export_flat_trees()
+    np.testing.assert_allclose(ens.predict(X).reshape(len(te), -1), expected, rtol=1e-5, atol=1e-6)